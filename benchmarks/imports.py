@@ -0,0 +1,81 @@
+"""
+Import time benchmarks for vswobbly, measured with `python -X importtime` in fresh interpreters.
+
+Run from the repository root:
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --repeats 20
+
+Every statement is run in a new process, so nothing is cached between runs except by the OS.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+STATEMENTS = {
+    'import': 'import vswobbly',
+    'parse': 'from vswobbly import WobblyParser',
+    'strategy': 'from vswobbly import MatchBasedOrphanQTGMCStrategy',
+}
+"""The statements to time. `strategy` forces the lazily imported strategies (and vsdeinterlace) to load."""
+
+
+def _import_times(statement: str) -> tuple[int, set[str]]:
+    """Run a statement in a fresh interpreter, and return the total import time in µs, and the imported modules."""
+
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    modules = set[str]()
+
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+
+        # Nested imports are indented, and already included in the cumulative time of their top-level import.
+        if not name.removeprefix(' ').startswith(' '):
+            total += int(cumulative)
+
+        modules.add(name.strip())
+
+    return total, modules
+
+
+def bench_statement(statement: str, repeats: int) -> dict[str, Any]:
+    """Time a statement, and report which heavy dependencies it imported."""
+
+    runs = [_import_times(statement) for _ in range(repeats)]
+    modules = runs[-1][1]
+
+    return {
+        'import_time_ms': statistics.median(total for total, _ in runs) / 1000,
+        'modules': len(modules),
+        'vsdeinterlace': 'vsdeinterlace' in modules,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5, help='Interpreters to start per statement.')
+    args = parser.parse_args(argv)
+
+    results = {name: bench_statement(statement, args.repeats) for name, statement in STATEMENTS.items()}
+
+    print(json.dumps(results, indent=4))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
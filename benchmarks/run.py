@@ -0,0 +1,336 @@
+"""
+Parse and build benchmarks for vswobbly.
+
+Run from the repository root:
+
+    python -m benchmarks.run --scales 10000 100000 --save benchmarks/baselines/local.json
+    python -m benchmarks.run --scales 10000 100000 --compare benchmarks/baselines/local.json
+
+Pass `--backend std` to run without the `fh` and `vszip` plugins,
+and compare against a `--backend native` run to measure the speedup of the native plugins.
+
+Pass `--letterbox 60` to also measure the savings of cropping early on a letterboxed source,
+with a blur after field matching standing in for the filtering of a typical script.
+
+Pass `--preview` to also measure stepping through the output one frame at a time, with and without a `PreviewCache`.
+"""
+
+import argparse
+import dataclasses
+import json
+import pickle
+import platform
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from time import perf_counter
+from typing import Any
+
+from jetpytools import DependencyNotFoundError, SPath
+from vstools import core, vs
+
+from vswobbly import (
+    FilteringPositionEnum,
+    OutputSettingsEnum,
+    PluginBackendEnum,
+    PreviewCache,
+    WobblyBuilder,
+    WobblyParser,
+    WobblyProcessor,
+    available_json_backends,
+    load_wob_json,
+    validate,
+)
+from vswobbly.process.strategies.abstract import AbstractProcessingStrategy
+
+from .synthetic import SyntheticWobConfig, blank_source, generate_wob
+
+DEFAULT_SCALES = [10_000, 100_000, 500_000, 2_000_000]
+
+LOWER_IS_BETTER = {'validate_time', 'build_time', 'build_peak_mb', 'pickle_mb', 'apply_time'}
+HIGHER_IS_BETTER = {'render_fps'}
+HIGHER_IS_BETTER_PREFIXES = ('parse_mbps_', 'render_fps_')
+
+
+def _is_metric(name: str) -> bool:
+    return name in LOWER_IS_BETTER or name in HIGHER_IS_BETTER or name.startswith(HIGHER_IS_BETTER_PREFIXES)
+
+
+def _config_for(num_frames: int, seed: int) -> SyntheticWobConfig:
+    """Scale every component with the number of frames, similar to a typical episode (~35k frames)."""
+
+    scale = num_frames / 35_000
+
+    return SyntheticWobConfig(
+        num_frames=num_frames,
+        sections=max(1, int(350 * scale)),
+        custom_lists=8,
+        ranges_per_list=max(1, int(60 * scale)),
+        orphans=max(0, int(40 * scale)),
+        fades=max(0, int(150 * scale)),
+        freezes=max(0, int(20 * scale)),
+        combed=max(0, int(200 * scale)),
+        seed=seed,
+    )
+
+
+def _timed(func: Callable[[], Any], repeats: int) -> tuple[float, Any]:
+    """Return the median run time of a function, and the result of its last run."""
+
+    times = list[float]()
+    result = None
+
+    for _ in range(repeats):
+        start = perf_counter()
+        result = func()
+        times.append(perf_counter() - start)
+
+    return statistics.median(times), result
+
+
+class _Blur(AbstractProcessingStrategy):
+    """Blur every frame after field matching, standing in for the filtering of a typical script."""
+
+    def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+        return clip.std.BoxBlur(hradius=4, hpasses=2, vradius=4, vpasses=2)
+
+    @property
+    def position(self) -> FilteringPositionEnum:
+        return FilteringPositionEnum.POST_FIELD_MATCH
+
+
+def bench_scale(
+    num_frames: int,
+    repeats: int,
+    render_frames: int,
+    seed: int,
+    tmp_dir: SPath,
+    backend: PluginBackendEnum = PluginBackendEnum.NATIVE,
+) -> dict[str, Any]:
+    """Run all benchmarks for a single scale."""
+
+    config = _config_for(num_frames, seed)
+    wob_path = generate_wob(tmp_dir / f'synthetic_{num_frames}.wob', config)
+    source = blank_source(config)
+
+    result: dict[str, Any] = {'config': config.to_dict(), 'file_mb': wob_path.get_size() / 1e6}
+
+    for json_backend in available_json_backends():
+        parse_time, _ = _timed(partial(load_wob_json, wob_path, json_backend), repeats)
+        result[f'parse_mbps_{json_backend}'] = result['file_mb'] / parse_time
+
+    result['validate_time'], _ = _timed(lambda: validate(wob_path), repeats)
+    result['build_time'], parser = _timed(lambda: WobblyBuilder(wob_path, source).build(), repeats)
+
+    result['pickle_mb'] = len(pickle.dumps(parser)) / 1e6
+
+    tracemalloc.start()
+    WobblyBuilder(wob_path, source).build()
+    result['build_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    try:
+        result['apply_time'], clip = _timed(lambda: WobblyProcessor(parser, backend=backend).apply(), repeats)
+        result['apply_frame_requests'] = WobblyProcessor(parser, backend=backend).count_frame_requests().count
+    except (DependencyNotFoundError, vs.Error) as e:
+        result['apply_error'] = f'{e.__class__.__name__}: {e}'
+
+        return result
+
+    frames = min(render_frames, clip.num_frames)
+
+    start = perf_counter()
+
+    for _ in clip[:frames].frames(close=True):
+        pass
+
+    result['render_fps'] = frames / (perf_counter() - start)
+
+    return result
+
+
+def bench_letterbox(
+    num_frames: int,
+    render_frames: int,
+    seed: int,
+    tmp_dir: SPath,
+    letterbox: int,
+    backend: PluginBackendEnum = PluginBackendEnum.NATIVE,
+) -> dict[str, Any]:
+    """
+    Compare cropping a letterboxed source at the end, right after field matching, and before field matching.
+
+    Every variant blurs the frames after field matching, so the savings of cropping earlier show up in the results.
+    """
+
+    config = dataclasses.replace(_config_for(num_frames, seed), letterbox=letterbox)
+    cropped_height = config.height - 2 * letterbox
+    result: dict[str, Any] = {'crop_pixel_savings': 1 - cropped_height / config.height}
+
+    variants = [
+        ('late', False, OutputSettingsEnum.LATE),
+        ('early', False, OutputSettingsEnum.EARLY),
+        ('source', True, OutputSettingsEnum.LATE),
+    ]
+
+    for name, crop_early, output_settings in variants:
+        variant = dataclasses.replace(config, crop_early=crop_early)
+        wob_path = generate_wob(tmp_dir / f'synthetic_{num_frames}_letterbox_{name}.wob', variant)
+        parser = WobblyBuilder(wob_path, blank_source(variant)).build()
+
+        clip = WobblyProcessor(parser, strategies=[_Blur()], backend=backend, output_settings=output_settings).apply()
+        frames = min(render_frames, clip.num_frames)
+
+        start = perf_counter()
+
+        for _ in clip[:frames].frames(close=True):
+            pass
+
+        result[f'render_fps_crop_{name}'] = frames / (perf_counter() - start)
+
+    return result
+
+
+def bench_preview(
+    num_frames: int,
+    render_frames: int,
+    seed: int,
+    tmp_dir: SPath,
+    backend: PluginBackendEnum = PluginBackendEnum.NATIVE,
+) -> dict[str, Any]:
+    """Step forward and then back through the output one frame at a time, like a previewer, with and without a cache."""
+
+    config = _config_for(num_frames, seed)
+    wob_path = generate_wob(tmp_dir / f'synthetic_{num_frames}.wob', config)
+    parser = WobblyBuilder(wob_path, blank_source(config)).build()
+
+    result: dict[str, Any] = {}
+
+    for name, cached in (('uncached', False), ('cached', True)):
+        clip = WobblyProcessor(parser, backend=backend).apply()
+        frames = min(render_frames, clip.num_frames)
+        steps = [*range(frames), *reversed(range(frames))]
+
+        cache = PreviewCache(clip) if cached else None
+        get_frame = cache.get_frame if cache is not None else clip.get_frame
+
+        start = perf_counter()
+
+        for n in steps:
+            get_frame(n)
+
+        result[f'render_fps_preview_{name}'] = len(steps) / (perf_counter() - start)
+
+        if cache is not None:
+            result['preview_hit_rate'] = cache.hit_rate
+
+    return result
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Print a comparison against a baseline, and return a list of regressions."""
+
+    regressions = list[str]()
+
+    print(f'{"scale":>10}  {"metric":<20} {"baseline":>12} {"current":>12} {"ratio":>8}')
+
+    for scale, current in results['results'].items():
+        if (base := baseline['results'].get(scale)) is None:
+            continue
+
+        for metric in sorted(current.keys() & base.keys()):
+            if not _is_metric(metric) or not base[metric]:
+                continue
+
+            ratio = current[metric] / base[metric]
+            worse = ratio > threshold if metric in LOWER_IS_BETTER else ratio < 1 / threshold
+
+            print(f'{scale:>10}  {metric:<20} {base[metric]:>12.4f} {current[metric]:>12.4f} {ratio:>7.2f}x')
+
+            if worse:
+                regressions.append(f'{scale} {metric}: {base[metric]:.4f} -> {current[metric]:.4f} ({ratio:.2f}x)')
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help='Frame counts to benchmark.')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per timing. The median is reported.')
+    parser.add_argument('--render-frames', type=int, default=1000, help='Output frames to render for throughput.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic wobbly files.')
+    parser.add_argument(
+        '--backend',
+        type=PluginBackendEnum,
+        default=PluginBackendEnum.NATIVE,
+        choices=list(PluginBackendEnum),
+        help='Implementation to use for plugin-dependent operations.',
+    )
+    parser.add_argument(
+        '--letterbox',
+        type=int,
+        default=0,
+        help='Height of the black bars of a letterboxed source to measure early cropping with. 0 to skip.',
+    )
+    parser.add_argument(
+        '--preview', action='store_true', help='Measure stepping through the output with and without a PreviewCache.'
+    )
+    parser.add_argument('--save', type=SPath, help='Write the results to this JSON file.')
+    parser.add_argument('--compare', type=SPath, help='Compare the results against this JSON file.')
+    parser.add_argument('--threshold', type=float, default=1.1, help='Ratio at which a change is a regression.')
+    args = parser.parse_args(argv)
+
+    results: dict[str, Any] = {
+        'meta': {
+            'date': datetime.now(UTC).isoformat(),
+            'python': sys.version.split()[0],
+            'vapoursynth': core.version_number(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'backend': str(args.backend),
+        },
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in args.scales:
+            print(f'Benchmarking {scale} frames...', file=sys.stderr)
+
+            results['results'][str(scale)] = result = bench_scale(
+                scale, args.repeats, args.render_frames, args.seed, SPath(tmp_dir), args.backend
+            )
+
+            if args.letterbox:
+                result |= bench_letterbox(
+                    scale, args.render_frames, args.seed, SPath(tmp_dir), args.letterbox, args.backend
+                )
+
+            if args.preview:
+                result |= bench_preview(scale, args.render_frames, args.seed, SPath(tmp_dir), args.backend)
+
+    print(json.dumps(results, indent=4))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+        if regressions:
+            print('Regressions:\n' + '\n'.join(regressions), file=sys.stderr)
+
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Deterministic generator for synthetic wobbly files, and a BlankClip-backed stand-in source filter.
+
+The generated files only contain data wobbly itself would write,
+so they can be parsed and processed without any real media or source filter plugins.
+"""
+
+import json
+import random
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from jetpytools import SPath, SPathLike
+from vstools import core, vs
+
+__all__ = [
+    'SyntheticWobConfig',
+    'blank_source',
+    'generate_wob',
+]
+
+
+@dataclass(frozen=True)
+class SyntheticWobConfig:
+    """Parameters for a synthetic wobbly file."""
+
+    num_frames: int = 10_000
+    """The number of (pre-decimation) frames."""
+
+    sections: int = 100
+    """The number of sections."""
+
+    section_presets: float = 0.1
+    """The fraction of sections that have a preset assigned."""
+
+    presets: int = 4
+    """The number of presets."""
+
+    custom_lists: int = 8
+    """The number of custom lists."""
+
+    ranges_per_list: int = 50
+    """The number of frame ranges in every custom list."""
+
+    orphans: int = 20
+    """The number of orphan fields. Capped to the number of section boundaries."""
+
+    fades: int = 100
+    """The number of interlaced fade frames."""
+
+    freezes: int = 20
+    """The number of freeze frame ranges."""
+
+    combed: int = 100
+    """The number of combed frames."""
+
+    width: int = 720
+    """The width of the stand-in source clip."""
+
+    height: int = 480
+    """The height of the stand-in source clip."""
+
+    letterbox: int = 0
+    """The height of the black bars at the top and bottom. If non-zero, an enabled crop removing them is written."""
+
+    crop_early: bool = False
+    """Whether the crop is set to be applied before field matching. See `Crop.early`."""
+
+    seed: int = 0
+    """The seed for the random number generator."""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the config as a JSON-serializable dictionary."""
+
+        return asdict(self)
+
+
+_PRESET_CONTENTS = [
+    'clip = clip.std.BoxBlur(hradius=1, vradius=1)',
+    'clip = clip.std.Convolution([1, 2, 1, 2, 4, 2, 1, 2, 1])',
+    'clip = clip.std.Median()',
+    'clip = clip.std.Maximum().std.Minimum()',
+]
+
+
+def _sorted_sample(rng: random.Random, population: range, k: int) -> list[int]:
+    return sorted(rng.sample(population, min(k, len(population))))
+
+
+def _ranges(rng: random.Random, num_frames: int, count: int, max_length: int = 50) -> list[list[int]]:
+    """Create sorted, non-overlapping frame ranges."""
+
+    starts = _sorted_sample(rng, range(num_frames), count)
+    ranges = list[list[int]]()
+
+    for start, next_start in zip(starts, [*starts[1:], num_frames]):
+        end = min(start + rng.randint(0, max_length), next_start - 1)
+        ranges.append([start, end])
+
+    return ranges
+
+
+def generate_wob(path: SPathLike, config: SyntheticWobConfig | None = None) -> SPath:
+    """
+    Write a synthetic wobbly file.
+
+    The same config always produces the same file.
+
+    :param path:        The path to write the wobbly file to. Must end in `.wob`.
+    :param config:      The parameters of the file. Default: `SyntheticWobConfig()`.
+
+    :return:            The path to the wobbly file.
+    """
+
+    if config is None:
+        config = SyntheticWobConfig()
+
+    rng = random.Random(config.seed)
+    n = config.num_frames
+
+    matches = [('c', 'c', 'n', 'n', 'c')[i % 5] for i in range(n)]
+
+    section_starts = [0, *_sorted_sample(rng, range(1, n), config.sections - 1)]
+    section_ends = [*(s - 1 for s in section_starts[1:]), n - 1]
+
+    # Section boundaries must not create orphans, except for the ones explicitly requested.
+    for start, end in zip(section_starts, section_ends):
+        matches[start] = matches[end] = 'c'
+
+    for i in rng.sample(range(len(section_starts)), min(config.orphans, len(section_starts))):
+        if i % 2:
+            matches[section_starts[i]] = 'n'
+        else:
+            matches[section_ends[i]] = 'b'
+
+    presets = [
+        {'name': f'preset_{i}', 'contents': _PRESET_CONTENTS[i % len(_PRESET_CONTENTS)]} for i in range(config.presets)
+    ]
+
+    sections = [
+        {
+            'start': start,
+            'presets': [rng.choice(presets)['name']] if presets and rng.random() < config.section_presets else [],
+        }
+        for start in section_starts
+    ]
+
+    positions = ['post source', 'post field match', 'post decimate']
+
+    custom_lists = [
+        {
+            'name': f'custom list {i}',
+            'preset': presets[i % len(presets)]['name'],
+            'position': positions[i % len(positions)],
+            'frames': _ranges(rng, n, config.ranges_per_list),
+        }
+        for i in range(config.custom_lists if presets else 0)
+    ]
+
+    frozen_frames = [
+        [first, last, min(max(first + rng.randint(-5, 5), 0), n - 1)]
+        for first, last in _ranges(rng, n, config.freezes, 10)
+    ]
+
+    data = {
+        'wobbly version': 6,
+        'project format version': 2,
+        'input file': 'synthetic.mkv',
+        'input frame rate': [30000, 1001],
+        'input resolution': [config.width, config.height],
+        'source filter': 'bs.VideoSource',
+        'vfm parameters': {'order': 1},
+        'matches': matches,
+        'original matches': matches,
+        'sections': sections,
+        'presets': presets,
+        'custom lists': custom_lists,
+        'frozen frames': frozen_frames,
+        'combed frames': _sorted_sample(rng, range(n), config.combed),
+        'decimated frames': [i + rng.randrange(5) for i in range(0, n - 4, 5)],
+        'interlaced fades': [
+            {'frame': frame, 'field difference': round(rng.random() * 0.5, 6)}
+            for frame in _sorted_sample(rng, range(n), config.fades)
+        ],
+        'mics': [[rng.randrange(0, 256) for _ in range(5)] for _ in range(n)],
+        'decimate metrics': [rng.randrange(0, 20000) for _ in range(n)],
+    }
+
+    if config.letterbox:
+        data['crop'] = {
+            'state': True,
+            'early': config.crop_early,
+            'left': 0,
+            'top': config.letterbox,
+            'right': 0,
+            'bottom': config.letterbox,
+        }
+
+    path = SPath(path)
+
+    with open(path, 'w') as file:
+        json.dump(data, file)
+
+    return path
+
+
+@dataclass(frozen=True)
+class _BlankSource:
+    """Picklable stand-in source filter, so parsers using it can be sent to worker processes."""
+
+    config: SyntheticWobConfig
+    format: int
+
+    def __call__(self, src_file: Any) -> vs.VideoNode:
+        return core.std.BlankClip(
+            width=self.config.width,
+            height=self.config.height,
+            format=self.format,
+            length=self.config.num_frames,
+            fpsnum=30000,
+            fpsden=1001,
+        )
+
+
+def blank_source(config: SyntheticWobConfig | None = None, format: int = vs.YUV420P8) -> Callable[[Any], vs.VideoNode]:
+    """
+    Create a stand-in source filter for a synthetic wobbly file.
+
+    :param config:      The config the wobbly file was generated with. Default: `SyntheticWobConfig()`.
+    :param format:      The format of the stand-in clip.
+
+    :return:            A picklable source filter returning a BlankClip of the right length, ignoring the file path.
+    """
+
+    return _BlankSource(config if config is not None else SyntheticWobConfig(), int(format))
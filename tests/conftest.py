@@ -0,0 +1,93 @@
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from jetpytools import SPath
+from vstools import core, vs
+
+from benchmarks.synthetic import SyntheticWobConfig, blank_source, generate_wob
+from vswobbly import WobblyBuilder, WobblyParser
+
+NUM_FRAMES = 20
+
+
+def make_wob(num_frames: int = NUM_FRAMES, **overrides: Any) -> dict[str, Any]:
+    """
+    Create the data of a small wobbly file, with a 'cccnn' pattern and one decimated frame per cycle.
+
+    Keys are passed with underscores instead of spaces, e.g. `custom_lists=[...]`.
+    """
+
+    matches = [('c', 'c', 'c', 'n', 'n')[i % 5] for i in range(num_frames)]
+
+    data: dict[str, Any] = {
+        'wobbly version': 6,
+        'project format version': 2,
+        'input file': 'test.mkv',
+        'input frame rate': [30000, 1001],
+        'input resolution': [64, 48],
+        'source filter': 'bs.VideoSource',
+        'vfm parameters': {'order': 1},
+        'matches': matches,
+        'original matches': list(matches),
+        'sections': [{'start': 0, 'presets': []}],
+        'presets': [],
+        'custom lists': [],
+        'frozen frames': [],
+        'combed frames': [],
+        'decimated frames': list(range(4, num_frames, 5)),
+        'interlaced fades': [],
+    }
+
+    return data | {key.replace('_', ' '): value for key, value in overrides.items()}
+
+
+def source_filter(num_frames: int) -> Callable[[Any], vs.VideoNode]:
+    """A stand-in source filter returning a BlankClip of the right length."""
+
+    return lambda src_file: core.std.BlankClip(
+        width=64, height=48, format=vs.YUV420P8, length=num_frames, fpsnum=30000, fpsden=1001
+    )
+
+
+@pytest.fixture
+def write_wob(tmp_path: SPath) -> Callable[[dict[str, Any]], SPath]:
+    """Write wobbly data to a temporary file."""
+
+    count = 0
+
+    def _write(data: dict[str, Any]) -> SPath:
+        nonlocal count
+
+        count += 1
+        path = SPath(tmp_path) / f'test_{count}.wob'
+
+        with open(path, 'w') as file:
+            json.dump(data, file)
+
+        return path
+
+    return _write
+
+
+@pytest.fixture
+def parse(write_wob: Callable[[dict[str, Any]], SPath]) -> Callable[..., WobblyParser]:
+    """Parse wobbly data, created with `make_wob` from the given overrides."""
+
+    def _parse(**overrides: Any) -> WobblyParser:
+        data = make_wob(**overrides)
+
+        return WobblyBuilder(write_wob(data), source_filter(len(data['matches']))).build()
+
+    return _parse
+
+
+@pytest.fixture
+def parse_synthetic(tmp_path: SPath) -> Callable[[SyntheticWobConfig], WobblyParser]:
+    """Parse a synthetic wobbly file, generated from the given config. See `benchmarks.synthetic`."""
+
+    def _parse(config: SyntheticWobConfig) -> WobblyParser:
+        return WobblyBuilder(generate_wob(SPath(tmp_path) / 'synthetic.wob', config), blank_source(config)).build()
+
+    return _parse
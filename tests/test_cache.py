@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from typing import Any
+
+from jetpytools import SPath
+from vstools import core, vs
+
+from vswobbly import DiskFrameCache, WobblyParser, WobblyProcessor
+
+PRESETS = [{'name': 'invert', 'contents': 'clip = clip.std.Invert()'}]
+CUSTOM_LISTS = [{'name': 'list', 'preset': 'invert', 'position': 'pre decimate', 'frames': [[0, 5]]}]
+
+
+def _render(clip: vs.VideoNode, frames: range) -> list[int]:
+    return [clip.get_frame(n)[0][0, 0] for n in frames]
+
+
+def _cached(cache: DiskFrameCache, clip: vs.VideoNode) -> vs.VideoNode:
+    return cache.cache_clip(clip, lambda n: f'{n:064x}')
+
+
+def test_cache_clip(tmp_path: SPath) -> None:
+    clip = core.std.BlankClip(width=64, height=48, format=vs.YUV420P8, length=4, color=[10, 128, 128])
+    cache = DiskFrameCache(tmp_path)
+
+    assert _render(_cached(cache, clip), range(4)) == [10] * 4
+    assert (cache.hits, cache.misses, len(cache)) == (0, 4, 4)
+
+    cache = DiskFrameCache(tmp_path)
+
+    assert _render(_cached(cache, clip.std.Invert()), range(4)) == [10] * 4
+    assert (cache.hits, cache.misses) == (4, 0)
+
+    # Every frame is unpinned and unmapped once it's loaded.
+    assert not cache._pinned
+    assert not cache._opened
+
+
+def test_cache_clip_deleted_files(tmp_path: SPath) -> None:
+    clip = core.std.BlankClip(width=64, height=48, format=vs.YUV420P8, length=4, color=[10, 128, 128])
+
+    _render(_cached(DiskFrameCache(tmp_path), clip), range(4))
+
+    cache = DiskFrameCache(tmp_path)
+
+    # Evicted by another process.
+    DiskFrameCache(tmp_path).clear()
+
+    assert _render(_cached(cache, clip), range(4)) == [10] * 4
+    assert (cache.hits, cache.misses, len(cache)) == (0, 4, 4)
+
+
+def test_cache_clip_mismatch(tmp_path: SPath) -> None:
+    clip = core.std.BlankClip(width=64, height=48, format=vs.YUV420P8, length=4, color=[10, 128, 128])
+    cache = DiskFrameCache(tmp_path)
+
+    _render(_cached(cache, clip), range(4))
+
+    other = core.std.BlankClip(width=32, height=24, format=vs.YUV420P8, length=4, color=[20, 128, 128])
+
+    assert _render(_cached(cache, other), range(4)) == [20] * 4
+    assert cache.misses == 8
+
+
+def test_cached_custom_lists(parse: Callable[..., WobblyParser], tmp_path: SPath) -> None:
+    parsed = parse(presets=PRESETS, custom_lists=CUSTOM_LISTS)
+    cache = DiskFrameCache(tmp_path)
+
+    def _misses(**kwargs: Any) -> int:
+        clip = kwargs.pop('clip', None)
+        misses = cache.misses
+
+        _render(WobblyProcessor(parsed, backend='std', frame_cache=cache, **kwargs).apply(clip), range(5))
+
+        return cache.misses - misses
+
+    assert _misses() == 5
+    assert _misses() == 0
+    assert _misses(frame_cache_salt='salt') == 5
+    assert _misses(output_settings='late') == 5
+
+    custom_clip = parsed.work_clip.std.Invert()
+
+    assert _misses(clip=custom_clip) == 5
+    assert _misses(clip=custom_clip) == 0
+    assert _misses(clip=parsed.work_clip.std.Invert()) == 5
@@ -0,0 +1,57 @@
+from collections.abc import Callable
+
+import pytest
+from jetpytools import SPath
+from vstools import core, vs
+
+from vswobbly import (
+    FilteringPositionEnum,
+    WobblyParser,
+    WobblyProcessor,
+    wobbly_fingerprint,
+)
+from vswobbly.process.strategies.abstract import AbstractProcessingStrategy
+
+
+def test_fingerprint_settings(parse: Callable[..., WobblyParser]) -> None:
+    parsed = parse()
+    clip = core.std.BlankClip(width=64, height=48, format=vs.YUV420P8, length=20)
+
+    fingerprints = [
+        wobbly_fingerprint(parsed.file_path),
+        wobbly_fingerprint(parsed.file_path, backend='std'),
+        wobbly_fingerprint(parsed.file_path, output_settings='late'),
+        wobbly_fingerprint(parsed.file_path, work_clip=clip),
+        wobbly_fingerprint(parsed.file_path, work_clip=clip.std.Invert()),
+    ]
+
+    assert len(set(fingerprints)) == len(fingerprints)
+    assert wobbly_fingerprint(parsed.file_path, work_clip=clip) == wobbly_fingerprint(
+        parsed.file_path, work_clip=core.std.BlankClip(width=64, height=48, format=vs.YUV420P8, length=20)
+    )
+
+
+def test_render_resumable_copies_strategies(
+    parse: Callable[..., WobblyParser], tmp_path: SPath, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Strategy(AbstractProcessingStrategy):
+        def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+            self.applied = True
+
+            return clip
+
+        @property
+        def position(self) -> FilteringPositionEnum:
+            return FilteringPositionEnum.POST_SOURCE
+
+    strategy = Strategy()
+    processor = WobblyProcessor(parse(), strategies=[strategy], backend='std')
+
+    # Rendering itself is covered by VapourSynth, only the bookkeeping is tested here.
+    monkeypatch.setattr(vs.VideoNode, 'output', lambda self, file, y4m: file.write(b'\0' * self.num_frames))
+
+    checkpoint = processor.render_resumable(SPath(tmp_path) / 'out.raw', chunk_size=4, y4m=False)
+
+    assert checkpoint.finished
+    assert processor.strategies == [strategy]
+    assert not hasattr(strategy, 'applied')
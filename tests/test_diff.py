@@ -0,0 +1,75 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from jetpytools import CustomValueError
+
+from vswobbly import WobblyParser, changed_ranges, changed_source_frames, diff_wobbly
+
+from .conftest import make_wob
+
+
+def _matches(**changes: str) -> list[str]:
+    matches = make_wob()['matches']
+
+    for frame, match in changes.items():
+        matches[int(frame.removeprefix('f'))] = match
+
+    return matches
+
+
+def test_identical(parse: Callable[..., WobblyParser]) -> None:
+    diff = diff_wobbly(parse(), parse())
+
+    assert diff.ranges == []
+    assert diff.num_changed == 0
+    assert not diff.source_frames
+    assert diff.num_frames == diff.old_num_frames == 16
+
+
+def test_changed_match(parse: Callable[..., WobblyParser]) -> None:
+    old, new = parse(), parse(matches=_matches(f7='p'))
+
+    # Source frame 7 is output frame 6, as frame 4 is decimated.
+    assert changed_ranges(old, new) == [(6, 6)]
+    assert changed_ranges(old, new, radius=2) == [(4, 8)]
+    assert changed_source_frames(old, new) == [7]
+
+
+def test_changed_decimation(parse: Callable[..., WobblyParser]) -> None:
+    old, new = parse(), parse(decimated_frames=[4, 8, 14, 19])
+
+    # The shift is undone at the end of the cycle.
+    assert changed_ranges(old, new) == [(7, 7)]
+
+
+def test_removed_decimation(parse: Callable[..., WobblyParser]) -> None:
+    diff = diff_wobbly(parse(), parse(decimated_frames=[4, 9, 14]), keyframe_aligned=False)
+
+    # The frame rate of the last cycle changed, and it gained a frame.
+    assert diff.ranges == [(12, 16)]
+    assert diff.num_frames == 17
+    assert diff.old_num_frames == 16
+
+
+def test_keyframe_aligned(parse: Callable[..., WobblyParser]) -> None:
+    sections = [{'start': 0, 'presets': []}, {'start': 5, 'presets': []}, {'start': 15, 'presets': []}]
+    old, new = parse(sections=sections), parse(sections=sections, matches=_matches(f7='p'))
+
+    # Output frames 4 and 12 are the section starts.
+    assert diff_wobbly(old, new).ranges == [(4, 11)]
+
+
+def test_changed_settings(parse: Callable[..., WobblyParser]) -> None:
+    crop: dict[str, Any] = {'state': True, 'early': False, 'left': 0, 'top': 2, 'right': 0, 'bottom': 2}
+    diff = diff_wobbly(parse(), parse(crop=crop))
+
+    assert diff.full
+    assert diff.ranges == [(0, 15)]
+
+
+def test_negative_radius(parse: Callable[..., WobblyParser]) -> None:
+    parsed = parse()
+
+    with pytest.raises(CustomValueError):
+        diff_wobbly(parsed, parsed, radius=-1)
@@ -0,0 +1,142 @@
+import json
+import pickle
+
+import pytest
+from jetpytools import CustomTypeError
+from vstools import core
+
+from vswobbly import CombedFrames, Decimations, FrameSet, NegativeFrameError
+
+
+def test_sorted_and_deduplicated() -> None:
+    frames = FrameSet([5, 1, 3, 1, 5])
+
+    assert list(frames) == [1, 3, 5]
+    assert len(frames) == 3
+    assert frames == [1, 3, 5]
+
+
+def test_lookups() -> None:
+    frames = FrameSet([2, 4, 6, 8])
+
+    assert 4 in frames
+    assert 5 not in frames
+    assert frames.index(6) == 2
+    assert frames.count(6) == 1
+    assert frames.count(7) == 0
+
+    with pytest.raises(ValueError):
+        frames.index(5)
+
+
+def test_counts() -> None:
+    frames = FrameSet([2, 4, 6, 8])
+
+    assert frames.count_before(0) == 0
+    assert frames.count_before(6) == 2
+    assert frames.count_before(100) == 4
+    assert frames.count_range(3, 6) == 2
+    assert frames.count_range(9, 20) == 0
+    assert list(frames.iter_range(4, 7)) == [4, 6]
+
+
+def test_mutation_keeps_order() -> None:
+    frames = FrameSet([3])
+
+    frames.add(1)
+    frames.append(2)
+    frames.extend([10, 0, 2])
+    assert frames == [0, 1, 2, 3, 10]
+
+    frames.discard(5)
+    frames.remove(2)
+    assert frames == [0, 1, 3, 10]
+
+    with pytest.raises(ValueError):
+        frames.remove(2)
+
+
+def test_set_operations() -> None:
+    a, b = FrameSet([1, 2, 3]), FrameSet([2, 3, 4])
+
+    assert a | b == [1, 2, 3, 4]
+    assert a & b == [2, 3]
+    assert a - b == [1]
+
+
+def test_pickle() -> None:
+    frames = FrameSet([1, 5, 9])
+
+    assert pickle.loads(pickle.dumps(frames)) == frames
+
+
+def test_list_compatible() -> None:
+    frames = FrameSet([3, 1, 2])
+
+    assert isinstance(frames, list)
+    assert frames + [10] == [1, 2, 3, 10]
+    assert [0] + frames == [0, 1, 2, 3]
+    assert json.loads(json.dumps(frames)) == [1, 2, 3]
+    assert frames[1:] == [2, 3]
+
+
+def test_list_mutation_keeps_order() -> None:
+    frames = FrameSet([1, 5])
+
+    frames += [3, 1]
+    assert frames == [1, 3, 5]
+    assert isinstance(frames, FrameSet)
+
+    frames.insert(0, 4)
+    frames[0] = 10
+    assert frames == [3, 4, 5, 10]
+
+    with pytest.raises(NegativeFrameError):
+        frames.add(-1)
+
+
+def test_pass_to_vapoursynth() -> None:
+    clip = core.std.BlankClip(length=10)
+
+    assert clip.std.DeleteFrames(FrameSet([1, 3])).num_frames == 8
+    assert Decimations([2, 4]).apply(clip).num_frames == 8
+
+
+def test_pickle_subclass() -> None:
+    frames = CombedFrames([4, 2])
+    unpickled = pickle.loads(pickle.dumps(frames))
+
+    assert type(unpickled) is CombedFrames
+    assert unpickled == [2, 4]
+
+
+def test_order_is_kept() -> None:
+    frames = FrameSet([3, 1, 2])
+
+    frames.sort()
+    frames *= 2
+    assert frames == [1, 2, 3]
+
+    with pytest.raises(CustomTypeError):
+        frames.reverse()
+
+    with pytest.raises(CustomTypeError):
+        frames.sort(key=lambda frame: -frame)
+
+    with pytest.raises(CustomTypeError):
+        frames.sort(reverse=True)
+
+    assert frames == [1, 2, 3]
+
+    frames *= 0
+    assert frames == []
+
+
+def test_contains_integral() -> None:
+    np = pytest.importorskip('numpy')
+    frames = FrameSet([1, 5])
+
+    assert np.uint32(5) in frames
+    assert np.int64(2) not in frames
+    assert 5.0 not in frames
+    assert '5' not in frames
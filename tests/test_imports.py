@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+LAZY_STRATEGIES = ('DecombVinverseStrategy', 'AdaptiveFixInterlacedFadesStrategy', 'MatchBasedOrphanQTGMCStrategy')
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_strategies_are_imported_lazily() -> None:
+    code = (
+        'import sys, vswobbly\n'
+        "print(sorted(m for m in sys.modules if m.rsplit('.', 1)[-1] in ('combed', 'ifades', 'orphans')"
+        " and '.strategies.' in m))"
+    )
+
+    assert _run(code) == '[]'
+
+
+@pytest.mark.parametrize('package', ['vswobbly', 'vswobbly.process', 'vswobbly.process.strategies'])
+def test_star_import(package: str) -> None:
+    names = set(_run(f'ns = {{}}\nexec("from {package} import *", ns)\nprint(*sorted(ns))').split())
+
+    assert names >= {*LAZY_STRATEGIES, 'CachedStrategy', 'CustomListStrategy'}
+    assert not names & {'Any', 'TYPE_CHECKING', 'import_module'}
+
+
+def test_lazy_strategies_are_shared() -> None:
+    code = (
+        'import vswobbly\n'
+        'from vswobbly import process\n'
+        'from vswobbly.process import strategies\n'
+        f'for name in {LAZY_STRATEGIES}:\n'
+        '    assert getattr(vswobbly, name) is getattr(process, name) is getattr(strategies, name)\n'
+        '    assert name in vars(vswobbly) and name in dir(process)\n'
+        'print(sorted(set(vswobbly.__all__) - set(dir(vswobbly))))'
+    )
+
+    assert _run(code) == '[]'
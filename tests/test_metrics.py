@@ -0,0 +1,87 @@
+import pickle
+from collections.abc import Callable
+
+import pytest
+from jetpytools import CustomValueError
+
+from vswobbly import DecimateMetrics, Mics, WobblyParser
+
+MICS = [[10, 20, 30, 40, 50], [5, 4, 3, 2, 1], [0, 100, 0, 100, 0]]
+
+
+def test_mics() -> None:
+    mics = Mics(MICS)
+
+    assert len(mics) == 3
+    assert mics[1] == dict(zip('pcnbu', MICS[1]))
+    assert mics.get(0, 'n') == 30
+    assert mics.chosen(2, 'ccc') == 100
+    assert list(mics.of_match('p')) == [10, 5, 0]
+    assert list(mics.of_matches('cnu')) == [20, 3, 0]
+    assert mics.frames_above(15, 'c') == [0, 2]
+    assert mics.frames_above(15, 'pcp') == []
+
+    with pytest.raises(IndexError):
+        mics[3]
+
+    with pytest.raises(CustomValueError):
+        mics.get(0, 'x')  # type: ignore[arg-type]
+
+
+def test_mics_packing() -> None:
+    mics = Mics(MICS)
+
+    assert mics.nbytes == 15
+    assert pickle.loads(pickle.dumps(mics))[2] == mics[2]
+
+    with pytest.raises(CustomValueError):
+        Mics([[1, 2, 3]])
+
+
+def test_mics_pickle_size() -> None:
+    num_frames = 200_000
+
+    assert len(pickle.dumps(Mics([[frame % 256] * 5 for frame in range(num_frames)]))) < num_frames * 5 * 1.01
+    assert len(pickle.dumps(Mics([[frame % 1000] * 5 for frame in range(num_frames)]))) < num_frames * 5 * 2.01
+
+    # Values that don't fit 16 bits keep 32 bits, and sums of block differences keep 64 bits.
+    assert Mics([[70_000] * 5]).get(0, 'c') == 70_000
+    assert Mics([[-1] * 5]).get(0, 'c') == -1
+    assert DecimateMetrics([2**40])[0] == 2**40
+
+
+def test_metrics_are_packed_when_created() -> None:
+    rows = [list(row) for row in MICS]
+    mics = Mics(rows)
+
+    # The decoded JSON lists aren't used after packing.
+    rows[0][0] = 255
+    rows.clear()
+
+    assert mics.get(0, 'p') == 10
+
+
+def test_empty_metrics() -> None:
+    assert not Mics()
+    assert not DecimateMetrics([])
+
+
+def test_decimate_metrics() -> None:
+    # Larger than 32 bits, as these are sums over the whole frame.
+    metrics = DecimateMetrics([7, 3, 2**40, 1, 9, 4, 4, 8])
+
+    assert len(metrics) == 8
+    assert metrics[2] == 2**40
+    assert metrics.frames_below(5) == [1, 3, 5, 6]
+    assert metrics.lowest_in_cycle(0) == 3
+    assert metrics.lowest_in_cycle(1) == 5
+
+    with pytest.raises(IndexError):
+        metrics.lowest_in_cycle(2)
+
+
+def test_parsed_metrics(parse: Callable[..., WobblyParser]) -> None:
+    parsed = parse(num_frames=10, mics=[[i] * 5 for i in range(10)], decimate_metrics=list(range(10)))
+
+    assert parsed.mics.get(4, 'c') == 4
+    assert parsed.decimate_metrics.lowest_in_cycle(1) == 5
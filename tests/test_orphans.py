@@ -0,0 +1,58 @@
+import pickle
+
+from vswobbly import OrphanFrame, OrphanFrames
+
+
+def _orphans() -> OrphanFrames:
+    return OrphanFrames([OrphanFrame(9, 'b'), OrphanFrame(0, 'n'), OrphanFrame(4, 'b')])
+
+
+def test_lookups() -> None:
+    orphans = _orphans()
+
+    assert [orphan.frame for orphan in orphans] == [0, 4, 9]
+    assert orphans.match_at(4) == 'b'
+    assert orphans.match_at(5) is None
+    assert orphans.match_frames('b') == [4, 9]
+    assert orphans.used_matches == {'b', 'n'}
+
+
+def test_mutation_drops_the_index() -> None:
+    orphans = _orphans()
+    assert orphans.match_frames('b') == [4, 9]
+
+    orphans.append(OrphanFrame(12, 'b'))
+    assert orphans.match_frames('b') == [4, 9, 12]
+
+    orphans.pop()
+    orphans[0] = OrphanFrame(0, 'u')
+    assert orphans.match_at(0) == 'u'
+
+    del orphans[1]
+    orphans += [OrphanFrame(20, 'p')]
+    assert orphans.frames == [0, 9, 20]
+    assert orphans.used_matches == {'b', 'p', 'u'}
+
+    orphans.clear()
+    assert not orphans.used_matches
+
+
+def test_pickle_with_index() -> None:
+    orphans = _orphans()
+    assert orphans.find_frame(4) == OrphanFrame(4, 'b')
+    assert orphans.frames == [0, 4, 9]
+
+    unpickled = pickle.loads(pickle.dumps(orphans))
+
+    assert type(unpickled) is OrphanFrames
+    assert unpickled == orphans
+
+    # The index isn't pickled, it's rebuilt on first use.
+    assert unpickled._by_frame is None and unpickled._frames is None
+    assert unpickled.match_frames('b') == [4, 9]
+    assert unpickled.frames == [0, 4, 9]
+
+    # The unpickled copy has its own index.
+    unpickled.append(OrphanFrame(12, 'b'))
+    assert unpickled.match_frames('b') == [4, 9, 12]
+    assert orphans.match_frames('b') == [4, 9]
@@ -0,0 +1,54 @@
+import pytest
+from vstools import core, vs
+
+from vswobbly import field_hint, field_hint_clips
+
+NUM_FRAMES = 6
+
+
+def _fields_clip() -> vs.VideoNode:
+    """A clip whose top fields are `10 * n` and bottom fields `10 * n + 5`."""
+
+    def _field(value: int) -> vs.VideoNode:
+        return core.std.BlankClip(width=16, height=8, format=vs.GRAY8, length=1, color=value)
+
+    tops = core.std.Splice([_field(10 * n) for n in range(NUM_FRAMES)])
+    bottoms = core.std.Splice([_field(10 * n + 5) for n in range(NUM_FRAMES)])
+
+    return core.std.Interleave([tops, bottoms]).std.DoubleWeave(tff=True)[::2]
+
+
+def _fields(clip: vs.VideoNode) -> list[tuple[int, int]]:
+    """The value of the top and bottom field of every frame."""
+
+    stats = clip.std.SeparateFields(tff=True).std.PlaneStats()
+    values = [round(stats.get_frame(n).props['PlaneStatsAverage'] * 255) for n in range(stats.num_frames)]
+
+    return list(zip(values[::2], values[1::2]))
+
+
+@pytest.mark.parametrize('tff', [True, False])
+@pytest.mark.parametrize('match', 'pcnbu')
+def test_std_field_hint(tff: bool, match: str) -> None:
+    clip = field_hint_clips(_fields_clip(), tff, match * NUM_FRAMES, 'std')[match]
+
+    offset = {'p': -1, 'b': -1, 'c': 0, 'n': 1, 'u': 1}[match]
+    frames = [(n, min(max(n + offset, 0), NUM_FRAMES - 1)) for n in range(NUM_FRAMES)]
+
+    # 'p', 'c' and 'n' keep the first field and match the second one, 'b' and 'u' the other way around.
+    if (match in 'pcn') == tff:
+        expected = [(10 * n, 10 * m + 5) for n, m in frames]
+    else:
+        expected = [(10 * m, 10 * n + 5) for n, m in frames]
+
+    assert _fields(clip) == expected
+
+
+@pytest.mark.parametrize('tff', [True, False])
+def test_std_matches_native(tff: bool) -> None:
+    if not hasattr(core, 'fh'):
+        pytest.skip('fh is not installed')
+
+    clip, matches = _fields_clip(), 'pcnbuc'
+
+    assert _fields(field_hint(clip, tff, matches, 'std')) == _fields(field_hint(clip, tff, matches, 'native'))
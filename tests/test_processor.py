@@ -0,0 +1,154 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from jetpytools import SPath
+from vstools import vs
+
+from benchmarks.synthetic import SyntheticWobConfig
+from vswobbly import (
+    FieldMatches,
+    FilteringPositionEnum,
+    WobblyBuilder,
+    WobblyParser,
+    WobblyProcessor,
+)
+from vswobbly.process.strategies.abstract import AbstractProcessingStrategy
+
+from .conftest import make_wob, source_filter
+
+
+def test_apply(parse: Callable[..., WobblyParser]) -> None:
+    clip = WobblyProcessor(parse(), backend='std').apply()
+
+    assert clip.num_frames == 16
+    assert clip.get_frame(0).props['WobblyCycleFps'] == 24
+
+
+def test_apply_synthetic(parse_synthetic: Callable[[SyntheticWobConfig], WobblyParser]) -> None:
+    parsed = parse_synthetic(
+        SyntheticWobConfig(num_frames=200, sections=5, orphans=0, combed=5, fades=5, freezes=2, ranges_per_list=2)
+    )
+
+    clip = WobblyProcessor(parsed, backend='std').apply()
+
+    assert clip.num_frames == 200 - len(parsed.decimations)
+    clip.get_frame(clip.num_frames - 1)
+
+
+def test_work_clip_is_lazy(write_wob: Callable[[dict[str, Any]], SPath]) -> None:
+    calls = list[Any]()
+    source = source_filter(20)
+
+    def _source(src_file: Any) -> vs.VideoNode:
+        calls.append(src_file)
+        return source(src_file)
+
+    processor = WobblyProcessor(WobblyBuilder(write_wob(make_wob()), _source).build(), backend='std')
+
+    assert not calls
+
+    processor.apply()
+
+    assert len(calls) == 1
+
+
+def test_custom_work_clip(parse: Callable[..., WobblyParser]) -> None:
+    parsed = parse()
+    work_clip = parsed.work_clip.std.SetFrameProps(Custom=1)
+
+    clip = WobblyProcessor(parsed, work_clip, backend='std').apply()
+
+    assert clip.get_frame(0).props['Custom'] == 1
+
+
+def test_custom_list_past_the_last_frame(parse: Callable[..., WobblyParser]) -> None:
+    presets = [{'name': 'invert', 'contents': 'clip = clip.std.Invert()'}]
+    custom_lists = [
+        {'name': 'list', 'preset': 'invert', 'position': position, 'frames': [[15, 25], [30, 40]]}
+        for position in ('post source', 'post decimate')
+    ]
+
+    clip = WobblyProcessor(parse(presets=presets, custom_lists=custom_lists), backend='std').apply()
+
+    assert clip.num_frames == 16
+    assert clip.get_frame(15).props['WobblyPresetFrames'] == [15, 25]
+
+
+def test_custom_list_default_position(parse: Callable[..., WobblyParser]) -> None:
+    presets = [{'name': 'invert', 'contents': 'clip = clip.std.Invert()'}]
+    parsed = parse(presets=presets, custom_lists=[{'name': 'list', 'preset': 'invert', 'frames': [[0, 5]]}])
+
+    assert parsed.custom_lists[0].position is FilteringPositionEnum.PRE_DECIMATE
+
+
+def test_orphan_strategy_detected_by_type(parse: Callable[..., WobblyParser], monkeypatch: pytest.MonkeyPatch) -> None:
+    from vswobbly import MatchBasedOrphanQTGMCStrategy
+
+    class Deinterlace(MatchBasedOrphanQTGMCStrategy):
+        def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+            return clip
+
+    class OrphanLookalike(AbstractProcessingStrategy):
+        @property
+        def position(self) -> FilteringPositionEnum:
+            return FilteringPositionEnum.POST_SOURCE
+
+        def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+            return clip
+
+    calls = list[Any]()
+    monkeypatch.setattr(FieldMatches, 'set_orphans_to_combed_matches', lambda self, orphans: calls.append(orphans))
+
+    WobblyProcessor(parse(), strategies=[OrphanLookalike()], backend='std').apply()
+
+    assert not calls
+
+    WobblyProcessor(parse(), strategies=[Deinterlace(backend='std')], backend='std').apply()
+
+    assert len(calls) == 1
+
+
+def test_plan_apply_keeps_the_plan_unchanged(parse: Callable[..., WobblyParser]) -> None:
+    presets = [{'name': 'invert', 'contents': 'clip = clip.std.Invert()'}]
+    custom_lists = [
+        {'name': 'list', 'preset': 'invert', 'position': position, 'frames': [[3, 6], [15, 25]]}
+        for position in ('post source', 'post decimate')
+    ]
+    plan = WobblyProcessor(parse(presets=presets, custom_lists=custom_lists), backend='std').compile()
+
+    # Resolved for the 20 source frames, and the 16 frames left after decimation.
+    assert plan.custom_list_ranges == (
+        (20, [((3, 6), (3, 6)), ((15, 25), (15, 19))]),
+        (16, [((3, 6), (3, 5)), ((15, 25), (12, 15))]),
+    )
+
+    for _ in range(2):
+        clip = plan.apply()
+
+        assert clip.get_frame(12).props['WobblyPresetFrames'] == [15, 25]
+
+    assert plan.parser._work_clip is None
+    assert plan.parser.video_data._work_clip is None
+
+
+@pytest.mark.parametrize('early', [False, True])
+def test_crop_early(parse: Callable[..., WobblyParser], early: bool) -> None:
+    heights = list[int]()
+
+    class Record(AbstractProcessingStrategy):
+        @property
+        def position(self) -> FilteringPositionEnum:
+            return FilteringPositionEnum.POST_SOURCE
+
+        def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+            heights.append(clip.height)
+            return clip
+
+    parsed = parse(crop={'state': True, 'early': early, 'left': 0, 'top': 8, 'right': 0, 'bottom': 8})
+    height = parsed.work_clip.height
+
+    clip = WobblyProcessor(parsed, strategies=[Record()], backend='std', output_settings='late').apply()
+
+    assert clip.height == height - 16
+    assert heights == [height - 16 if early else height]
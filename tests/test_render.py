@@ -0,0 +1,130 @@
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, Self
+
+import pytest
+from jetpytools import SPath
+from vstools import vs
+
+from benchmarks.synthetic import SyntheticWobConfig
+from vswobbly import (
+    FilteringPositionEnum,
+    StrategyProfiler,
+    WobblyParser,
+    WobblyProcessor,
+)
+from vswobbly.process import render
+from vswobbly.process.strategies.abstract import AbstractProcessingStrategy
+
+
+def _raw_frames(clip: vs.VideoNode) -> bytes:
+    return b''.join(
+        memoryview(frame[plane]).tobytes()
+        for frame in (clip.get_frame(n) for n in range(clip.num_frames))
+        for plane in range(frame.format.num_planes)
+    )
+
+
+class _Analysing(AbstractProcessingStrategy):
+    """Counts how often it analyses frames, which is skipped once a state was imported."""
+
+    analysed = 0
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._imported: dict[str, Any] | None = None
+
+    def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+        if self._imported is None:
+            _Analysing.analysed += 1
+
+        return clip
+
+    @property
+    def position(self) -> FilteringPositionEnum:
+        return FilteringPositionEnum.POST_SOURCE
+
+    @property
+    def requests_frames(self) -> bool:
+        return True
+
+    def export_state(self) -> dict[str, Any]:
+        return {'frames': [1]}
+
+    def import_state(self, state: dict[str, Any]) -> None:
+        self._imported = state
+
+
+class _InlineExecutor:
+    """Runs the worker initializer and chunks in this process. `clip.output` can deadlock in the test environment."""
+
+    def __init__(self, initializer: Callable[..., None], initargs: tuple[Any, ...], **kwargs: Any) -> None:
+        initializer(*initargs)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        render._worker_state.clear()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future[Any]:
+        future = Future[Any]()
+        future.set_result(func(*args))
+
+        return future
+
+
+def _render_chunk(index: int, start: int, end: int, path: str, y4m: bool) -> dict[str, Any]:
+    with open(path, 'wb') as file:
+        file.write(_raw_frames(render._worker_state['clip'][start : end + 1]))
+
+    profiler = render._worker_state['profiler']
+
+    return {
+        'index': index,
+        'pid': 0,
+        'frames': end - start + 1,
+        'render_time': 0.0,
+        'build_time': render._worker_state.pop('build_time', 0.0),
+        'profile': profiler.stats() if profiler is not None else None,
+    }
+
+
+def test_render_parallel_matches_apply(
+    parse_synthetic: Callable[[SyntheticWobConfig], WobblyParser], tmp_path: SPath, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tmp_path = SPath(tmp_path)
+    parsed = parse_synthetic(
+        SyntheticWobConfig(
+            num_frames=100, sections=4, orphans=0, custom_lists=2, ranges_per_list=2, width=64, height=48, letterbox=8
+        )
+    )
+
+    assert parsed.crop
+
+    profiler = StrategyProfiler('callbacks')
+    processor = WobblyProcessor(
+        parsed, strategies=[_Analysing()], backend='std', output_settings='late', profiler=profiler
+    )
+
+    clip = processor.apply()
+
+    assert (clip.width, clip.height) != (64, 48)
+
+    expected = _raw_frames(clip)
+    applied_frames = sum(stats['frames'] for stats in profiler.report()['strategies'])
+
+    monkeypatch.setattr(render, 'ProcessPoolExecutor', _InlineExecutor)
+    monkeypatch.setattr(render, '_render_chunk', _render_chunk)
+
+    analysed = _Analysing.analysed
+    report = processor.render_parallel(tmp_path / 'chunks', workers=2, y4m=False)
+    report.manifest.stitch(tmp_path / 'parallel.raw', tmp_path / 'chunks')
+
+    assert report.frames == clip.num_frames
+    assert (tmp_path / 'parallel.raw').read_bytes() == expected
+    assert sum(stats['frames'] for stats in profiler.report()['strategies']) > applied_frames
+
+    # Analysed once for the plan, and never again by the workers.
+    assert _Analysing.analysed == analysed + 1
@@ -0,0 +1,37 @@
+from collections.abc import Callable
+
+from vstools import core
+
+from vswobbly import WobblyParser
+
+
+def test_set_props(parse: Callable[..., WobblyParser]) -> None:
+    parsed = parse(sections=[{'start': 0, 'presets': []}, {'start': 10, 'presets': []}])
+    parsed.sections[1].set_pattern(2)
+
+    clip = parsed.sections.set_props(core.std.BlankClip(length=16, fpsnum=30000, fpsden=1001), parsed)
+    props = [clip.get_frame(n).props for n in range(clip.num_frames)]
+
+    # Every cycle has one decimated frame.
+    assert {p['WobblyCycleFps'] for p in props} == {24}
+    assert {(p['_DurationNum'], p['_DurationDen']) for p in props} == {(24000, 1001)}
+
+    # The section starts are compared with the frame numbers of the clip it's applied to.
+    assert [p['WobblyPattern'] for p in props] == [-1] * 10 + [2] * 6
+
+
+def test_set_props_without_decimations(parse: Callable[..., WobblyParser]) -> None:
+    parsed = parse(decimated_frames=[])
+
+    clip = parsed.sections.set_props(core.std.BlankClip(length=20, fpsnum=30000, fpsden=1001), parsed)
+
+    assert {clip.get_frame(n).props['WobblyCycleFps'] for n in range(clip.num_frames)} == {30}
+    assert clip.get_frame(0).props['WobblyPattern'] == -1
+
+
+def test_section_presets_end_on_the_last_frame(parse: Callable[..., WobblyParser]) -> None:
+    presets = [{'name': 'invert', 'contents': 'clip = clip.std.Invert()'}]
+    parsed = parse(presets=presets, sections=[{'start': 0, 'presets': []}, {'start': 10, 'presets': ['invert']}])
+
+    # The last section ends on the last frame, not one past it.
+    assert [custom_list.frames for custom_list in parsed.custom_lists] == [[(10, 19)]]
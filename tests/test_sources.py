@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+from vstools import core
+
+from vswobbly import SourceClipRegistry
+
+
+def test_get_or_create_creates_once() -> None:
+    registry = SourceClipRegistry()
+    barrier = Barrier(8)
+    calls = list[int]()
+
+    def factory() -> object:
+        calls.append(1)
+
+        return core.std.BlankClip(length=1)
+
+    def get() -> object:
+        barrier.wait()
+
+        return registry.get_or_create('key', factory)
+
+    with ThreadPoolExecutor(8) as pool:
+        clips = list(pool.map(lambda _: get(), range(8)))
+
+    assert len(calls) == 1
+    assert all(clip is clips[0] for clip in clips)
+    assert registry.misses == 1
+    assert not registry._pending
+
+
+def test_get_or_create_failure_releases_key() -> None:
+    registry = SourceClipRegistry()
+
+    def fail() -> object:
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        registry.get_or_create('key', fail)
+
+    assert not registry._pending
+    assert 'key' not in registry
+
+    clip = registry.get_or_create('key', lambda: core.std.BlankClip(length=1))
+
+    assert registry.get_or_create('key', lambda: core.std.BlankClip(length=2)) is clip
@@ -0,0 +1,114 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from jetpytools import SPath
+
+from vswobbly import WobblyParseError, WobblyValidationError, WobblyValidator, validate
+
+from .conftest import make_wob
+
+
+def test_valid_file(write_wob: Callable[[dict[str, Any]], SPath]) -> None:
+    validate(write_wob(make_wob()))
+
+
+def test_empty_file(tmp_path: SPath) -> None:
+    path = SPath(tmp_path) / 'empty.wob'
+    path.write_text('{}')
+
+    with pytest.raises(WobblyParseError):
+        validate(path)
+
+
+@pytest.mark.parametrize(
+    'overrides',
+    [
+        {'source_filter': 'VideoSource'},
+        {'matches': 'cccnn'},
+        {'trim': [[10, 5]]},
+        {'crop': {'state': True, 'left': -2, 'top': 0, 'right': 0, 'bottom': 0}},
+        {'wobbly_version': 5},
+    ],
+)
+def test_invalid_structure(overrides: dict[str, Any]) -> None:
+    with pytest.raises(WobblyValidationError):
+        WobblyValidator.validate(make_wob(**overrides))
+
+
+def test_missing_fields() -> None:
+    data = make_wob()
+    del data['source filter']
+
+    with pytest.raises(WobblyValidationError, match='Missing required fields'):
+        WobblyValidator.validate(data)
+
+
+def test_output_settings() -> None:
+    crop = {'state': True, 'left': 0, 'top': 2, 'right': 0, 'bottom': 2}
+    resize = {'state': True, 'width': 64, 'height': 48}
+
+    WobblyValidator.validate(make_wob(crop=crop, resize=resize))
+
+    with pytest.raises(WobblyValidationError, match=r"positive integers for: \['width'\]"):
+        WobblyValidator.validate(make_wob(resize=resize | {'width': 0}))
+
+
+def test_disabled_settings_are_not_checked() -> None:
+    WobblyValidator.validate(make_wob(crop={'state': False, 'left': -2}))
+
+
+@pytest.mark.parametrize(
+    ('overrides', 'message'),
+    [
+        ({'matches': ['c', 'x']}, 'invalid matches'),
+        ({'combed_frames': [3, -1]}, 'negative'),
+        ({'combed_frames': [3, 'a']}, 'not integers'),
+        ({'decimated_frames': [25]}, 'past the last frame'),
+        ({'sections': [{'start': 5}, {'start': 0}]}, 'sorted'),
+        ({'frozen_frames': [[5, 2, 1]]}, 'frozen frames'),
+        ({'interlaced_fades': [{'frame': 1}]}, 'interlaced fade'),
+    ],
+)
+def test_invalid_frames(overrides: dict[str, Any], message: str) -> None:
+    with pytest.raises(WobblyValidationError, match=message):
+        WobblyValidator.validate(make_wob(**overrides))
+
+
+def test_invalid_presets() -> None:
+    with pytest.raises(WobblyValidationError, match='Duplicate preset name'):
+        WobblyValidator.validate(make_wob(presets=[{'name': 'a', 'contents': ''}, {'name': 'a', 'contents': ''}]))
+
+    with pytest.raises(WobblyValidationError, match='Invalid Python code'):
+        WobblyValidator.validate(make_wob(presets=[{'name': 'a', 'contents': 'clip = ('}]))
+
+
+def test_unknown_preset_references() -> None:
+    with pytest.raises(WobblyValidationError, match='unknown preset'):
+        WobblyValidator.validate(make_wob(sections=[{'start': 0, 'presets': ['missing']}]))
+
+    custom_list = {'name': 'list', 'preset': 'missing', 'position': 'post source', 'frames': [[0, 1]]}
+
+    with pytest.raises(WobblyValidationError, match='unknown preset'):
+        WobblyValidator.validate(make_wob(custom_lists=[custom_list]))
+
+
+def test_custom_list_past_the_last_frame() -> None:
+    presets = [{'name': 'a', 'contents': ''}]
+    custom_list = {'name': 'list', 'preset': 'a', 'position': 'post source', 'frames': [[15, 25], [30, 40]]}
+
+    WobblyValidator.validate(make_wob(presets=presets, custom_lists=[custom_list]))
+
+    with pytest.raises(WobblyValidationError, match='negative'):
+        WobblyValidator.validate(make_wob(presets=presets, custom_lists=[custom_list | {'frames': [[-1, 5]]}]))
+
+
+def test_custom_list_position() -> None:
+    presets = [{'name': 'a', 'contents': ''}]
+    custom_list = {'name': 'list', 'preset': 'a', 'frames': [[0, 5]]}
+
+    # Custom lists without a position are applied before decimation.
+    WobblyValidator.validate(make_wob(presets=presets, custom_lists=[custom_list]))
+
+    with pytest.raises(WobblyValidationError, match='invalid position'):
+        WobblyValidator.validate(make_wob(presets=presets, custom_lists=[custom_list | {'position': 'somewhere'}]))
@@ -0,0 +1,109 @@
+import json
+from typing import Any
+
+import pytest
+from jetpytools import CustomValueError, SPath
+from vstools import vs
+
+from vswobbly import (
+    FilteringPositionEnum,
+    WobblyParseError,
+    WobblyParser,
+    WobblyWatcher,
+)
+from vswobbly.process.strategies.abstract import AbstractProcessingStrategy
+
+from .conftest import make_wob, source_filter
+
+
+class _Temporal(AbstractProcessingStrategy):
+    def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+        return clip
+
+    @property
+    def position(self) -> FilteringPositionEnum:
+        return FilteringPositionEnum.PRE_DECIMATE
+
+    @property
+    def temporal_radius(self) -> int:
+        return 2
+
+
+class _Deciding(_Temporal):
+    """Decides on frame 3 depending on whether there are any presets, which don't affect any frame's signature."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._frames = list[int]()
+
+    def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+        self._frames = [3] if wobbly_parsed.presets else []
+
+        return clip
+
+    @property
+    def temporal_radius(self) -> int:
+        return 0
+
+    def export_state(self) -> dict[str, Any]:
+        return {'frames': self._frames}
+
+
+def _write(path: SPath, **overrides: Any) -> None:
+    with open(path, 'w') as file:
+        json.dump(make_wob(**overrides), file)
+
+
+def _watcher(path: SPath, **kwargs: Any) -> WobblyWatcher:
+    return WobblyWatcher(path, source_filter=source_filter(20), backend='std', **kwargs)
+
+
+def test_radius_from_strategies(tmp_path: SPath) -> None:
+    path = SPath(tmp_path) / 'test.wob'
+    _write(path)
+
+    watcher = _watcher(path, strategies=[_Temporal()])
+
+    assert watcher.radius == 2
+    assert _watcher(path).radius == 0
+
+    matches = make_wob()['matches']
+    matches[7] = 'p'
+    _write(path, matches=matches)
+
+    # Source frame 7 is output frame 6, as frame 4 is decimated.
+    assert watcher.reload().changed_ranges == [(4, 8)]
+
+    with pytest.raises(CustomValueError):
+        _watcher(path, radius=-1)
+
+
+def test_changed_strategy_decisions(tmp_path: SPath) -> None:
+    path = SPath(tmp_path) / 'test.wob'
+    _write(path)
+
+    watcher = _watcher(path, strategies=[_Deciding()])
+
+    _write(path, presets=[{'name': 'unused', 'contents': 'clip = clip'}])
+
+    assert watcher.reload().changed_ranges == [(3, 3)]
+
+
+def test_poll_invalid_file(tmp_path: SPath) -> None:
+    path = SPath(tmp_path) / 'test.wob'
+    _write(path)
+
+    watcher = _watcher(path)
+    clip = watcher.clip
+
+    path.write_text('{"matches": [')
+
+    with pytest.raises(WobblyParseError):
+        watcher.poll()
+
+    assert watcher.clip is clip
+
+    _write(path)
+
+    assert watcher.poll() is not None
@@ -1,8 +1,42 @@
 # ruff: noqa: F401, F403
 
+from typing import TYPE_CHECKING
+
+from . import components, data, exceptions, plugins, process, sources, types, util
 from .components import *
 from .data import *
 from .exceptions import *
-from .process import *
+from .plugins import *
+from .process.cache import *
+from .process.checkpoint import *
+from .process.chunks import *
+from .process.explain import *
+from .process.plan import *
+from .process.processor import *
+from .process.profiling import *
+from .process.render import *
+from .process.strategies.cached import *
+from .process.strategies.custom_lists import *
+from .process.watch import *
+from .sources import *
 from .types import *
 from .util import *
+from .util import lazy_attributes
+
+if TYPE_CHECKING:
+    from .process.strategies.combed import *
+    from .process.strategies.ifades import *
+    from .process.strategies.orphans import *
+
+# Star-importing `process` would import its lazily imported strategies, so its modules are star-imported instead.
+__all__: list[str] = []
+__all__ += components.__all__
+__all__ += data.__all__
+__all__ += exceptions.__all__
+__all__ += plugins.__all__
+__all__ += process.__all__
+__all__ += sources.__all__
+__all__ += types.__all__
+__all__ += util.__all__
+
+__getattr__, __dir__ = lazy_attributes(__name__, process.strategies._LAZY_STRATEGIES)
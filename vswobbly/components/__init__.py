@@ -1,13 +1,48 @@
 # ruff: noqa: F401, F403
 
+from . import (
+    combed,
+    custom_lists,
+    decimations,
+    frames,
+    freeze,
+    ifades,
+    matches,
+    metrics,
+    orphans,
+    output,
+    presets,
+    sections,
+    types,
+    video,
+)
 from .combed import *
 from .custom_lists import *
 from .decimations import *
+from .frames import *
 from .freeze import *
 from .ifades import *
 from .matches import *
+from .metrics import *
 from .orphans import *
+from .output import *
 from .presets import *
 from .sections import *
 from .types import *
 from .video import *
+
+__all__: list[str] = []
+__all__ += combed.__all__
+__all__ += custom_lists.__all__
+__all__ += decimations.__all__
+__all__ += frames.__all__
+__all__ += freeze.__all__
+__all__ += ifades.__all__
+__all__ += matches.__all__
+__all__ += metrics.__all__
+__all__ += orphans.__all__
+__all__ += output.__all__
+__all__ += presets.__all__
+__all__ += sections.__all__
+__all__ += types.__all__
+__all__ += video.__all__
@@ -1,25 +1,15 @@
-from jetpytools import fallback
 from vstools import replace_ranges, vs
 
 from ..exceptions import NegativeFrameError
-from ..util import deduplicate_list
+from .frames import FrameSet
 
 __all__ = [
     'CombedFrames',
 ]
 
 
-class CombedFrames(list[int]):
-    """Class for holding combed frames."""
-
-    def __init__(self, frames: list[int] | None = None) -> None:
-        super().__init__(frames or [])
-
-        NegativeFrameError.check(self.__class__, fallback(self, []))
-
-        self.sort()
-
-        self[:] = deduplicate_list(self)
+class CombedFrames(FrameSet):
+    """Class for holding a sorted set of combed frames."""
 
     @classmethod
     def wob_json_key(cls) -> str:
@@ -30,10 +20,7 @@ class CombedFrames(list[int]):
     def find_frame(self, frame: int) -> int | None:
         """Find a frame in the list."""
 
-        if frame in self:
-            return next(f for f in self if f == frame)
-
-        return None
+        return frame if frame in self else None
 
     def get_frame(self, frame: int) -> int:
         """Get a frame from the list, and raise an error if not found."""
@@ -1,4 +1,3 @@
-from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from typing import Any, Iterable, Self
 
@@ -34,7 +33,7 @@ class CustomList:
 
         self.name = kwargs.get('name', '')
         self.preset = kwargs.get('preset', '')
-        self.position = FilteringPositionEnum(kwargs.get('position', 'pre decimation'))
+        self.position = FilteringPositionEnum(kwargs.get('position', FilteringPositionEnum.PRE_DECIMATE))
         self.frames = kwargs.get('frames', [])
 
     def __post_init__(self) -> None:
@@ -86,16 +85,64 @@ class CustomList:
 
         return ranges
 
-    def apply(self, clip: vs.VideoNode, decimations: Decimations, **kwargs: Any) -> vs.VideoNode:
+    def resolve_ranges(
+        self, decimations: Decimations, num_frames: int
+    ) -> list[tuple[int | tuple[int, int], int | tuple[int, int]]]:
         """
-        Apply the custom list to a given clip.
+        Resolve the frame ranges to the frames of the clip at this custom list's position.
 
         If this custom list's :attr:`position` is :attr:`FilteringPositionEnum.POST_DECIMATE`,
         then this accounts for decimated frames by adjusting frame ranges
         based on the number of decimations that occur before each range endpoint.
+        Ranges past the last frame are clamped to the clip, or skipped entirely.
 
-        :param clip:            The clip to apply the custom list to.
         :param decimations:     The decimations to account for.
+        :param num_frames:      The number of frames of the clip at this custom list's position.
+
+        :return:                A list of `(range, effective_range)` pairs, where `range` is the range
+                                in the wobbly file, and `effective_range` the frames of the clip to replace.
+        """
+
+        resolved = list[tuple[int | tuple[int, int], int | tuple[int, int]]]()
+
+        for _range in self._frames_to_ranges(self.frames):
+            if self.position is FilteringPositionEnum.POST_DECIMATE:
+                first, last = _range if isinstance(_range, tuple) else (_range, _range)
+                first -= decimations.count_before(first)
+                last -= decimations.count_before(last + 1)
+                if first > last:
+                    # Wobbly-generated scripts fail at runtime in this case, but that's annoying
+                    continue
+                effective_range = first if first == last else (first, last)
+            else:
+                effective_range = _range
+
+            if isinstance(effective_range, tuple):
+                if effective_range[0] >= num_frames:
+                    continue
+
+                effective_range = (effective_range[0], min(effective_range[1], num_frames - 1))
+            elif effective_range >= num_frames:
+                continue
+
+            resolved.append((_range, effective_range))
+
+        return resolved
+
+    def apply(
+        self,
+        clip: vs.VideoNode,
+        decimations: Decimations,
+        ranges: list[tuple[int | tuple[int, int], int | tuple[int, int]]] | None = None,
+        **kwargs: Any,
+    ) -> vs.VideoNode:
+        """
+        Apply the custom list to a given clip.
+
+        :param clip:            The clip to apply the custom list to.
+        :param decimations:     The decimations to account for. See `resolve_ranges`.
+        :param ranges:          The ranges resolved for this clip with `resolve_ranges`.
+                                Default: the ranges are resolved from the decimations.
 
         :return:                The clip with the custom list applied.
         """
@@ -109,25 +156,14 @@ class CustomList:
                 self.apply,
             )
 
-        for _range in self._frames_to_ranges(self.frames):
+        if ranges is None:
+            ranges = self.resolve_ranges(decimations, clip.num_frames)
+
+        for _range, effective_range in ranges:
             range_flt = flt.std.SetFrameProps(
                 WobblyPreset=str(self.preset), WobblyPresetPosition=self.position.value, WobblyPresetFrames=_range
             )
 
-            if self.position is FilteringPositionEnum.POST_DECIMATE:
-                first, last = _range if isinstance(_range, tuple) else (_range, _range)
-                first -= bisect_left(decimations, first)
-                last -= bisect_right(decimations, last)
-                if first > last:
-                    # Wobbly-generated scripts fail at runtime in this case, but that's annoying
-                    continue
-                effective_range = first if first == last else (first, last)
-            else:
-                effective_range = _range
-
-            if isinstance(_range, tuple) and _range[1] >= clip.num_frames:
-                _range = (_range[0], clip.num_frames - 1)
-
             explained_range = _range if _range == effective_range else f'{_range}, after decimation: {effective_range}'
 
             try:
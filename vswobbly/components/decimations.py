@@ -1,25 +1,14 @@
-from jetpytools import fallback
 from vstools import vs
 
-from ..exceptions import NegativeFrameError
-from ..util import deduplicate_list
+from .frames import FrameSet
 
 __all__ = [
     'Decimations',
 ]
 
 
-class Decimations(list[int]):
-    """Class for holding a sorted list of decimated frame indices."""
-
-    def __init__(self, decimations: list[int] | None = None) -> None:
-        super().__init__(decimations or [])
-
-        NegativeFrameError.check(self.__class__, fallback(self, []))
-
-        self.sort()
-
-        self[:] = deduplicate_list(self)
+class Decimations(FrameSet):
+    """Class for holding a sorted set of decimated frame indices."""
 
     @classmethod
     def wob_json_key(cls) -> str:
@@ -30,10 +19,7 @@ class Decimations(list[int]):
     def find_decimation(self, frame: int) -> int | None:
         """Find a decimation in the list."""
 
-        try:
-            return self[self.index(frame)]
-        except ValueError:
-            return None
+        return frame if frame in self else None
 
     def apply(self, clip: vs.VideoNode) -> vs.VideoNode:
         """Apply the decimations to the clip."""
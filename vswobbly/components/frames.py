@@ -0,0 +1,211 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from numbers import Integral
+from typing import Any, Self, SupportsIndex
+
+from jetpytools import CustomTypeError
+
+from ..exceptions import NegativeFrameError
+from ..util import unchecked_list
+
+__all__ = [
+    'FrameSet',
+]
+
+
+class FrameSet(list[int]):
+    """
+    A sorted, deduplicated list of frame numbers.
+
+    This is a regular list, so it can be passed to VapourSynth functions, serialized to JSON,
+    and concatenated with other lists (which returns a plain list).
+    Membership tests and range queries use bisection, and are O(log n).
+
+    The list keeps itself sorted and deduplicated when modified through `add`, `append`, `extend`, `insert`,
+    `+=`, `*=` or item assignment. Reordering it with `reverse` or `sort` with a key or in reverse raises an error.
+    When pickled (e.g. when sending a parser to worker processes),
+    the frames are packed into an `array('I')`, using 4 bytes per frame.
+
+    In memory, the frames are Python ints rather than an `array('I')`:
+    VapourSynth functions, `json` and code expecting a list only accept real lists.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, frames: Iterable[int] | None = None) -> None:
+        """
+        :param frames:      The frame numbers. They are sorted and deduplicated.
+
+        :raises NegativeFrameError:     Any of the frame numbers is negative.
+        """
+
+        frames = sorted(set(frames or []))
+
+        NegativeFrameError.check(self.__class__, frames)
+
+        super().__init__(frames)
+
+    @classmethod
+    def from_sorted(cls, frames: Iterable[int]) -> Self:
+        """
+        Create a frame set from frames that are already sorted, unique and not negative, skipping all checks.
+
+        :param frames:      The sorted frame numbers.
+
+        :return:            The frame set.
+        """
+
+        return unchecked_list(cls, frames)
+
+    @classmethod
+    def _from_packed(cls, packed: bytes) -> Self:
+        """Unpickle a frame set packed by `__reduce__`."""
+
+        frames = array('I')
+        frames.frombytes(packed)
+
+        return cls.from_sorted(frames)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__._from_packed, (array('I', self).tobytes(),)
+
+    def __contains__(self, frame: object) -> bool:
+        if not isinstance(frame, Integral) or frame < 0:
+            return False
+
+        idx = bisect_left(self, frame)
+
+        return idx < len(self) and self[idx] == frame
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list.__repr__(self)})'
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+
+        self._normalize()
+
+    def __iadd__(self, other: Iterable[int]) -> Self:  # type: ignore[override,misc]
+        self.extend(other)
+
+        return self
+
+    def __imul__(self, value: SupportsIndex) -> Self:
+        # Repeating a set only removes its frames, as duplicates are dropped.
+        if int(value) <= 0:
+            self.clear()
+
+        return self
+
+    def __or__(self, other: Iterable[int]) -> Self:
+        return self.union(other)
+
+    def __and__(self, other: Iterable[int]) -> Self:
+        return self.intersection(other)
+
+    def __sub__(self, other: Iterable[int]) -> Self:
+        return self.difference(other)
+
+    def index(self, frame: Any, start: SupportsIndex = 0, stop: SupportsIndex | None = None) -> int:
+        """Get the position of a frame in the set."""
+
+        idx = bisect_left(self, frame, int(start), len(self) if stop is None else int(stop))
+
+        if idx == len(self) or self[idx] != frame:
+            raise ValueError(f'{frame} is not in {self.__class__.__name__}')
+
+        return idx
+
+    def count(self, frame: Any) -> int:
+        """Get the number of occurrences of a frame, i.e. 1 if it's in the set, and 0 otherwise."""
+
+        return int(frame in self)
+
+    def count_before(self, frame: int) -> int:
+        """Count the frames lower than the given frame."""
+
+        return bisect_left(self, frame)
+
+    def count_range(self, first: int, last: int) -> int:
+        """Count the frames within an inclusive range."""
+
+        return max(0, bisect_right(self, last) - bisect_left(self, first))
+
+    def iter_range(self, first: int, last: int) -> Iterator[int]:
+        """Iterate over the frames within an inclusive range."""
+
+        return iter(self[bisect_left(self, first) : bisect_right(self, last)])
+
+    def union(self, other: Iterable[int]) -> Self:
+        """Get a new frame set containing the frames of both sets."""
+
+        return self.__class__(set(self).union(other))
+
+    def intersection(self, other: Iterable[int]) -> Self:
+        """Get a new frame set containing the frames that are in both sets."""
+
+        other = other if isinstance(other, (FrameSet, set, frozenset)) else set(other)
+
+        return self.from_sorted([frame for frame in self if frame in other])
+
+    def difference(self, other: Iterable[int]) -> Self:
+        """Get a new frame set containing the frames that are not in the other set."""
+
+        other = other if isinstance(other, (FrameSet, set, frozenset)) else set(other)
+
+        return self.from_sorted([frame for frame in self if frame not in other])
+
+    def add(self, frame: int) -> None:
+        """Add a frame, keeping the set sorted."""
+
+        NegativeFrameError.check(self.__class__, frame)
+
+        if frame not in self:
+            list.insert(self, bisect_left(self, frame), frame)
+
+    def append(self, frame: int) -> None:
+        """Add a frame, keeping the set sorted. Alias of `add` for list compatibility."""
+
+        self.add(frame)
+
+    def insert(self, index: SupportsIndex, frame: int) -> None:
+        """Add a frame, keeping the set sorted. The index is ignored."""
+
+        self.add(frame)
+
+    def extend(self, frames: Iterable[int]) -> None:
+        """Add multiple frames, keeping the set sorted."""
+
+        list.__setitem__(self, slice(None), self.union(frames))
+
+    def sort(self, *, key: Callable[[int], Any] | None = None, reverse: bool = False) -> None:
+        """The frames are always sorted in ascending order, so this does nothing unless it would reorder them."""
+
+        if key is not None or reverse:
+            raise CustomTypeError('The frames are always sorted in ascending order!', self.sort)
+
+    def reverse(self) -> None:
+        """The frames are always sorted in ascending order, so they can't be reversed."""
+
+        raise CustomTypeError('The frames are always sorted in ascending order!', self.reverse)
+
+    def discard(self, frame: int) -> None:
+        """Remove a frame if it's in the set."""
+
+        if frame in self:
+            del self[self.index(frame)]
+
+    def remove(self, frame: int) -> None:
+        """Remove a frame, raising a ValueError if it's not in the set."""
+
+        del self[self.index(frame)]
+
+    def _normalize(self) -> None:
+        """Sort and deduplicate the frames after they were modified through the list interface."""
+
+        frames = sorted(set(self))
+
+        NegativeFrameError.check(self.__class__, frames)
+
+        list.__setitem__(self, slice(None), frames)
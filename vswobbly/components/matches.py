@@ -1,8 +1,10 @@
 from typing import Any
 
-from jetpytools import CustomIndexError, CustomValueError, DependencyNotFoundError
-from vstools import FieldBased, core, vs
+from jetpytools import CustomIndexError, CustomValueError
+from vstools import FieldBased, vs
 
+from ..plugins import field_hint_clips
+from ..types import PluginBackendEnum
 from .types import ValidMatchT
 
 __all__ = [
@@ -45,6 +47,16 @@ class FieldMatches(list[str]):
     def __str__(self) -> str:
         return ', '.join(str(match) for match in self)
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle as a single string, which is far smaller than a list of one-character strings.
+        return self.from_string, (self.fieldhint_string,)
+
+    @classmethod
+    def from_string(cls, matches: str) -> 'FieldMatches':
+        """Create field matches from a string containing one match per frame, e.g. `ccnnc`."""
+
+        return cls(list(matches))
+
     @classmethod
     def wob_json_key(cls) -> str:
         """The JSON key for matches."""
@@ -76,17 +88,30 @@ class FieldMatches(list[str]):
         for orphan in orphans:
             self[orphan.frame] = 'c'
 
-    def apply(self, clip: vs.VideoNode) -> vs.VideoNode:
-        """Apply the matches to the clip."""
+    def apply(
+        self,
+        clip: vs.VideoNode,
+        tff: bool | None = None,
+        backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+    ) -> vs.VideoNode:
+        """
+        Apply the matches to the clip.
+
+        :param clip:        The clip to field match.
+        :param tff:         Whether the clip is top field first. Pass the parsed field order if possible.
+                            If None, the field order is read from the first frame of the clip,
+                            which renders a frame while building the graph.
+        :param backend:     The field hinting implementation to use. See `PluginBackendEnum`. Default: native.
 
-        if not hasattr(core, 'fh'):
-            raise DependencyNotFoundError(self.apply, 'FieldHint')
+        :return:            The field matched clip, with the match of every frame set as `WobblyMatch`.
+        """
 
-        fh = clip.fh.FieldHint(tff=FieldBased.from_video(clip).is_tff, matches=self.fieldhint_string)
+        if tff is None:
+            tff = FieldBased.from_video(clip).is_tff
 
-        match_clips = dict[str, vs.VideoNode]()
+        match_clips = field_hint_clips(clip, tff, self.fieldhint_string, backend)
 
-        for match in set(self):
-            match_clips[match] = fh.std.SetFrameProps(WobblyMatch=match)
+        for match, match_clip in match_clips.items():
+            match_clips[match] = match_clip.std.SetFrameProps(WobblyMatch=match)
 
-        return fh.std.FrameEval(lambda n: match_clips[self[n]])
+        return clip.std.FrameEval(lambda n: match_clips[self[n]])
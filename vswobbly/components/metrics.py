@@ -0,0 +1,275 @@
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import chain
+from typing import Any, Self
+
+from jetpytools import CustomValueError
+
+from .frames import FrameSet
+from .types import ValidMatchT
+
+__all__ = [
+    'DecimateMetrics',
+    'Mics',
+]
+
+
+class _PackedMetrics:
+    """
+    Base class for per-frame metrics stored in a wobbly file.
+
+    The metrics are packed into an array when created, so the decoded JSON lists can be freed right away.
+    The array uses the smallest integer type that holds every value, e.g. a single byte for typical mics.
+    """
+
+    __slots__ = ('_values',)
+
+    _width = 1
+    """The number of values per frame."""
+
+    def __init__(self, values: Sequence[Any] | None = None) -> None:
+        """
+        :param values:      The metrics as stored in the wobbly file.
+
+        :raises CustomValueError:   The metrics don't have `_width` values for every frame.
+        """
+
+        self._values = _narrow(self._pack(values or []))
+
+    @classmethod
+    def from_array(cls, values: array) -> Self:
+        """
+        Create the metrics from an already packed array, e.g. when unpickling.
+
+        :param values:      The packed metrics, `_width` values per frame.
+
+        :return:            The metrics.
+        """
+
+        obj = cls.__new__(cls)
+        obj._values = values
+
+        return obj
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__.from_array, (self._values,)
+
+    def __len__(self) -> int:
+        return len(self._values) // self._width
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self)} frames)'
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the packed metrics, in bytes."""
+
+        return len(self._values) * self._values.itemsize
+
+    def _packed(self) -> array:
+        """Get the packed metrics."""
+
+        return self._values
+
+    def _pack(self, raw: Sequence[Any]) -> array:
+        return array('i', raw)
+
+
+def _narrow(values: array) -> array:
+    """Convert packed integers to the smallest integer type that holds all of them."""
+
+    if not values:
+        return values
+
+    low, high = min(values), max(values)
+
+    for typecode in 'BbHhiq':
+        if (itemsize := array(typecode).itemsize) >= values.itemsize:
+            return values
+
+        bits = itemsize * 8
+
+        if typecode.isupper() and low >= 0 and high < 1 << bits:
+            return array(typecode, values)
+
+        if typecode.islower() and -(1 << (bits - 1)) <= low and high < 1 << (bits - 1):
+            return array(typecode, values)
+
+    return values
+
+
+class Mics(_PackedMetrics):
+    """
+    Combing metrics (mics) of every frame, computed by wibbly for every possible match.
+
+    A higher mic means the frame is more combed when that match is used.
+    """
+
+    __slots__ = ()
+
+    _width = 5
+
+    MATCH_ORDER = 'pcnbu'
+    """The order in which wobbly stores the mics of every match."""
+
+    @classmethod
+    def wob_json_key(cls) -> str:
+        """The JSON key for mics."""
+
+        return 'mics'
+
+    def __getitem__(self, frame: int) -> dict[str, int]:
+        """Get the mics of every match at a frame."""
+
+        return dict(zip(self.MATCH_ORDER, self._row(frame)))
+
+    def __iter__(self) -> Iterator[dict[str, int]]:
+        for frame in range(len(self)):
+            yield self[frame]
+
+    def get(self, frame: int, match: ValidMatchT) -> int:
+        """
+        Get the mic of a single match at a frame.
+
+        :param frame:       The frame number.
+        :param match:       The match to get the mic of.
+
+        :return:            The mic.
+        """
+
+        return self._row(frame)[self._match_index(match)]
+
+    def chosen(self, frame: int, matches: Sequence[str]) -> int:
+        """
+        Get the mic of the match that was chosen for a frame.
+
+        :param frame:       The frame number.
+        :param matches:     The match of every frame, e.g. `WobblyParser.field_matches`.
+
+        :return:            The mic of the chosen match.
+        """
+
+        return self.get(frame, matches[frame])  # type: ignore[arg-type]
+
+    def of_match(self, match: ValidMatchT) -> array:
+        """
+        Get the mic of a single match for every frame.
+
+        :param match:       The match to get the mics of.
+
+        :return:            An array holding one mic per frame.
+        """
+
+        return self._packed()[self._match_index(match) :: self._width]
+
+    def of_matches(self, matches: Sequence[str]) -> array:
+        """
+        Get the mic of the chosen match for every frame.
+
+        :param matches:     The match of every frame, e.g. `WobblyParser.field_matches`.
+
+        :return:            An array holding one mic per frame.
+        """
+
+        values = self._packed()
+        index = {match: idx for idx, match in enumerate(self.MATCH_ORDER)}
+
+        return array(
+            values.typecode, (values[frame * self._width + index[match]] for frame, match in enumerate(matches))
+        )
+
+    def frames_above(self, threshold: int, matches: ValidMatchT | Sequence[str]) -> FrameSet:
+        """
+        Find all frames whose mic exceeds a threshold.
+
+        :param threshold:   Frames with a mic higher than this are returned.
+        :param matches:     A single match to check every frame with,
+                            or the match of every frame (e.g. `WobblyParser.field_matches`) to check the chosen matches.
+
+        :return:            The frames whose mic exceeds the threshold.
+        """
+
+        if isinstance(matches, str) and len(matches) == 1:
+            mics = self.of_match(matches)  # type: ignore[arg-type]
+        else:
+            mics = self.of_matches(matches)
+
+        return FrameSet.from_sorted([frame for frame, mic in enumerate(mics) if mic > threshold])
+
+    def _row(self, frame: int) -> array:
+        if not 0 <= frame < len(self):
+            raise IndexError(f'{self.__class__.__name__}: frame {frame} is out of range!')
+
+        return self._packed()[frame * self._width : (frame + 1) * self._width]
+
+    def _match_index(self, match: str) -> int:
+        if (idx := self.MATCH_ORDER.find(match)) < 0 or len(match) != 1:
+            raise CustomValueError(f'Unknown field match: {match}', self.__class__)
+
+        return idx
+
+    def _pack(self, raw: Sequence[Any]) -> array:
+        if any(not isinstance(row, list) or len(row) != self._width for row in raw):
+            raise CustomValueError(f'Every frame must have exactly {self._width} mics!', self.__class__)
+
+        return array('i', chain.from_iterable(raw))
+
+
+class DecimateMetrics(_PackedMetrics):
+    """
+    Decimation metrics of every frame, computed by wibbly.
+
+    A lower metric means the frame is more similar to the previous one, making it a better candidate for decimation.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def wob_json_key(cls) -> str:
+        """The JSON key for decimate metrics."""
+
+        return 'decimate metrics'
+
+    def _pack(self, raw: Sequence[Any]) -> array:
+        # These are sums of block differences, which can overflow 32 bits for large frames.
+        return array('q', raw)
+
+    def __getitem__(self, frame: int) -> int:
+        return self._packed()[frame]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._packed())
+
+    def frames_below(self, threshold: int) -> FrameSet:
+        """
+        Find all frames whose metric is lower than a threshold.
+
+        :param threshold:   Frames with a metric lower than this are returned.
+
+        :return:            The frames whose metric is lower than the threshold.
+        """
+
+        return FrameSet.from_sorted([frame for frame, metric in enumerate(self._packed()) if metric < threshold])
+
+    def lowest_in_cycle(self, cycle: int, cycle_length: int = 5) -> int:
+        """
+        Find the frame with the lowest metric in a cycle, i.e. the best candidate for decimation.
+
+        :param cycle:           The cycle number.
+        :param cycle_length:    The number of frames per cycle. Default: 5.
+
+        :return:                The frame number with the lowest metric.
+        """
+
+        values = self._packed()
+        start = cycle * cycle_length
+
+        if not 0 <= start < len(values):
+            raise IndexError(f'{self.__class__.__name__}: cycle {cycle} is out of range!')
+
+        frames = range(start, min(start + cycle_length, len(values)))
+
+        return min(frames, key=values.__getitem__)
@@ -1,10 +1,14 @@
+from array import array
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from typing import Self
+from typing import Any, Self, SupportsIndex
 
 from jetpytools import CustomValueError, fallback
 from vstools import replace_ranges, vs
 
 from ..exceptions import NegativeFrameError
+from ..util import unchecked_dataclass, unchecked_list
+from .frames import FrameSet
 from .matches import FieldMatches, ValidMatchT
 
 __all__ = [
@@ -40,7 +44,18 @@ class OrphanFrame:
 
 
 class OrphanFrames(list[OrphanFrame]):
-    """Class for holding orphan frames."""
+    """
+    Class for holding orphan frames, sorted by frame number.
+
+    Lookups by frame and by match use an index that is built on first use,
+    and dropped whenever the list itself is modified.
+    Modifying the `OrphanFrame` objects in place is not tracked, so replace them instead.
+    """
+
+    _by_frame: dict[int, OrphanFrame] | None = None
+    _by_match: dict[str, list[OrphanFrame]] | None = None
+    _match_frames: dict[str, array] | None = None
+    _frames: array | None = None
 
     def __init__(self, frames: list[OrphanFrame] | None = None) -> None:
         super().__init__(frames or [])
@@ -81,35 +96,47 @@ class OrphanFrames(list[OrphanFrame]):
     def __str__(self) -> str:
         return ', '.join(str(frame) for frame in self)
 
+    def __getstate__(self) -> dict[str, Any]:
+        # The index is rebuilt on first use, so there's no need to pickle it.
+        return {}
+
     @classmethod
     def from_sections(cls, sections: 'Sections', matches: 'FieldMatches') -> Self:  # noqa: F821
         """Create orphan frames from sections and matches."""
 
         orphans = []
 
+        # The sections and matches are validated, and the orphans are created in order.
         for idx, section in enumerate(sections):
             if matches[section.start] == 'n':
-                orphans.append(OrphanFrame(section.start, 'n'))
+                orphans.append(unchecked_dataclass(OrphanFrame, frame=section.start, match='n'))
 
             end_frame = sections[idx + 1].start - 1 if idx < len(sections) - 1 else len(matches) - 1
 
             if matches[end_frame] == 'b':
-                orphans.append(OrphanFrame(end_frame, 'b'))
+                orphans.append(unchecked_dataclass(OrphanFrame, frame=end_frame, match='b'))
 
-        return OrphanFrames(orphans)
+        return unchecked_list(cls, orphans)
 
     def find_frame(self, frame: int) -> OrphanFrame | None:
         """Find a frame in the list."""
 
-        try:
-            return next(f for f in self if f.frame == frame)
-        except StopIteration:
-            return None
+        return self._index()[0].get(frame)
+
+    def match_at(self, frame: int) -> ValidMatchT | None:
+        """Get the match of an orphan frame, or None if the frame is not an orphan."""
+
+        return orphan.match if (orphan := self.find_frame(frame)) is not None else None
 
     def find_matches(self, match: ValidMatchT) -> Self:
-        """Find all frames with a specific match."""
+        """Find all frames with a specific match. The returned list is a copy, and can safely be modified."""
+
+        return unchecked_list(self.__class__, self._index()[1].get(match, ()))
 
-        return OrphanFrames([f for f in self if f.match == match])
+    def match_frames(self, match: ValidMatchT) -> FrameSet:
+        """Get the frame numbers of all frames with a specific match."""
+
+        return FrameSet.from_sorted(self._index()[2].get(match, array('I'))[:])
 
     def set_props(self, clip: vs.VideoNode) -> vs.VideoNode:
         """Set the orphan frame properties on the clip."""
@@ -117,20 +144,97 @@ class OrphanFrames(list[OrphanFrame]):
         if not self:
             return clip
 
-        for match in ValidMatchT.__args__:  # type: ignore
-            if match == 'c':
-                continue
+        clip = clip.std.SetFrameProps(WobblyOrphanFrame=False)
 
-            clip = replace_ranges(
-                clip.std.SetFrameProps(WobblyOrphanFrame=False),
-                clip.std.SetFrameProps(WobblyOrphanFrame=match),
-                self.find_matches(match).frames,
-            )
+        for match, frames in self._index()[2].items():
+            clip = replace_ranges(clip, clip.std.SetFrameProps(WobblyOrphanFrame=match), frames.tolist())
 
         return clip
 
     @property
-    def frames(self) -> list[int]:
-        """Get all frames in the list."""
+    def used_matches(self) -> set[str]:
+        """Get the distinct matches of the orphan frames."""
+
+        return set(self._index()[1])
+
+    @property
+    def frames(self) -> FrameSet:
+        """Get all frame numbers in the list."""
+
+        if self._frames is None:
+            self._frames = array('I', (orphan.frame for orphan in self))
+
+        return FrameSet.from_sorted(self._frames[:])
+
+    def _index(self) -> tuple[dict[int, OrphanFrame], dict[str, list[OrphanFrame]], dict[str, array]]:
+        """Get the frame and match lookups, building them if necessary."""
+
+        if self._by_frame is None or self._by_match is None or self._match_frames is None:
+            by_match = dict[str, list[OrphanFrame]]()
+
+            for orphan in self:
+                by_match.setdefault(orphan.match, []).append(orphan)
+
+            self._by_frame = {orphan.frame: orphan for orphan in self}
+            self._by_match = by_match
+            self._match_frames = {
+                match: array('I', (orphan.frame for orphan in orphans)) for match, orphans in by_match.items()
+            }
+
+        return self._by_frame, self._by_match, self._match_frames
+
+    def _invalidate(self) -> None:
+        self._by_frame = self._by_match = self._match_frames = self._frames = None
+
+    # Every mutating list method drops the index.
+
+    def append(self, orphan: OrphanFrame) -> None:
+        self._invalidate()
+        super().append(orphan)
+
+    def extend(self, orphans: Iterable[OrphanFrame]) -> None:
+        self._invalidate()
+        super().extend(orphans)
+
+    def insert(self, index: SupportsIndex, orphan: OrphanFrame) -> None:
+        self._invalidate()
+        super().insert(index, orphan)
+
+    def remove(self, orphan: OrphanFrame) -> None:
+        self._invalidate()
+        super().remove(orphan)
+
+    def pop(self, index: SupportsIndex = -1) -> OrphanFrame:
+        self._invalidate()
+
+        return super().pop(index)
+
+    def clear(self) -> None:
+        self._invalidate()
+        super().clear()
+
+    def sort(self, *, key: Callable[[OrphanFrame], Any] | None = None, reverse: bool = False) -> None:
+        self._invalidate()
+        super().sort(key=key, reverse=reverse)  # type: ignore[arg-type]
+
+    def reverse(self) -> None:
+        self._invalidate()
+        super().reverse()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self._invalidate()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: SupportsIndex | slice) -> None:
+        self._invalidate()
+        super().__delitem__(index)
+
+    def __iadd__(self, orphans: Iterable[OrphanFrame]) -> Self:  # type: ignore[override,misc]
+        self._invalidate()
+
+        return super().__iadd__(orphans)
+
+    def __imul__(self, value: SupportsIndex) -> Self:
+        self._invalidate()
 
-        return [frame.frame for frame in self]
+        return super().__imul__(value)
@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from typing import Any, Self
+
+from jetpytools import CustomValueError
+from vstools import DitherType, depth, vs
+
+__all__ = [
+    'BitDepth',
+    'Crop',
+    'Resize',
+]
+
+
+@dataclass
+class Crop:
+    """Class for holding the crop settings of a wobbly file."""
+
+    left: int = 0
+    """The number of pixels to crop from the left."""
+
+    top: int = 0
+    """The number of pixels to crop from the top."""
+
+    right: int = 0
+    """The number of pixels to crop from the right."""
+
+    bottom: int = 0
+    """The number of pixels to crop from the bottom."""
+
+    early: bool = False
+    """Whether wobbly was set to crop before field matching. `WobblyProcessor` then crops the source the same way."""
+
+    def __post_init__(self) -> None:
+        if min(self.left, self.top, self.right, self.bottom) < 0:
+            raise CustomValueError(f'Crop values cannot be negative! ({self})', self.__class__)
+
+    def __bool__(self) -> bool:
+        return any((self.left, self.top, self.right, self.bottom))
+
+    @classmethod
+    def wob_json_key(cls) -> str:
+        """The JSON key for the crop settings."""
+
+        return 'crop'
+
+    @classmethod
+    def from_wob_settings(cls, settings: dict[str, Any]) -> Self:
+        """Create the crop settings from the wobbly file's settings."""
+
+        return cls(
+            settings.get('left', 0),
+            settings.get('top', 0),
+            settings.get('right', 0),
+            settings.get('bottom', 0),
+            bool(settings.get('early', False)),
+        )
+
+    def split(self, clip: vs.VideoNode) -> tuple['Crop', 'Crop']:
+        """
+        Split the crop into a part that is safe to apply to a field matched clip, and the remainder.
+
+        The safe part keeps the field order and the chroma siting of both fields intact:
+        horizontal crops are aligned to the chroma subsampling,
+        and vertical crops to twice the vertical chroma subsampling (e.g. 4 rows for 4:2:0).
+        This way, any strategy that separates or deinterlaces fields afterwards still works correctly.
+
+        :param clip:        The clip the crop will be applied to.
+
+        :return:            The safe part, and the remainder to apply at the end.
+        """
+
+        assert clip.format
+
+        mod_w = 1 << clip.format.subsampling_w
+        mod_h = 2 << clip.format.subsampling_h
+
+        early = Crop(
+            self.left - self.left % mod_w,
+            self.top - self.top % mod_h,
+            self.right - self.right % mod_w,
+            self.bottom - self.bottom % mod_h,
+            self.early,
+        )
+
+        late = Crop(
+            self.left - early.left,
+            self.top - early.top,
+            self.right - early.right,
+            self.bottom - early.bottom,
+            self.early,
+        )
+
+        return early, late
+
+    def apply(self, clip: vs.VideoNode) -> vs.VideoNode:
+        """Crop the clip."""
+
+        if not self:
+            return clip
+
+        return clip.std.Crop(self.left, self.right, self.top, self.bottom)
+
+
+@dataclass
+class Resize:
+    """Class for holding the resize settings of a wobbly file."""
+
+    width: int
+    """The width to resize to."""
+
+    height: int
+    """The height to resize to."""
+
+    filter: str = 'bicubic'
+    """The resizer to use. One of `point`, `bilinear`, `bicubic`, `spline16`, `spline36` or `lanczos`."""
+
+    def __post_init__(self) -> None:
+        if self.width <= 0 or self.height <= 0:
+            raise CustomValueError(f'Invalid resize dimensions: {self.width}x{self.height}', self.__class__)
+
+    @classmethod
+    def wob_json_key(cls) -> str:
+        """The JSON key for the resize settings."""
+
+        return 'resize'
+
+    @classmethod
+    def from_wob_settings(cls, settings: dict[str, Any]) -> Self:
+        """Create the resize settings from the wobbly file's settings."""
+
+        return cls(settings['width'], settings['height'], settings.get('filter', 'bicubic'))
+
+    def apply(self, clip: vs.VideoNode) -> vs.VideoNode:
+        """Resize the clip."""
+
+        if (clip.width, clip.height) == (self.width, self.height):
+            return clip
+
+        if not hasattr(clip.resize, resizer := self.filter.capitalize()):
+            raise CustomValueError(f'Unknown resize filter: {self.filter}', self.apply)
+
+        return getattr(clip.resize, resizer)(self.width, self.height)
+
+
+@dataclass
+class BitDepth:
+    """Class for holding the bit depth settings of a wobbly file."""
+
+    bits: int
+    """The bit depth to convert to."""
+
+    float_samples: bool = False
+    """Whether to convert to float samples."""
+
+    dither: str = 'random'
+    """The dither type to use when lowering the bit depth."""
+
+    @classmethod
+    def wob_json_key(cls) -> str:
+        """The JSON key for the bit depth settings."""
+
+        return 'depth'
+
+    @classmethod
+    def from_wob_settings(cls, settings: dict[str, Any]) -> Self:
+        """Create the bit depth settings from the wobbly file's settings."""
+
+        return cls(settings['bits'], bool(settings.get('float samples', False)), settings.get('dither', 'random'))
+
+    def apply(self, clip: vs.VideoNode) -> vs.VideoNode:
+        """Convert the clip to the bit depth."""
+
+        return depth(
+            clip,
+            self.bits,
+            vs.FLOAT if self.float_samples else vs.INTEGER,
+            dither_type=DitherType(self.dither),
+        )
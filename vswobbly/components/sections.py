@@ -1,4 +1,4 @@
-from bisect import bisect_left
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from math import ceil
 from typing import Literal
@@ -68,7 +68,7 @@ class Sections(list[Section]):
         if not decimations:
             return Keyframes([section.start for section in self])
 
-        keyframes = [section.start - bisect_left(decimations, section.start) for section in self]
+        keyframes = [section.start - decimations.count_before(section.start) for section in self]
 
         return Keyframes(keyframes)
 
@@ -94,34 +94,26 @@ class Sections(list[Section]):
             for fps in framerates
         ]
 
-        max_dec = max(wobbly_parsed.decimations) + 1
+        decimations = wobbly_parsed.decimations
+        max_dec = (decimations[-1] if decimations else -1) + 1
+        num_cycles = ceil(max_dec / cycle)
 
-        split_decimations = [
-            [j for j in range(i * cycle, min((i + 1) * cycle, max_dec)) if j in wobbly_parsed.decimations]
-            for i in range(ceil(max_dec / cycle))
+        # The number of decimated frames in every cycle.
+        cycle_decimations = [
+            decimations.count_range(i * cycle, min((i + 1) * cycle, max_dec) - 1) for i in range(num_cycles)
         ]
 
-        n_split_decimations = len(split_decimations)
-
         indices = [
-            0 if (sd_idx := ceil(n / cycle)) >= n_split_decimations else len(split_decimations[sd_idx])
+            0 if (cycle_idx := ceil(n / cycle)) >= num_cycles else cycle_decimations[cycle_idx]
             for n in range(clip.num_frames)
         ]
 
         # Set pattern for each frame based on which section it falls into
-        pattern_props = []
-
-        for n in range(clip.num_frames):
-            section_idx = 0
-
-            for i, _ in enumerate(self):
-                if i < len(self) - 1 and n >= self[i + 1].start:
-                    continue
+        starts = [section.start for section in self]
 
-                section_idx = i
-                break
-
-            pattern_props.append(self[section_idx].dominant_pattern)
+        pattern_props = [
+            self[max(bisect_right(starts, n) - 1, 0)].dominant_pattern if self else -1 for n in range(clip.num_frames)
+        ]
 
         return clip.std.FrameEval(lambda n: fps_clips[indices[n]].std.SetFrameProps(WobblyPattern=pattern_props[n]))
 
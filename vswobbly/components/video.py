@@ -4,33 +4,119 @@ from typing import Any
 from jetpytools import CustomValueError, SPath
 from vstools import VSFunctionNoArgs, core, vs
 
+from ..sources import source_clip_registry
+
 __all__ = [
+    'SOURCE_FILTER_DEFAULTS',
     'WobblyVideo',
 ]
 
 
+SOURCE_FILTER_DEFAULTS: dict[str, dict[str, Any]] = {
+    'bs.VideoSource': {'rff': False},
+    'd2v.Source': {'rff': False},
+    'dgdecodenv.DGSource': {'fieldop': 2},
+    'lsmas.LWLibavSource': {'repeat': False},
+}
+"""
+Default arguments for known source filters, keyed by the source filter name.
+
+Wobbly files store field matches for every coded frame, so pulldown flags must never be applied by the decoder.
+Decoder tuning is left at the filters' own defaults: the ones that support it already decode with one thread
+per core, their default seek modes are the frame-accurate ones wobbly's frame numbers rely on,
+and hardware decoding isn't guaranteed to be bit-exact, which would change the output and invalidate frame caches.
+User-provided arguments always take priority over these.
+"""
+
+
 @dataclass
 class WobblyVideo:
-    """Class for holding wobbly video data."""
+    """
+    Class for holding wobbly video data.
+
+    The source clip is only indexed when `work_clip` is first accessed,
+    and is shared with every other `WobblyVideo` of the same source (see `SourceClipRegistry`).
+    Pickling drops the clip (and the source filter, if it was resolved from its name),
+    so the data can be sent to worker processes, which index the source themselves on first use.
+    """
 
     src_file: SPath
     """The path to the source file."""
 
-    work_clip: vs.VideoNode
-    """The clip to work on. Trimmed if necessary."""
-
     trim: tuple[int, int] | None
     """The trim to apply to the source clip. Inclusive/inclusive."""
 
-    source_filter: VSFunctionNoArgs
-    """The source filter to index the source file."""
-
-    def __init__(self, src_file: SPath, wob_data: dict[str, Any]) -> None:
+    source_filter_name: str | None
+    """The name of the source filter (e.g. `lsmas.LWLibavSource`), or None if a custom callable was given."""
+
+    source_filter_kwargs: dict[str, Any]
+    """
+    The keyword arguments the source filter is called with,
+    i.e. the defaults for the source filter (see `SOURCE_FILTER_DEFAULTS`) updated with the user's arguments.
+    """
+
+    def __init__(
+        self,
+        src_file: SPath,
+        wob_data: dict[str, Any],
+        source_filter: VSFunctionNoArgs | None = None,
+        source_filter_kwargs: dict[str, Any] | None = None,
+    ) -> None:
         self.src_file = SPath(wob_data.get('input file', str(src_file).removesuffix('.wob')))
         self._set_trim(wob_data)
 
-        self.source_filter = self._validate_source_filter(wob_data.get('source filter', ''))
-        self._set_source_clip(self.src_file)
+        source_filter = source_filter or wob_data.get('source filter', '')
+
+        if not source_filter:
+            raise CustomValueError('Source filter cannot be empty!', self)
+
+        if not callable(source_filter) and not isinstance(source_filter, str):
+            raise CustomValueError('Invalid source filter!', self, source_filter)
+
+        self.source_filter_name = source_filter.strip() if isinstance(source_filter, str) else None
+
+        if self.source_filter_name is not None and len(self.source_filter_name.split('.')) != 2:
+            raise CustomValueError('Invalid source filter format!', self, source_filter)
+
+        self._source_filter = None if isinstance(source_filter, str) else source_filter
+
+        self.source_filter_kwargs = SOURCE_FILTER_DEFAULTS.get(self.source_filter_name or '', {}) | (
+            source_filter_kwargs or {}
+        )
+        self._work_clip: vs.VideoNode | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_work_clip'] = None
+
+        if self.source_filter_name is not None:
+            state['_source_filter'] = None
+
+        return state
+
+    @property
+    def source_filter(self) -> VSFunctionNoArgs:
+        """The source filter to index the source file."""
+
+        if self._source_filter is None:
+            self._source_filter = self._validate_source_filter(self.source_filter_name or '')
+
+        return self._source_filter
+
+    @property
+    def work_clip(self) -> vs.VideoNode:
+        """The clip to work on. The source file is indexed on first access."""
+
+        if self._work_clip is None:
+            self._set_source_clip(self.src_file)
+
+        assert self._work_clip is not None
+
+        return self._work_clip
+
+    @work_clip.setter
+    def work_clip(self, clip: vs.VideoNode) -> None:
+        self._work_clip = clip
 
     def _set_trim(self, wob_data: dict[str, Any]) -> None:
         trim_data = wob_data.get('trim')
@@ -48,7 +134,7 @@ class WobblyVideo:
         if not source_filter:
             raise CustomValueError('Source filter cannot be empty!', self)
 
-        if hasattr(source_filter, '__call__'):
+        if callable(source_filter):
             return source_filter
 
         if not isinstance(source_filter, str):
@@ -72,9 +158,15 @@ class WobblyVideo:
         return getattr(namespace_obj, filter_name)
 
     def _set_source_clip(self, src_file: SPath) -> None:
-        """Index and set the source clip using the source filter, and trim if necessary."""
+        """Index and set the source clip using the source filter."""
+
+        key = source_clip_registry.make_key(
+            src_file, self.source_filter_name or self.source_filter, self.source_filter_kwargs
+        )
 
         try:
-            self.work_clip = self.source_filter(src_file)
+            self._work_clip = source_clip_registry.get_or_create(
+                key, lambda: self.source_filter(src_file, **self.source_filter_kwargs)
+            )
         except Exception as e:
             raise CustomValueError(f'Error indexing source clip: {e}', self.__class__)
@@ -1,5 +1,15 @@
 # ruff: noqa: F401, F403
 
+from . import builder, diff, loader, parse, validation
 from .builder import *
+from .diff import *
+from .loader import *
 from .parse import *
 from .validation import *
+
+__all__: list[str] = []
+__all__ += builder.__all__
+__all__ += diff.__all__
+__all__ += loader.__all__
+__all__ += parse.__all__
+__all__ += validation.__all__
@@ -1,31 +1,35 @@
-import json
 from dataclasses import dataclass
 from typing import Any
 
-from jetpytools import FileNotExistsError, FileWasNotFoundError, SPath, SPathLike
-from vstools import FieldBased, FieldBasedLike
+from jetpytools import SPath, SPathLike
+from vstools import FieldBased, FieldBasedLike, VSFunctionNoArgs
 
 from ..components import (
+    BitDepth,
     CombedFrames,
+    Crop,
     CustomList,
     CustomLists,
+    DecimateMetrics,
     Decimations,
     FieldMatches,
     FreezeFrame,
     FreezeFrames,
     InterlacedFade,
     InterlacedFades,
+    Mics,
     Preset,
     Presets,
+    Resize,
     Section,
     Sections,
     WobblyVideo,
 )
+from ..data.loader import load_wob_json
 from ..data.parse import WobblyParser
 from ..data.validation import WobblyValidator
-from ..exceptions import NotAWobblyFileError, WobblyParseError
-from ..types import FilteringPositionEnum
-from ..util import to_snake_case
+from ..types import FilteringPositionEnum, JSONBackendEnum
+from ..util import to_snake_case, unchecked_dataclass, unchecked_list
 
 __all__ = ['WobblyBuilder']
 
@@ -36,9 +40,21 @@ class WobblyBuilder:
 
     file_path: SPath
     _data: dict[str, Any] | None = None
-
-    def __init__(self, file_path: SPathLike) -> None:
+    source_filter: VSFunctionNoArgs | None = None
+    json_backend: JSONBackendEnum = JSONBackendEnum.AUTO
+    source_filter_kwargs: dict[str, Any] | None = None
+
+    def __init__(
+        self,
+        file_path: SPathLike,
+        source_filter: VSFunctionNoArgs | None = None,
+        json_backend: JSONBackendEnum | str = JSONBackendEnum.AUTO,
+        source_filter_kwargs: dict[str, Any] | None = None,
+    ) -> None:
         self.file_path = SPath(file_path)
+        self.source_filter = source_filter
+        self.json_backend = JSONBackendEnum(json_backend)
+        self.source_filter_kwargs = source_filter_kwargs
 
     def build(self) -> WobblyParser:
         """Build a WobblyParser instance."""
@@ -46,45 +62,29 @@ class WobblyBuilder:
         self._check_file_path()
         self._load_data()
 
-        WobblyValidator.validate_version(self._data)
-        WobblyValidator.validate_json_structure(self._data)
-
-        video_data = self._build_video_data()
-        field_order = self._build_field_order()
-        video_data.work_clip = field_order.apply(video_data.work_clip)
+        # Validate everything before building any components. The source is never indexed for invalid files.
+        WobblyValidator.validate(self._data)
 
         return WobblyParser(
             file_path=SPath(self.file_path),
-            work_clip=video_data.work_clip,
-            video_data=video_data,
-            field_order=field_order,
+            work_clip=None,
+            video_data=self._build_video_data(),
+            field_order=self._build_field_order(),
             **self._parse_data(),
         )
 
     def _check_file_path(self) -> None:
         """Check if the file path is valid."""
 
-        if not self.file_path.exists():
-            raise FileWasNotFoundError(f"File path does not exist: '{self.file_path}'", self)
-
-        if not self.file_path.is_file():
-            raise FileNotExistsError(f"File path is not a file: '{self.file_path}'", self)
-
-        if not self.file_path.suffix == '.wob':
-            raise NotAWobblyFileError('You must provide a wobbly file!', self)
-
-        # We check for 2 bytes because wibbly writes 2 bytes when initializing
-        if self.file_path.get_size() <= 2:
-            raise WobblyParseError(f"File is empty: '{self.file_path}'", self)
+        WobblyValidator.validate_file_path(self.file_path)
 
     def _load_data(self) -> None:
         """Load the wobbly data."""
 
-        with open(self.file_path, 'r') as file:
-            self._data = json.load(file)
+        self._data = load_wob_json(self.file_path, self.json_backend)
 
     def _build_video_data(self) -> WobblyVideo:
-        return WobblyVideo(SPath(self.file_path).as_posix(), self._data)
+        return WobblyVideo(SPath(self.file_path).as_posix(), self._data, self.source_filter, self.source_filter_kwargs)
 
     def _build_field_order(self) -> FieldBasedLike:
         vivtc_params = self._data.get('vfm parameters', {})
@@ -109,6 +109,8 @@ class WobblyBuilder:
         )
 
         self._build_orphan_frames(parsed_data)
+        self._build_metrics(parsed_data)
+        self._build_output_settings(parsed_data)
 
         return parsed_data
 
@@ -123,10 +125,24 @@ class WobblyBuilder:
 
             data = self._data[wob_key]
             processed_items = self._get_processed_items(data, item_class)
-            parsed_data[attr_name] = container_class(processed_items)
+            parsed_data[attr_name] = self._build_container(container_class, processed_items)
 
         return parsed_data
 
+    def _build_container(self, container_class: type, items: list) -> Any:
+        """Build a container from validated items, skipping its own per-item checks where possible."""
+
+        if container_class in (CombedFrames, Decimations):
+            if not WobblyValidator.is_strictly_increasing(items):
+                return container_class(items)
+
+            return container_class.from_sorted(items)
+
+        if container_class is InterlacedFades:
+            return unchecked_list(container_class, items)
+
+        return container_class(items)
+
     def _should_parse_component(self, wob_key: str) -> bool:
         """Check if component should be parsed."""
 
@@ -164,7 +180,7 @@ class WobblyBuilder:
                     section_presets.extend(preset_lookup[p] for p in preset_list if p in preset_lookup)
 
             section_dict['presets'] = section_presets
-            processed_items.append(Section(**section_dict))
+            processed_items.append(unchecked_dataclass(Section, **section_dict))
 
             if not section_presets:
                 continue
@@ -216,7 +232,7 @@ class WobblyBuilder:
         if section_idx < len(all_sections) - 1:
             return all_sections[section_idx + 1]['start'] - 1
 
-        return len(self._data.get('field matches', []))
+        return len(self._data.get('matches', [])) - 1
 
     def _process_dict_items(self, data: list[dict], item_class: type) -> list:
         """Process dictionary items into their respective dataclass instances."""
@@ -237,19 +253,28 @@ class WobblyBuilder:
                 for item in data
             ]
 
+        if item_class == InterlacedFade:
+            return [unchecked_dataclass(item_class, **{to_snake_case(k): v for k, v in item.items()}) for item in data]
+
         return [item_class(**{to_snake_case(k): v for k, v in item.items()}) for item in data]
 
     def _process_list_items(self, data: list[list], item_class: type) -> list:
         """Process list items into their respective dataclass instances."""
 
         if item_class == FreezeFrame:
-            return [item_class(first=item[0], last=item[1], replacement=item[2]) for item in data]
+            return [
+                unchecked_dataclass(item_class, first=first, last=last, replacement=rep) for first, last, rep in data
+            ]
 
         return [item_class(**{'frames': item}) for item in data]
 
     def _process_simple_items(self, data: list, item_class: type) -> list:
         """Process simple type items (int, str, etc.)."""
 
+        # Frame numbers and matches have already been validated, so they don't need to be converted.
+        if item_class in (int, str):
+            return list(data)
+
         return [item_class(x) for x in data]
 
     def _to_snake_case(self, item: dict[Any, Any] | str) -> dict[Any, Any] | str:
@@ -275,3 +300,19 @@ class WobblyBuilder:
             return
 
         parsed_data['orphan_frames'] = OrphanFrames.from_sections(sections, matches)
+
+    def _build_metrics(self, parsed_data: dict) -> None:
+        """Add the metrics computed by wibbly, packed into arrays."""
+
+        for attr_name, metrics_class in (('mics', Mics), ('decimate_metrics', DecimateMetrics)):
+            if self._should_parse_component(metrics_class.wob_json_key()):
+                parsed_data[attr_name] = metrics_class(self._data[metrics_class.wob_json_key()])
+
+    def _build_output_settings(self, parsed_data: dict) -> None:
+        """Add the crop, resize and bit depth settings that are enabled in the wobbly file."""
+
+        for attr_name, settings_class in (('crop', Crop), ('resize', Resize), ('depth', BitDepth)):
+            settings = self._data.get(settings_class.wob_json_key())
+
+            if settings and settings.get('state', False):
+                parsed_data[attr_name] = settings_class.from_wob_settings(settings)
@@ -0,0 +1,356 @@
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from jetpytools import CustomValueError
+
+from ..components import FrameSet
+from .parse import WobblyParser
+
+if TYPE_CHECKING:
+    from ..process.plan import WobblyPlan
+
+__all__ = [
+    'WobblyDiff',
+    'changed_ranges',
+    'changed_source_frames',
+    'diff_wobbly',
+    'output_signatures',
+    'settings_signature',
+    'source_signatures',
+]
+
+
+def source_signatures(parser: WobblyParser) -> list[Hashable]:
+    """
+    Create a signature of every source (pre-decimation) frame.
+
+    A signature holds everything wobbly stores that affects the processed frame:
+    the frame it's built from (which differs for frozen frames), its field match, orphan and combed state,
+    interlaced fade, section and custom list presets, and the number of decimated frames in its cycle.
+    Two frames with equal signatures are processed the same way.
+
+    :param parser:      The parsed wobbly data.
+
+    :return:            A list holding the signature of every source frame.
+    """
+
+    matches = parser.field_matches
+    num_frames = len(matches)
+
+    orphans = {orphan.frame: orphan.match for orphan in parser.orphan_frames}
+    combed = set(parser.combed_frames)
+    fades = {fade.frame: fade.field_difference for fade in parser.interlaced_fades}
+    cycle_decimations = Counter(frame // 5 for frame in parser.decimations)
+
+    freezes = dict[int, int]()
+
+    for freeze in parser.freeze_frames:
+        freezes.update(dict.fromkeys(range(freeze.first, freeze.last + 1), freeze.replacement))
+
+    custom_lists = dict[int, list[Hashable]]()
+
+    for custom_list in parser.custom_lists:
+        key = (custom_list.name, str(custom_list.position), _preset_key(custom_list.preset))
+
+        for frame_range in custom_list.frames:
+            first, last = frame_range if isinstance(frame_range, tuple) else (frame_range, frame_range)
+
+            for frame in range(first, min(last, num_frames - 1) + 1):
+                custom_lists.setdefault(frame, []).append(key)
+
+    starts = [section.start for section in parser.sections]
+    section_presets = [_preset_key(section.presets) for section in parser.sections]
+    section_idx = -1
+
+    signatures = list[Hashable]()
+
+    for frame in range(num_frames):
+        while section_idx + 1 < len(starts) and starts[section_idx + 1] <= frame:
+            section_idx += 1
+
+        src = freezes.get(frame, frame)
+
+        signatures.append(
+            (
+                src,
+                matches[src],
+                orphans.get(src),
+                src in combed,
+                fades.get(src),
+                section_presets[section_idx] if section_idx >= 0 else (),
+                tuple(custom_lists.get(frame, ())),
+                cycle_decimations.get(frame // 5, 0),
+            )
+        )
+
+    return signatures
+
+
+def output_signatures(parser: WobblyParser) -> list[Hashable]:
+    """
+    Create a signature of every output (post-decimation) frame. See `source_signatures`.
+
+    :param parser:      The parsed wobbly data.
+
+    :return:            A list holding the signature of every output frame.
+    """
+
+    return _decimate(source_signatures(parser), parser)
+
+
+def settings_signature(parser: WobblyParser) -> Hashable:
+    """
+    Create a signature of the settings that affect every frame at once, like the source and its trim.
+
+    :param parser:      The parsed wobbly data.
+
+    :return:            A hashable signature with a stable `repr`.
+    """
+
+    video = parser.video_data
+
+    return (
+        str(video.src_file),
+        video.trim,
+        video.source_filter_name,
+        repr(sorted(video.source_filter_kwargs.items())),
+        str(parser.field_order),
+        repr(parser.crop),
+        repr(parser.resize),
+        repr(parser.depth),
+    )
+
+
+def _decimate(signatures: list[Hashable], parser: WobblyParser) -> list[Hashable]:
+    decimations = set(parser.decimations)
+
+    return [signature for frame, signature in enumerate(signatures) if frame not in decimations]
+
+
+@dataclass(frozen=True)
+class WobblyDiff:
+    """The differences between the output of two versions of the wobbly data."""
+
+    ranges: list[tuple[int, int]]
+    """Merged, inclusive `(first, last)` ranges of changed output frames, numbered as in the new data."""
+
+    source_frames: FrameSet
+    """The changed source (pre-decimation) frames, numbered as in the new data."""
+
+    num_frames: int
+    """The number of output frames of the new data."""
+
+    old_num_frames: int
+    """The number of output frames of the old data. If this is larger, the old output must also be cut short."""
+
+    @property
+    def num_changed(self) -> int:
+        """The number of output frames within the changed ranges."""
+
+        return sum(last - first + 1 for first, last in self.ranges)
+
+    @property
+    def full(self) -> bool:
+        """Whether every output frame changed."""
+
+        return self.num_changed == self.num_frames
+
+
+def diff_wobbly(
+    old: 'WobblyParser | WobblyPlan',
+    new: 'WobblyParser | WobblyPlan',
+    radius: int = 0,
+    keyframe_aligned: bool = True,
+) -> WobblyDiff:
+    """
+    Find the output frames that differ between two versions of the wobbly data, e.g. for a partial re-encode.
+
+    Frames are compared by their signatures (see `source_signatures`), so this accounts for changed matches,
+    freezes, orphans, combed frames, fades, section and custom list presets, and section boundaries.
+    Output frames are compared by position: if changed decimations shift the following frames,
+    those frames are changed too, until the shift is undone within the same cycle.
+
+    When comparing compiled plans (see `WobblyProcessor.compile`), the strategies are compared as well.
+    Any frame listed in one plan's strategy states but not the other's (e.g. a different orphan decision) is changed.
+    If the strategies themselves differ, every frame is changed.
+
+    The radius defaults to 0, so only the frames whose own wobbly data changed are included.
+    Temporal filters (e.g. QTGMC in the orphan strategies, or in presets and custom lists) also change
+    the neighbouring frames, which are missed unless `radius` is at least their temporal radius.
+
+    :param old:                 The previous parsed wobbly data or compiled plan.
+    :param new:                 The new parsed wobbly data or compiled plan.
+    :param radius:              The number of neighbouring output frames to include on both sides of every change,
+                                e.g. for temporal filters in presets or strategies.
+    :param keyframe_aligned:    Extend the ranges to start on a keyframe (a section start), and end right before one,
+                                so they can be re-encoded separately and spliced into the old encode.
+
+    :raises CustomValueError:   The radius is negative.
+
+    :return:                    The differences.
+    """
+
+    if radius < 0:
+        raise CustomValueError(f'The radius cannot be negative, not {radius}!', diff_wobbly)
+
+    old_parser, new_parser = getattr(old, 'parser', old), getattr(new, 'parser', new)
+
+    old_signatures, new_signatures = source_signatures(old_parser), source_signatures(new_parser)
+    old_output, new_output = _decimate(old_signatures, old_parser), _decimate(new_signatures, new_parser)
+
+    if settings_signature(old_parser) != settings_signature(new_parser) or _strategies_key(old) != _strategies_key(new):
+        return WobblyDiff(
+            [(0, len(new_output) - 1)] if new_output else [],
+            FrameSet.from_sorted(range(len(new_signatures))),
+            len(new_output),
+            len(old_output),
+        )
+
+    source_changed = set(_changed_indices(old_signatures, new_signatures))
+    changed = set(_changed_indices(old_output, new_output))
+
+    # Frames the strategies decided differently on, even though the wobbly data of the frame itself didn't change.
+    if state_frames := _state_frames(old, new).difference(source_changed):
+        source_changed |= state_frames
+        decimations = set(new_parser.decimations)
+        kept = (frame for frame in range(len(new_signatures)) if frame not in decimations)
+        changed.update(idx for idx, frame in enumerate(kept) if frame in state_frames)
+
+    ranges = _to_ranges(sorted(changed))
+
+    if radius:
+        ranges = _to_ranges(
+            frame
+            for first, last in ranges
+            for frame in range(max(first - radius, 0), min(last + radius, len(new_output) - 1) + 1)
+        )
+
+    if keyframe_aligned and ranges:
+        ranges = _align_to_keyframes(
+            ranges, list(new_parser.sections.to_keyframes(new_parser.decimations)), len(new_output)
+        )
+
+    return WobblyDiff(
+        ranges,
+        FrameSet.from_sorted(sorted(frame for frame in source_changed if frame < len(new_signatures))),
+        len(new_output),
+        len(old_output),
+    )
+
+
+def changed_source_frames(old: 'WobblyParser | WobblyPlan', new: 'WobblyParser | WobblyPlan') -> FrameSet:
+    """
+    Find the source (pre-decimation) frames that are processed differently in the new wobbly data.
+
+    :param old:         The previous parsed wobbly data or compiled plan.
+    :param new:         The new parsed wobbly data or compiled plan.
+
+    :return:            The changed source frames, numbered as in the new data.
+                        If a setting that affects every frame changed (e.g. the trim), every frame is returned.
+    """
+
+    return diff_wobbly(old, new, keyframe_aligned=False).source_frames
+
+
+def changed_ranges(
+    old: 'WobblyParser | WobblyPlan',
+    new: 'WobblyParser | WobblyPlan',
+    radius: int = 0,
+    keyframe_aligned: bool = False,
+) -> list[tuple[int, int]]:
+    """
+    Find the output (post-decimation) frame ranges that differ between two versions of the wobbly data.
+
+    See `diff_wobbly` for more information.
+    The radius defaults to 0, so changes that temporal filters spread to neighbouring frames are missed.
+
+    :param old:                 The previous parsed wobbly data or compiled plan.
+    :param new:                 The new parsed wobbly data or compiled plan.
+    :param radius:              The number of neighbouring output frames to include on both sides of every change.
+    :param keyframe_aligned:    Extend the ranges to start on a keyframe, and end right before one.
+
+    :return:                    Merged, inclusive `(first, last)` ranges of changed output frames,
+                                numbered as in the new data.
+    """
+
+    return diff_wobbly(old, new, radius, keyframe_aligned).ranges
+
+
+def _strategies_key(data: Any) -> Hashable:
+    """The class and simple attributes of every strategy of a plan. Parsers have no strategies."""
+
+    keys = list[Hashable]()
+
+    for strategy in getattr(data, 'strategies', ()):
+        attrs = {k: v for k, v in vars(strategy).items() if isinstance(v, (bool, int, float, str)) or v is None}
+        keys.append((type(strategy).__module__, type(strategy).__qualname__, tuple(sorted(attrs.items()))))
+
+    return tuple(keys)
+
+
+def _state_frames(old: Any, new: Any) -> set[int]:
+    """The frames listed in the strategy states of only one of two plans, e.g. orphans with a different decision."""
+
+    frames = set[int]()
+
+    for old_state, new_state in zip(getattr(old, 'strategy_states', ()), getattr(new, 'strategy_states', ())):
+        for key in old_state.keys() | new_state.keys():
+            old_value, new_value = old_state.get(key, []), new_state.get(key, [])
+
+            if _is_frame_list(old_value) and _is_frame_list(new_value):
+                frames.update(set(old_value).symmetric_difference(new_value))
+
+    return frames
+
+
+def _is_frame_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(frame, int) for frame in value)
+
+
+def _align_to_keyframes(ranges: list[tuple[int, int]], keyframes: list[int], num_frames: int) -> list[tuple[int, int]]:
+    """Extend every range to start on a keyframe, and end right before the next one, then merge them."""
+
+    keyframes = sorted({0, *(kf for kf in keyframes if 0 <= kf < num_frames)})
+    aligned = list[tuple[int, int]]()
+
+    for first, last in ranges:
+        start = keyframes[bisect_right(keyframes, first) - 1]
+        next_idx = bisect_right(keyframes, last)
+        end = keyframes[next_idx] - 1 if next_idx < len(keyframes) else num_frames - 1
+
+        if aligned and aligned[-1][1] + 1 >= start:
+            aligned[-1] = (aligned[-1][0], max(aligned[-1][1], end))
+        else:
+            aligned.append((start, end))
+
+    return aligned
+
+
+def _preset_key(preset: Any) -> Hashable:
+    """A hashable key of a preset (or a nested list of presets), including its contents."""
+
+    if isinstance(preset, (list, tuple)):
+        return tuple(_preset_key(p) for p in preset)
+
+    return (getattr(preset, 'name', str(preset)), getattr(preset, 'contents', None))
+
+
+def _changed_indices(old: list[Hashable], new: list[Hashable]) -> list[int]:
+    return [idx for idx, signature in enumerate(new) if idx >= len(old) or old[idx] != signature]
+
+
+def _to_ranges(frames: Iterable[int]) -> list[tuple[int, int]]:
+    """Merge sorted frame numbers into inclusive ranges."""
+
+    ranges = list[tuple[int, int]]()
+
+    for frame in frames:
+        if ranges and ranges[-1][1] + 1 >= frame:
+            ranges[-1] = (ranges[-1][0], frame)
+        else:
+            ranges.append((frame, frame))
+
+    return ranges
@@ -0,0 +1,72 @@
+import json
+import mmap
+from importlib.util import find_spec
+from typing import Any
+
+from jetpytools import DependencyNotFoundError, SPathLike
+
+from ..exceptions import WobblyParseError
+from ..types import JSONBackendEnum
+
+__all__ = [
+    'available_json_backends',
+    'load_wob_json',
+]
+
+
+_FAST_BACKENDS = (JSONBackendEnum.ORJSON, JSONBackendEnum.MSGSPEC)
+
+
+def available_json_backends() -> list[JSONBackendEnum]:
+    """Get the installed JSON backends, fastest first."""
+
+    return [backend for backend in _FAST_BACKENDS if find_spec(str(backend)) is not None] + [JSONBackendEnum.JSON]
+
+
+def load_wob_json(path: SPathLike, backend: JSONBackendEnum | str = JSONBackendEnum.AUTO) -> dict[str, Any]:
+    """
+    Load the JSON data of a wobbly file.
+
+    Every backend returns the same data. The fast backends decode straight from a memory map of the file,
+    so the file is never copied into a Python string.
+
+    :param path:        The path to the wobbly file.
+    :param backend:     The JSON decoder to use. Default: the fastest installed decoder.
+
+    :raises DependencyNotFoundError:    The requested backend is not installed.
+    :raises WobblyParseError:           The file is not valid JSON.
+
+    :return:            The decoded JSON data.
+    """
+
+    backend = JSONBackendEnum(backend)
+
+    if backend is JSONBackendEnum.AUTO:
+        backend = available_json_backends()[0]
+    elif backend is not JSONBackendEnum.JSON and find_spec(str(backend)) is None:
+        raise DependencyNotFoundError(load_wob_json, str(backend))
+
+    with open(path, 'rb') as file:
+        try:
+            if backend is JSONBackendEnum.JSON:
+                return json.loads(file.read())
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return _decode_fast(view, backend)
+        except ValueError as e:
+            # Decoding errors of every backend are ValueErrors. mmap raises one for empty files too.
+            raise WobblyParseError(f'Could not decode wobbly file: {e}', load_wob_json, path) from e
+
+
+def _decode_fast(view: memoryview, backend: JSONBackendEnum) -> dict[str, Any]:
+    if backend is JSONBackendEnum.ORJSON:
+        import orjson
+
+        return orjson.loads(view)
+
+    import msgspec
+
+    try:
+        return msgspec.json.decode(view)
+    except msgspec.DecodeError as e:
+        raise ValueError(str(e)) from e
@@ -2,17 +2,22 @@ from dataclasses import dataclass, field
 from typing import Any, Self
 
 from jetpytools import SPath, SPathLike
-from vstools import FieldBased, FieldBasedLike, vs
+from vstools import FieldBased, FieldBasedLike, VSFunctionNoArgs, vs
 
 from ..components import (
+    BitDepth,
     CombedFrames,
+    Crop,
     CustomLists,
+    DecimateMetrics,
     Decimations,
     FieldMatches,
     FreezeFrames,
     InterlacedFades,
+    Mics,
     OrphanFrames,
     Presets,
+    Resize,
     Sections,
     WobblyVideo,
 )
@@ -24,14 +29,16 @@ __all__ = [
 
 @dataclass
 class WobblyParser:
-    """Class for parsing wobbly files."""
+    """
+    Class for parsing wobbly files.
+
+    The parsed data holds no clips until `work_clip` is first accessed, and pickling drops the clip,
+    so a parser can be sent to worker processes instead of reparsing the wobbly file in every worker.
+    """
 
     file_path: SPath
     """The path to the wobbly file."""
 
-    work_clip: vs.VideoNode
-    """The clip to work on."""
-
     video_data: WobblyVideo
     """Source clip information."""
 
@@ -65,10 +72,25 @@ class WobblyParser:
     orphan_frames: OrphanFrames = field(default_factory=OrphanFrames)
     """List of orphan frames."""
 
+    mics: Mics = field(default_factory=Mics)
+    """Combing metrics of every frame for every match, as computed by wibbly. Empty if they were never computed."""
+
+    decimate_metrics: DecimateMetrics = field(default_factory=DecimateMetrics)
+    """Decimation metrics of every frame, as computed by wibbly. Empty if they were never computed."""
+
+    crop: Crop | None = None
+    """The crop settings, or None if cropping is disabled in the wobbly file."""
+
+    resize: Resize | None = None
+    """The resize settings, or None if resizing is disabled in the wobbly file."""
+
+    depth: BitDepth | None = None
+    """The bit depth settings, or None if bit depth conversion is disabled in the wobbly file."""
+
     def __init__(
         self,
         file_path: SPath,
-        work_clip: vs.VideoNode,
+        work_clip: vs.VideoNode | None,
         video_data: WobblyVideo,
         field_order: FieldBasedLike,
         sections: Sections | None = None,
@@ -80,9 +102,14 @@ class WobblyParser:
         interlaced_fades: InterlacedFades | None = None,
         combed_frames: CombedFrames | None = None,
         orphan_frames: OrphanFrames | None = None,
+        mics: Mics | None = None,
+        decimate_metrics: DecimateMetrics | None = None,
+        crop: Crop | None = None,
+        resize: Resize | None = None,
+        depth: BitDepth | None = None,
     ) -> None:
         self.file_path = file_path
-        self.work_clip = work_clip
+        self._work_clip = work_clip
         self.video_data = video_data
         self.field_order = field_order
 
@@ -95,14 +122,51 @@ class WobblyParser:
         self.interlaced_fades = interlaced_fades or InterlacedFades()
         self.combed_frames = combed_frames or CombedFrames()
         self.orphan_frames = orphan_frames or OrphanFrames()
+        self.mics = mics or Mics()
+        self.decimate_metrics = decimate_metrics or DecimateMetrics()
+        self.crop = crop
+        self.resize = resize
+        self.depth = depth
+
+    def __getstate__(self) -> dict[str, Any]:
+        return self.__dict__ | {'_work_clip': None}
+
+    @property
+    def work_clip(self) -> vs.VideoNode:
+        """The clip to work on. The source is indexed, and the field order applied, on first access."""
+
+        if self._work_clip is None:
+            self._work_clip = FieldBased.from_param(self.field_order, self.__class__).apply(self.video_data.work_clip)
+
+        return self._work_clip
+
+    @work_clip.setter
+    def work_clip(self, clip: vs.VideoNode) -> None:
+        self._work_clip = clip
 
     @classmethod
-    def from_file(cls, file_path: SPathLike) -> Self:
-        """Parse a wobbly object from a wobbly file."""
+    def from_file(
+        cls,
+        file_path: SPathLike,
+        source_filter: VSFunctionNoArgs | None = None,
+        source_filter_kwargs: dict[str, Any] | None = None,
+    ) -> Self:
+        """
+        Parse a wobbly object from a wobbly file.
+
+        :param file_path:               The path to the wobbly file.
+        :param source_filter:           Callable to index the source file with,
+                                        instead of the wobbly file's source filter.
+                                        It must accept the source file path as its first argument.
+        :param source_filter_kwargs:    Keyword arguments to pass to the source filter,
+                                        e.g. decoder threads, the index cache location or the seek mode.
+                                        These are applied on top of the defaults for known source filters.
+                                        See `SOURCE_FILTER_DEFAULTS`.
+        """
 
         from .builder import WobblyBuilder
 
-        return WobblyBuilder(file_path).build()
+        return WobblyBuilder(file_path, source_filter, source_filter_kwargs=source_filter_kwargs).build()
 
     @staticmethod
     def _get_video_data(wob_file: SPath, data: dict[str, Any]) -> WobblyVideo:
@@ -1,11 +1,93 @@
+from collections.abc import Sequence
+from itertools import islice
+from operator import le, lt
 from typing import Any
 
-from ..exceptions import WobblyValidationError
+from jetpytools import FileNotExistsError, FileWasNotFoundError, SPath, SPathLike
+
+from ..components.types import ValidMatchT
+from ..exceptions import NotAWobblyFileError, WobblyParseError, WobblyValidationError
+from ..types import FilteringPositionEnum, JSONBackendEnum
+from .loader import load_wob_json
+
+__all__ = [
+    'WobblyValidator',
+    'validate',
+]
+
+
+_LIST_KEYS = (
+    'matches',
+    'combed frames',
+    'decimated frames',
+    'sections',
+    'presets',
+    'custom lists',
+    'frozen frames',
+    'interlaced fades',
+    'mics',
+    'decimate metrics',
+)
+
+# The required keys of every setting, and the lowest value they can have.
+_SETTINGS_KEYS = {
+    'crop': (('left', 'top', 'right', 'bottom'), 0),
+    'resize': (('width', 'height'), 1),
+    'depth': (('bits',), 1),
+}
+
+
+def validate(path: SPathLike, json_backend: JSONBackendEnum | str = JSONBackendEnum.AUTO) -> None:
+    """
+    Fully validate a wobbly file, without indexing its source or creating any clips.
+
+    This runs every check `WobblyBuilder.build` runs, on the JSON data alone,
+    so it's fast enough to check hundreds of files in seconds.
+
+    :param path:            The path to the wobbly file.
+    :param json_backend:    The JSON decoder to use. Default: the fastest installed decoder.
+
+    :raises WobblyParseError:       The file is not a wobbly file, or could not be decoded.
+    :raises WobblyValidationError:  The file contains invalid data.
+    """
+
+    WobblyValidator.validate_file_path(path)
+    WobblyValidator.validate(load_wob_json(path, json_backend))
 
 
 class WobblyValidator:
     """Class for validating wobbly files."""
 
+    @staticmethod
+    def validate(data: dict[str, Any]) -> None:
+        """Run every validation on the JSON data of a wobbly file."""
+
+        WobblyValidator.validate_version(data)
+        WobblyValidator.validate_json_structure(data)
+        WobblyValidator.validate_frames(data)
+        WobblyValidator.validate_presets(data)
+        WobblyValidator.validate_references(data)
+
+    @staticmethod
+    def validate_file_path(path: SPathLike) -> None:
+        """Check that the path points to a non-empty wobbly file."""
+
+        func = WobblyValidator.validate_file_path
+        path = SPath(path)
+
+        if not path.exists():
+            raise FileWasNotFoundError(f"File path does not exist: '{path}'", func)
+
+        if not path.is_file():
+            raise FileNotExistsError(f"File path is not a file: '{path}'", func)
+
+        if not path.suffix == '.wob':
+            raise NotAWobblyFileError('You must provide a wobbly file!', func)
+
+        # We check for 2 bytes because wibbly writes 2 bytes when initializing
+        if path.get_size() <= 2:
+            raise WobblyParseError(f"File is empty: '{path}'", func)
+
     @staticmethod
     def validate_json_structure(data: dict[str, Any]) -> None:
         """Validate the JSON structure of a wobbly file."""
@@ -15,10 +97,48 @@ class WobblyValidator:
             'source filter',
         }
 
+        func = WobblyValidator.validate_json_structure
+
+        if not isinstance(data, dict):
+            raise WobblyValidationError('A wobbly file must contain a JSON object!', func)
+
         missing = required_fields - set(data.keys())
 
         if missing:
-            raise WobblyValidationError(f'Missing required fields: {missing}', WobblyValidator.validate_json_structure)
+            raise WobblyValidationError(f'Missing required fields: {sorted(missing)}', func)
+
+        if wrong_type := [key for key in _LIST_KEYS if not isinstance(data.get(key, []), list)]:
+            raise WobblyValidationError(f'These fields must be lists: {wrong_type}', func)
+
+        if not isinstance(source_filter := data['source filter'], str) or len(source_filter.split('.')) != 2:
+            raise WobblyValidationError(
+                f"The source filter must be formatted as 'namespace.function', not '{source_filter}'!", func
+            )
+
+        for trim in data.get('trim') or []:
+            if (
+                not isinstance(trim, list)
+                or len(trim) != 2
+                or not all(isinstance(frame, int) and frame >= 0 for frame in trim)
+                or trim[0] > trim[1]
+            ):
+                raise WobblyValidationError(f'Invalid trim: {trim}. Expected [first, last].', func)
+
+        for key, (required, minimum) in _SETTINGS_KEYS.items():
+            if not (settings := data.get(key)):
+                continue
+
+            if not isinstance(settings, dict):
+                raise WobblyValidationError(f"'{key}' must be an object!", func)
+
+            if settings.get('state', False) and (
+                wrong := [
+                    name for name in required if not isinstance(settings.get(name), int) or settings[name] < minimum
+                ]
+            ):
+                raise WobblyValidationError(
+                    f"'{key}' must contain {'positive' if minimum else 'non-negative'} integers for: {wrong}", func
+                )
 
     @staticmethod
     def validate_version(data: dict[str, Any]) -> None:
@@ -29,3 +149,185 @@ class WobblyValidator:
                 f'Unsupported wobbly version: {version}. Minimum supported version is 8. Please update!',
                 WobblyValidator.validate_version,
             )
+
+    @staticmethod
+    def validate_frames(data: dict[str, Any]) -> None:
+        """
+        Validate all frame data of a wobbly file at once.
+
+        Every array is checked as a whole: frame numbers must be integers, not negative,
+        and within the bounds of the matches. Custom lists may extend past the last frame,
+        since they're clamped to the clip when applied. Section starts must be sorted and unique,
+        ranges must not end before they start, and matches and field differences must be valid.
+        Components built from data that passed this check can skip their own per-item validation.
+
+        Combed and decimated frames may be unsorted or contain duplicates. See `is_strictly_increasing`.
+        """
+
+        func = WobblyValidator.validate_frames
+
+        matches = data.get('matches') or []
+        num_frames = len(matches) or None
+
+        if invalid := set(matches) - set(ValidMatchT.__args__):  # type: ignore
+            raise WobblyValidationError(f"'matches' contains invalid matches: {sorted(map(str, invalid))}", func)
+
+        for key in ('combed frames', 'decimated frames'):
+            WobblyValidator._check_frames(key, data.get(key) or [], num_frames)
+
+        try:
+            starts = [section['start'] for section in data.get('sections') or []]
+        except (KeyError, TypeError):
+            raise WobblyValidationError("Every section in 'sections' must have a start frame!", func)
+
+        WobblyValidator._check_frames('sections', starts, num_frames)
+
+        if not WobblyValidator.is_strictly_increasing(starts):
+            raise WobblyValidationError("'sections' must be sorted by their start frame, without duplicates!", func)
+
+        try:
+            fades = data.get('interlaced fades') or []
+            fade_frames = [fade['frame'] for fade in fades]
+            differences = [fade['field difference'] for fade in fades]
+        except (KeyError, TypeError):
+            raise WobblyValidationError("Every interlaced fade must have a 'frame' and a 'field difference'!", func)
+
+        WobblyValidator._check_frames('interlaced fades', fade_frames, num_frames)
+
+        if differences and not 0 <= min(differences) <= max(differences) <= 1:
+            raise WobblyValidationError(
+                f"'interlaced fades' contains field differences outside of 0-1: "
+                f'{[d for d in differences if not 0 <= d <= 1][:10]}',
+                func,
+            )
+
+        if frozen := data.get('frozen frames') or []:
+            if any(len(freeze) != 3 for freeze in frozen):
+                raise WobblyValidationError('Every frozen frame must have a first, last and replacement frame!', func)
+
+            firsts, lasts, replacements = (list(column) for column in zip(*frozen))
+
+            WobblyValidator._check_frames('frozen frames', firsts + lasts + replacements, num_frames)
+            WobblyValidator._check_ranges('frozen frames', firsts, lasts)
+
+        for custom_list in data.get('custom lists') or []:
+            key = f"custom list '{custom_list.get('name', '')}'"
+            ranges = [frame if isinstance(frame, list) else [frame, frame] for frame in custom_list.get('frames', [])]
+
+            if any(len(frame_range) != 2 for frame_range in ranges):
+                raise WobblyValidationError(f'Every range in {key} must have a start and an end frame!', func)
+
+            starts, ends = ([r[0] for r in ranges], [r[1] for r in ranges])
+
+            WobblyValidator._check_frames(key, starts + ends, None)
+            WobblyValidator._check_ranges(key, starts, ends)
+
+        # The metrics themselves are only checked when they're packed, since most scripts never use them.
+        for key in ('mics', 'decimate metrics'):
+            if (metrics := data.get(key)) and num_frames is not None and len(metrics) != num_frames:
+                raise WobblyValidationError(
+                    f"'{key}' must have one entry per frame ({num_frames}), not {len(metrics)}!", func
+                )
+
+    @staticmethod
+    def validate_presets(data: dict[str, Any]) -> None:
+        """Check that presets have unique names, and that their contents are valid Python code."""
+
+        func = WobblyValidator.validate_presets
+        names = set[str]()
+
+        for preset in data.get('presets') or []:
+            if not isinstance(preset, dict) or not isinstance(name := preset.get('name'), str) or not name:
+                raise WobblyValidationError(f'Every preset must have a name: {preset}', func)
+
+            if name in names:
+                raise WobblyValidationError(f"Duplicate preset name: '{name}'", func)
+
+            names.add(name)
+
+            if not isinstance(contents := preset.get('contents', ''), str):
+                raise WobblyValidationError(f"The contents of preset '{name}' must be a string!", func)
+
+            try:
+                compile(contents, name, 'exec')
+            except SyntaxError as e:
+                raise WobblyValidationError(f"Invalid Python code in preset '{name}': {e}", func)
+
+    @staticmethod
+    def validate_references(data: dict[str, Any]) -> None:
+        """
+        Check that sections and custom lists refer to existing presets, and custom lists have valid positions.
+
+        Custom lists without a position are applied before decimation.
+        """
+
+        func = WobblyValidator.validate_references
+        presets = {preset['name'] for preset in data.get('presets') or []}
+        positions = {str(position) for position in FilteringPositionEnum}
+
+        for section in data.get('sections') or []:
+            section_presets = [
+                name for item in section.get('presets') or [] for name in (item if isinstance(item, list) else [item])
+            ]
+
+            if missing := [name for name in section_presets if name not in presets]:
+                raise WobblyValidationError(
+                    f'Section starting at frame {section["start"]} uses unknown presets: {missing}', func
+                )
+
+        for custom_list in data.get('custom lists') or []:
+            name = custom_list.get('name', '')
+
+            if (preset := custom_list.get('preset')) not in presets:
+                raise WobblyValidationError(f"Custom list '{name}' uses an unknown preset: '{preset}'", func)
+
+            if (position := custom_list.get('position', str(FilteringPositionEnum.PRE_DECIMATE))) not in positions:
+                raise WobblyValidationError(
+                    f"Custom list '{name}' has an invalid position: '{position}'. Expected one of {sorted(positions)}",
+                    func,
+                )
+
+    @staticmethod
+    def is_strictly_increasing(values: Sequence[int]) -> bool:
+        """Check whether a sequence is sorted and contains no duplicates."""
+
+        return all(map(lt, values, islice(values, 1, None)))
+
+    @staticmethod
+    def _check_frames(key: str, frames: list[Any], num_frames: int | None) -> None:
+        """Check that every frame is an integer, not negative, and within the bounds of the matches."""
+
+        func = WobblyValidator.validate_frames
+
+        if not frames:
+            return
+
+        if not set(map(type, frames)) <= {int}:
+            invalid = [frame for frame in frames if type(frame) is not int][:10]
+
+            raise WobblyValidationError(f"'{key}' contains frame numbers that are not integers: {invalid}", func)
+
+        if min(frames) < 0:
+            invalid = [frame for frame in frames if frame < 0][:10]
+
+            raise WobblyValidationError(f"'{key}' contains negative frame numbers: {invalid}", func)
+
+        if num_frames is not None and max(frames) >= num_frames:
+            invalid = [frame for frame in frames if frame >= num_frames][:10]
+
+            raise WobblyValidationError(
+                f"'{key}' contains frame numbers past the last frame ({num_frames - 1}): {invalid}", func
+            )
+
+    @staticmethod
+    def _check_ranges(key: str, starts: list[int], ends: list[int]) -> None:
+        """Check that no range ends before it starts."""
+
+        if all(map(le, starts, ends)):
+            return
+
+        invalid = [(start, end) for start, end in zip(starts, ends) if start > end][:10]
+
+        raise WobblyValidationError(
+            f"'{key}' contains ranges that end before they start: {invalid}", WobblyValidator.validate_frames
+        )
@@ -1,5 +1,11 @@
 # ruff: noqa: F401, F403
 
+from . import frame, match, wobbly
 from .frame import *
 from .match import *
 from .wobbly import *
+
+__all__: list[str] = []
+__all__ += frame.__all__
+__all__ += match.__all__
+__all__ += wobbly.__all__
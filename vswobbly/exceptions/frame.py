@@ -22,7 +22,7 @@ class NegativeFrameError(CustomValueError):
 
     @classmethod
     def check(cls, func: FuncExceptT, frames: int | Iterable[int]) -> None:
-        """Check if the frame number is negative."""
+        """Check if the frame number, or any of the frame numbers, is negative."""
 
         if not frames:
             return
@@ -36,13 +36,13 @@ class NegativeFrameError(CustomValueError):
         if not isinstance(frames, Iterable):
             raise CustomTypeError('Frame number must be an integer!', func, invalid_frame=frames, reason=type(frames))
 
+        if not (frames := list(frames)):
+            return
+
         if any(not isinstance(frame, int) for frame in frames):
             raise CustomTypeError('Frame numbers must be integers!', func, reason=type(frames))
 
-        for i, frame in enumerate(frames):
-            if frame >= 0:
-                if i > 0:  # Stop checking once we find a positive frame
-                    raise cls(func, frames[:i])
-                return
+        if min(frames) >= 0:
+            return
 
-        raise cls(func, frames)
+        raise cls(func, [frame for frame in frames if frame < 0])
@@ -0,0 +1,163 @@
+"""
+Wrappers around operations that depend on external plugins, with pure `std` fallbacks.
+
+The fallbacks are never picked implicitly. Pass `PluginBackendEnum.STD` to use them.
+"""
+
+from collections.abc import Iterable
+
+from jetpytools import CustomValueError, DependencyNotFoundError
+from vstools import core, vs
+
+from .types import PluginBackendEnum
+
+__all__ = [
+    'field_hint',
+    'field_hint_clips',
+    'plane_difference',
+]
+
+
+def _check_backend(backend: PluginBackendEnum | str, namespace: str, plugin: str, func: object) -> PluginBackendEnum:
+    backend = PluginBackendEnum(backend)
+
+    if backend is PluginBackendEnum.NATIVE and not hasattr(core, namespace):
+        raise DependencyNotFoundError(func, plugin)
+
+    return backend
+
+
+def field_hint_clips(
+    clip: vs.VideoNode,
+    tff: bool,
+    matches: str,
+    backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+) -> dict[str, vs.VideoNode]:
+    """
+    Get a field matched clip for every distinct match in the given matches.
+
+    With the native backend, every match maps to the same `fh.FieldHint` clip.
+    With the std backend, every match maps to a clip with that match applied to every frame,
+    so picking the clip for frame `n` by `matches[n]` gives the same result as `fh.FieldHint`.
+
+    :param clip:        The clip to field match.
+    :param tff:         Whether the clip is top field first.
+    :param matches:     A string containing the match for every frame.
+    :param backend:     The implementation to use. Default: native.
+
+    :raises DependencyNotFoundError:    The native backend was requested, but `fh` is not installed.
+    :raises CustomValueError:           The matches contain an unknown match.
+
+    :return:            A dictionary mapping every match to its clip.
+    """
+
+    backend = _check_backend(backend, 'fh', 'FieldHint', field_hint_clips)
+
+    if unknown := set(matches) - set('pcnbu'):
+        raise CustomValueError(f'Unknown field matches: {sorted(unknown)}', field_hint_clips)
+
+    if backend is PluginBackendEnum.NATIVE:
+        fh = clip.fh.FieldHint(tff=tff, matches=matches)
+
+        return dict.fromkeys(set(matches), fh)
+
+    return _std_field_hint_clips(clip, tff, set(matches))
+
+
+def field_hint(
+    clip: vs.VideoNode,
+    tff: bool,
+    matches: str,
+    backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+) -> vs.VideoNode:
+    """
+    Apply field matches to a clip, like `fh.FieldHint`.
+
+    :param clip:        The clip to field match.
+    :param tff:         Whether the clip is top field first.
+    :param matches:     A string containing the match for every frame.
+    :param backend:     The implementation to use. Default: native.
+
+    :return:            The field matched clip.
+    """
+
+    match_clips = field_hint_clips(clip, tff, matches, backend)
+
+    if len(match_clips) == 1:
+        return next(iter(match_clips.values()))
+
+    return clip.std.FrameEval(lambda n: match_clips[matches[n]])
+
+
+def _std_field_hint_clips(clip: vs.VideoNode, tff: bool, matches: Iterable[str]) -> dict[str, vs.VideoNode]:
+    """
+    Weave the fields of every match using `std` functions only.
+
+    For top field first clips, the top field is kept, and the bottom field is matched from the previous ('p'),
+    current ('c') or next ('n') frame. For 'b' and 'u', the roles are swapped,
+    and the top field is matched from the previous or next frame respectively.
+    For bottom field first clips, top and bottom are swapped. Fields past either end of the clip are clamped.
+    """
+
+    if clip.num_frames < 2:
+        return dict.fromkeys(matches, clip)
+
+    fields = clip.std.SeparateFields(tff=True).std.RemoveFrameProps('_Field')
+    tops, bottoms = fields[::2], fields[1::2]
+
+    def shift_prev(c: vs.VideoNode) -> vs.VideoNode:
+        return c[0] + c[:-1]
+
+    def shift_next(c: vs.VideoNode) -> vs.VideoNode:
+        return c[1:] + c[-1]
+
+    # The first field is kept for 'p' and 'n', the second field for 'b' and 'u'.
+    first, second = (tops, bottoms) if tff else (bottoms, tops)
+
+    pairs = {
+        'p': (first, shift_prev(second)),
+        'n': (first, shift_next(second)),
+        'b': (shift_prev(first), second),
+        'u': (shift_next(first), second),
+    }
+
+    match_clips = dict[str, vs.VideoNode]()
+
+    for match in matches:
+        if match == 'c':
+            match_clips[match] = clip
+            continue
+
+        a, b = pairs[match]
+        top, bottom = (a, b) if tff else (b, a)
+
+        woven = core.std.Interleave([top, bottom]).std.DoubleWeave(tff=True)[::2]
+
+        match_clips[match] = woven.std.CopyFrameProps(clip)
+
+    return match_clips
+
+
+def plane_difference(
+    clipa: vs.VideoNode,
+    clipb: vs.VideoNode,
+    backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+) -> tuple[vs.VideoNode, str]:
+    """
+    Measure the normalized mean absolute difference between the first planes of two clips.
+
+    :param clipa:       The first clip. The difference is attached to its frames.
+    :param clipb:       The clip to compare against.
+    :param backend:     The implementation to use. Default: native.
+
+    :raises DependencyNotFoundError:    The native backend was requested, but `vszip` is not installed.
+
+    :return:            The first clip with the difference attached, and the name of the frame property holding it.
+    """
+
+    backend = _check_backend(backend, 'vszip', 'vszip', plane_difference)
+
+    if backend is PluginBackendEnum.NATIVE:
+        return clipa.vszip.PlaneAverage([0], clipb), 'psmDiff'
+
+    return clipa.std.PlaneStats(clipb, plane=0), 'PlaneStatsDiff'
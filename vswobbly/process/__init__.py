@@ -1,4 +1,42 @@
 # ruff: noqa: F401, F403
 
+from ..util import lazy_attributes
+from . import (
+    cache,
+    checkpoint,
+    chunks,
+    explain,
+    plan,
+    processor,
+    profiling,
+    render,
+    strategies,
+    watch,
+)
+from .cache import *
+from .checkpoint import *
+from .chunks import *
+from .explain import *
+from .plan import *
 from .processor import *
-from .strategies import *
+from .profiling import *
+from .render import *
+from .strategies.cached import *
+from .strategies.custom_lists import *
+from .watch import *
+
+# The strategies aren't star-imported, as that would import the lazily imported strategies.
+# They're still listed here, so star imports of this package include them. See `util.lazy_attributes`.
+__all__: list[str] = []
+__all__ += cache.__all__
+__all__ += checkpoint.__all__
+__all__ += chunks.__all__
+__all__ += explain.__all__
+__all__ += plan.__all__
+__all__ += processor.__all__
+__all__ += profiling.__all__
+__all__ += render.__all__
+__all__ += strategies.__all__
+__all__ += watch.__all__
+
+__getattr__, __dir__ = lazy_attributes(__name__, strategies._LAZY_STRATEGIES)
@@ -0,0 +1,599 @@
+import ctypes
+import hashlib
+import json
+import mmap
+import os
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from threading import RLock, get_ident
+from typing import Any
+
+from jetpytools import CustomValueError, SPath, SPathLike
+from vstools import vs
+
+__all__ = [
+    'DiskFrameCache',
+    'PreviewCache',
+]
+
+
+class DiskFrameCache:
+    """
+    A content-addressed cache of rendered frames on disk, bounded by a size budget.
+
+    Every frame is stored losslessly as its raw planes (in `<key>.bin`), with its format and frame properties
+    in a sidecar file (`<key>.json`). Cached frames are read from a memory-mapped file straight into a new frame,
+    without rendering anything the frame depends on.
+
+    Keys are created by the caller (see `make_key`), and must change whenever anything affecting the frame changes.
+    See `CachedStrategy` for a strategy wrapper that derives them from the source, the strategy's parameters
+    and the wobbly data of the surrounding frames.
+
+    When the cache grows beyond its budget, the least recently used frames are deleted.
+    The cache can be shared between processes, and survives restarts. Pickling it only keeps its path and budget.
+    Frames that were deleted by another process, or that don't match the clip, are rendered and stored again.
+    """
+
+    def __init__(self, path: SPathLike, max_bytes: int = 16 << 30) -> None:
+        """
+        :param path:            The directory to store the cached frames in. It's created if it doesn't exist.
+        :param max_bytes:       The maximum total size of the cached frames, in bytes. Default: 16 GiB.
+
+        :raises CustomValueError:   The maximum size is not positive.
+        """
+
+        if max_bytes <= 0:
+            raise CustomValueError(f'The maximum size must be positive, not {max_bytes}!', self.__class__)
+
+        self.path = SPath(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = RLock()
+        self._entries = OrderedDict[str, int]()
+        self._pinned = Counter[str]()
+        self._opened = dict[str, tuple[dict[str, Any], mmap.mmap]]()
+        self._nbytes = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Other processes (e.g. render workers) index the directory themselves.
+        return self.__class__, (self.path, self.max_bytes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the cached frames, in bytes."""
+
+        return self._nbytes
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Create a cache key from anything with a stable `repr`, e.g. tuples of strings and numbers.
+
+        :param parts:       Everything that identifies the frame.
+
+        :return:            A hexadecimal SHA-256 digest.
+        """
+
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def cache_clip(self, clip: vs.VideoNode, keys: Callable[[int], str | None]) -> vs.VideoNode:
+        """
+        Serve the frames of a clip from the cache, and store the frames that aren't cached yet when they're rendered.
+
+        :param clip:        The clip to cache. Clips with a variable format or size are never served from the cache.
+        :param keys:        Callable returning the cache key of a frame number,
+                            or None to pass the frame through without caching it.
+
+        :return:            The cached clip.
+        """
+
+        blank = clip.std.BlankClip(keep=True)
+        fmt, width, height = clip.format, clip.width, clip.height
+
+        def _store(n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+            if (key := keys(n)) is not None:
+                self.store(key, f)
+
+            return f
+
+        def _load(n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+            key = keys(n)
+            assert key is not None
+
+            return self.load(key, f)
+
+        stored, cached = clip.std.ModifyFrame(clip, _store), blank.std.ModifyFrame(blank, _load)
+
+        def _select(n: int) -> vs.VideoNode:
+            if (key := keys(n)) is None:
+                return clip
+
+            with self._lock:
+                if key in self._entries and (key in self._opened or self._open(key, fmt, width, height)):
+                    # The file stays mapped until the frame is loaded, even if another process deletes it,
+                    # and being the most recently used keeps it from being evicted in the meantime.
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+
+                    return cached
+
+                # Not cached, deleted by another process, or not matching the clip, so it's rendered again.
+                self._nbytes -= self._entries.pop(key, 0)
+                self.misses += 1
+
+            return stored
+
+        return blank.std.FrameEval(_select)
+
+    def load(self, key: str, template: vs.VideoFrame) -> vs.VideoFrame:
+        """
+        Read a cached frame.
+
+        :param key:         The key of the frame.
+        :param template:    A frame with the format and dimensions of the cached frame. It's copied, not modified.
+
+        :raises CustomValueError:   The frame isn't cached, or it doesn't match the template.
+
+        :return:            The cached frame.
+        """
+
+        with self._lock:
+            if key not in self._opened and not self._open(key, template.format, template.width, template.height):
+                raise CustomValueError(f'The frame {key} is not cached, or does not match the clip!', self.load)
+
+            self._pinned[key] += 1
+            meta, mapped = self._opened[key]
+
+        try:
+            return self._read(key, meta, mapped, template)
+        finally:
+            self._unpin(key)
+
+    def store(self, key: str, frame: vs.VideoFrame) -> None:
+        """
+        Write a frame to the cache, and evict the least recently used frames if the cache is over its budget.
+
+        :param key:         The key of the frame.
+        :param frame:       The frame to store.
+        """
+
+        assert frame.format
+
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(exist_ok=True)
+
+        strides = [frame.get_stride(plane) for plane in range(frame.format.num_planes)]
+        meta = {
+            'format': frame.format.id,
+            'width': frame.width,
+            'height': frame.height,
+            'strides': strides,
+            'props': {k: encoded for k, v in frame.props.items() if (encoded := _encode_prop(v)) is not None},
+        }
+
+        # Written to temporary files first, so other processes never read partially written frames.
+        tmp_suffix = f'.{os.getpid()}.{get_ident()}.tmp'
+
+        with open(f'{data_path}{tmp_suffix}', 'wb') as file:
+            for plane, stride in enumerate(strides):
+                plane_size = stride * _plane_height(frame, plane)
+                file.write(memoryview((ctypes.c_ubyte * plane_size).from_address(frame.get_read_ptr(plane).value)))
+
+        with open(f'{meta_path}{tmp_suffix}', 'w') as file:
+            json.dump(meta, file)
+
+        # The sidecar file goes last, since frames are only read if it exists.
+        os.replace(f'{data_path}{tmp_suffix}', data_path)
+        os.replace(f'{meta_path}{tmp_suffix}', meta_path)
+
+        with self._lock:
+            self._nbytes += (size := _entry_size(data_path, meta_path)) - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def clear(self) -> None:
+        """Delete every cached frame, and reset the hit and miss counters."""
+
+        with self._lock:
+            for key in list(self._entries):
+                self._delete(key)
+
+            self.hits = self.misses = 0
+
+    def _open(self, key: str, fmt: vs.VideoFormat | None, width: int, height: int) -> bool:
+        """
+        Map a cached frame into memory, if its files exist and match the given format and dimensions.
+
+        The mapping stays valid if another process deletes the files, and is closed once the frame is loaded.
+        """
+
+        if fmt is None:
+            return False
+
+        data_path, meta_path = self._paths(key)
+
+        try:
+            with open(meta_path, 'r') as file:
+                meta = json.load(file)
+
+            if (meta['format'], meta['width'], meta['height']) != (fmt.id, width, height):
+                return False
+
+            size = sum(
+                stride * (height >> fmt.subsampling_h if plane else height)
+                for plane, stride in enumerate(meta['strides'])
+            )
+
+            with open(data_path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        # A truncated file would be read past its end.
+        if len(mapped) != size:
+            mapped.close()
+            return False
+
+        self._opened[key] = (meta, mapped)
+
+        return True
+
+    def _read(self, key: str, meta: dict[str, Any], mapped: mmap.mmap, template: vs.VideoFrame) -> vs.VideoFrame:
+        """Copy a mapped frame into a copy of the template."""
+
+        assert template.format
+
+        if (meta['format'], meta['width'], meta['height']) != (template.format.id, template.width, template.height):
+            raise CustomValueError(f'The cached frame {key} does not match the clip!', self.load)
+
+        frame = template.copy()
+        buffer = (ctypes.c_char * len(mapped)).from_buffer(mapped)
+
+        try:
+            _copy_planes(ctypes.addressof(buffer), meta['strides'], frame)
+        finally:
+            del buffer
+
+        frame.props.clear()
+        frame.props.update({k: _decode_prop(v) for k, v in meta['props'].items()})
+
+        self._touch(key, self._paths(key)[0])
+
+        return frame
+
+    def _paths(self, key: str) -> tuple[SPath, SPath]:
+        directory = self.path / key[:2]
+
+        return directory / f'{key}.bin', directory / f'{key}.json'
+
+    def _scan(self) -> None:
+        """Index the frames already on disk, from least to most recently used."""
+
+        entries = list[tuple[int, str, int]]()
+
+        for data_path in self.path.glob('*/*.bin'):
+            meta_path = data_path.with_suffix('.json')
+
+            try:
+                entries.append((os.stat(data_path).st_mtime_ns, data_path.stem, _entry_size(data_path, meta_path)))
+            except OSError:
+                continue
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._nbytes += size
+
+        self._evict()
+
+    def _touch(self, key: str, data_path: SPath) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+        # The modification time is the recency, so the order survives restarts.
+        try:
+            os.utime(data_path)
+        except OSError:
+            pass
+
+    def _unpin(self, key: str) -> None:
+        with self._lock:
+            if self._pinned[key] > 1:
+                self._pinned[key] -= 1
+                return
+
+            del self._pinned[key]
+
+            if (opened := self._opened.pop(key, None)) is not None:
+                opened[1].close()
+
+    def _evict(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if self._nbytes <= self.max_bytes:
+                    break
+
+                if key not in self._pinned:
+                    self._delete(key)
+
+    def _delete(self, key: str) -> None:
+        self._nbytes -= self._entries.pop(key, 0)
+
+        # Frames that are being loaded are unmapped once they're unpinned.
+        if key not in self._pinned and (opened := self._opened.pop(key, None)) is not None:
+            opened[1].close()
+
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class PreviewCache:
+    """
+    An in-memory cache of the frames of a clip for interactive previewing, bounded by a memory budget.
+
+    Every requested frame is kept until the cache is over its budget, evicting the least recently used frames first.
+    After every request, the surrounding frames are rendered in the background with `get_frame_async`,
+    so stepping forward and back through the clip is served from memory.
+
+    Use the counters to tune the budget and the prefetch window: `hits` counts requests served from memory
+    (including frames that were still being prefetched), `misses` counts requests that had to be rendered,
+    and `prefetch_hits` counts the hits that were served by a prefetched frame.
+    """
+
+    def __init__(
+        self, clip: vs.VideoNode, max_bytes: int = 1 << 30, prefetch_before: int = 2, prefetch_after: int = 8
+    ) -> None:
+        """
+        :param clip:                The clip to cache, e.g. the output of `WobblyProcessor.apply`.
+        :param max_bytes:           The maximum total size of the cached frames, in bytes. Default: 1 GiB.
+        :param prefetch_before:     The number of frames before every requested frame to render in the background.
+        :param prefetch_after:      The number of frames after every requested frame to render in the background.
+
+        :raises CustomValueError:   The maximum size is not positive, or a prefetch window is negative.
+        """
+
+        if max_bytes <= 0:
+            raise CustomValueError(f'The maximum size must be positive, not {max_bytes}!', self.__class__)
+
+        if min(prefetch_before, prefetch_after) < 0:
+            raise CustomValueError('The prefetch windows cannot be negative!', self.__class__)
+
+        self.clip = clip
+        self.max_bytes = max_bytes
+        self.prefetch_before = prefetch_before
+        self.prefetch_after = prefetch_after
+
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+
+        self._lock = RLock()
+        self._frames = OrderedDict[int, tuple[vs.VideoFrame, int]]()
+        self._prefetched = set[int]()
+        self._pending = dict[int, Future[vs.VideoFrame]]()
+        self._generation = 0
+        self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, n: int) -> bool:
+        return n in self._frames
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the cached frames, in bytes."""
+
+        return self._nbytes
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of requests served from memory."""
+
+        return self.hits / total if (total := self.hits + self.misses) else 0.0
+
+    def get_frame(self, n: int) -> vs.VideoFrame:
+        """
+        Get a frame, from memory if possible, and start prefetching the surrounding frames.
+
+        :param n:           The frame number.
+
+        :return:            The frame.
+        """
+
+        with self._lock:
+            cached = self._frames.get(n)
+            future = self._pending.get(n) if cached is None else None
+
+            if cached is not None:
+                self._frames.move_to_end(n)
+
+            if cached is not None or future is not None:
+                self._count_hit(n)
+            else:
+                self.misses += 1
+
+            generation = self._generation
+
+        self._prefetch(n)
+
+        if cached is not None:
+            return cached[0]
+
+        frame = future.result() if future is not None else self.clip.get_frame(n)
+
+        with self._lock:
+            if generation == self._generation:
+                self._add(n, frame)
+
+        return frame
+
+    def invalidate(self, ranges: list[tuple[int, int]] | None = None) -> None:
+        """
+        Drop cached frames, e.g. after the clip was rebuilt with `set_clip`.
+
+        :param ranges:      Inclusive `(first, last)` frame ranges to drop, like `WatchUpdate.changed_ranges`.
+                            Default: drop every frame.
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._prefetched.difference_update(self._pending)
+            self._pending.clear()
+
+            if ranges is None:
+                self._frames.clear()
+                self._prefetched.clear()
+                self._nbytes = 0
+                return
+
+            for first, last in ranges:
+                for n in [n for n in self._frames if first <= n <= last]:
+                    self._remove(n)
+
+    def set_clip(self, clip: vs.VideoNode, changed_ranges: list[tuple[int, int]] | None = None) -> None:
+        """
+        Replace the cached clip, keeping the frames that didn't change.
+
+        :param clip:                The new clip.
+        :param changed_ranges:      The frame ranges that differ from the previous clip. Default: every frame.
+        """
+
+        with self._lock:
+            self.clip = clip
+            self.invalidate(changed_ranges)
+
+            for n in [n for n in self._frames if n >= clip.num_frames]:
+                self._remove(n)
+
+    def reset_stats(self) -> None:
+        """Reset the hit and miss counters."""
+
+        with self._lock:
+            self.hits = self.misses = self.prefetch_hits = 0
+
+    def _count_hit(self, n: int) -> None:
+        self.hits += 1
+
+        if n in self._prefetched:
+            self._prefetched.discard(n)
+            self.prefetch_hits += 1
+
+    def _prefetch(self, n: int) -> None:
+        """Request the surrounding frames that aren't cached or pending yet, nearest first."""
+
+        with self._lock:
+            clip, generation = self.clip, self._generation
+
+            offsets = sorted(range(-self.prefetch_before, self.prefetch_after + 1), key=abs)
+            requests = [
+                m
+                for m in (n + offset for offset in offsets if offset)
+                if 0 <= m < clip.num_frames and m not in self._frames and m not in self._pending
+            ]
+
+            for m in requests:
+                self._pending[m] = future = clip.get_frame_async(m)
+                self._prefetched.add(m)
+                future.add_done_callback(lambda future, m=m: self._on_prefetched(m, future, generation))
+
+    def _on_prefetched(self, n: int, future: Future[vs.VideoFrame], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or self._pending.get(n) is not future:
+                return
+
+            del self._pending[n]
+
+            if future.exception() is None:
+                self._add(n, future.result())
+            else:
+                self._prefetched.discard(n)
+
+    def _add(self, n: int, frame: vs.VideoFrame) -> None:
+        if n in self._frames:
+            return
+
+        assert frame.format
+
+        size = sum(frame.get_stride(plane) * _plane_height(frame, plane) for plane in range(frame.format.num_planes))
+
+        self._frames[n] = (frame, size)
+        self._nbytes += size
+
+        while self._nbytes > self.max_bytes and len(self._frames) > 1:
+            self._remove(next(iter(self._frames)))
+
+    def _remove(self, n: int) -> None:
+        _, size = self._frames.pop(n)
+        self._nbytes -= size
+        self._prefetched.discard(n)
+
+
+def _plane_height(frame: vs.VideoFrame, plane: int) -> int:
+    assert frame.format
+
+    return frame.height >> frame.format.subsampling_h if plane else frame.height
+
+
+def _copy_planes(address: int, strides: list[int], frame: vs.VideoFrame) -> None:
+    """Copy raw planes, stored with the given strides, into a writable frame."""
+
+    for plane, src_stride in enumerate(strides):
+        height = _plane_height(frame, plane)
+        dst, dst_stride = frame.get_write_ptr(plane).value, frame.get_stride(plane)
+
+        if dst_stride == src_stride:
+            ctypes.memmove(dst, address, src_stride * height)
+        else:
+            row_size = min(src_stride, dst_stride)
+
+            for row in range(height):
+                ctypes.memmove(dst + row * dst_stride, address + row * src_stride, row_size)
+
+        address += src_stride * height
+
+
+def _entry_size(data_path: SPath, meta_path: SPath) -> int:
+    return os.stat(data_path).st_size + os.stat(meta_path).st_size
+
+
+def _encode_prop(value: Any) -> Any:
+    """Turn a frame property into JSON, or return None if it can't be stored (e.g. frames, nodes and functions)."""
+
+    if isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, bytes):
+        return {'bytes': value.hex()}
+
+    if isinstance(value, (list, tuple)):
+        encoded = [_encode_prop(v) for v in value]
+
+        return encoded if all(v is not None for v in encoded) else None
+
+    return None
+
+
+def _decode_prop(value: Any) -> Any:
+    if isinstance(value, dict):
+        return bytes.fromhex(value['bytes'])
+
+    if isinstance(value, list):
+        return [_decode_prop(v) for v in value]
+
+    return value
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+from collections.abc import Callable, Sequence
+from copy import copy
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from jetpytools import CustomValueError, SPath, SPathLike
+from vstools import vs
+
+from .strategies.abstract import AbstractProcessingStrategy
+
+if TYPE_CHECKING:
+    from .processor import WobblyProcessor
+
+__all__ = [
+    'RenderCheckpoint',
+    'render_resumable',
+    'wobbly_fingerprint',
+]
+
+
+@dataclass
+class RenderCheckpoint:
+    """The progress of a resumable render."""
+
+    fingerprint: str
+    """Fingerprint of the wobbly file, strategies, settings and input clip the render was started with."""
+
+    output: str
+    """The path of the file being rendered to."""
+
+    y4m: bool
+    """Whether the output is a YUV4MPEG2 file. Otherwise, it contains raw planar frames."""
+
+    num_frames: int
+    """The total number of output frames."""
+
+    chunks: list[dict[str, int]] = field(default_factory=list)
+    """Completed chunks, in order. Each chunk holds its first and last frame, and the output file offset after it."""
+
+    strategy_states: list[dict[str, Any]] = field(default_factory=list)
+    """The exported state of every strategy, in order. See `AbstractProcessingStrategy.export_state`."""
+
+    @classmethod
+    def from_file(cls, path: SPathLike) -> 'RenderCheckpoint':
+        """Load a checkpoint from a JSON file."""
+
+        with open(path, 'r') as file:
+            return cls(**json.load(file))
+
+    def to_file(self, path: SPathLike) -> None:
+        """Atomically write the checkpoint to a JSON file."""
+
+        tmp_path = SPath(f'{path}.tmp')
+
+        with open(tmp_path, 'w') as file:
+            json.dump(vars(self), file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(tmp_path, path)
+
+    @property
+    def next_frame(self) -> int:
+        """The first output frame that has not been rendered yet."""
+
+        return self.chunks[-1]['end'] + 1 if self.chunks else 0
+
+    @property
+    def offset(self) -> int:
+        """The output file offset directly after the last completed chunk."""
+
+        return self.chunks[-1]['offset'] if self.chunks else 0
+
+    @property
+    def finished(self) -> bool:
+        """Whether every output frame has been rendered."""
+
+        return self.next_frame >= self.num_frames
+
+
+class _SkipHeaderWriter:
+    """File wrapper that drops everything up to and including the first newline, i.e. the YUV4MPEG2 header."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._in_header = True
+
+    def write(self, data: bytes) -> int:
+        if self._in_header:
+            if (idx := bytes(data).find(b'\n')) == -1:
+                return len(data)
+
+            self._in_header = False
+            self._file.write(memoryview(data)[idx + 1 :])
+
+            return len(data)
+
+        return self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+
+def wobbly_fingerprint(
+    wob_path: SPathLike,
+    strategies: Sequence[Any] = (),
+    source_filter_kwargs: dict[str, Any] | None = None,
+    backend: Any = None,
+    output_settings: Any = None,
+    work_clip: vs.VideoNode | None = None,
+) -> str:
+    """
+    Create a fingerprint of a wobbly file and the strategies and settings used to process it.
+
+    Only the class and the simple attributes (numbers, strings, booleans) of each strategy are taken into account.
+    A custom work clip can't be fingerprinted without rendering all of it, so it's identified by its format,
+    dimensions, length, frame rate, and the contents of its first frame.
+
+    :param wob_path:                The path to the wobbly file.
+    :param strategies:              The strategies used during processing.
+    :param source_filter_kwargs:    The arguments the source was indexed with, if any.
+                                    See `WobblyVideo.source_filter_kwargs`.
+    :param backend:                 The field matching backend, if any. See `PluginBackendEnum`.
+    :param output_settings:         Where the output settings are applied, if anywhere. See `OutputSettingsEnum`.
+    :param work_clip:               The clip processed instead of the wobbly file's source, if any.
+
+    :return:                        A hexadecimal SHA-256 digest.
+    """
+
+    digest = hashlib.sha256()
+
+    with open(wob_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+
+    for strategy in strategies:
+        cls = strategy if isinstance(strategy, type) else type(strategy)
+        attrs = {
+            k: v
+            for k, v in (vars(strategy).items() if not isinstance(strategy, type) else ())
+            if isinstance(v, (bool, int, float, str)) or v is None
+        }
+
+        digest.update(f'{cls.__module__}.{cls.__qualname__}:{sorted(attrs.items())!r}'.encode())
+
+    if source_filter_kwargs:
+        digest.update(f'source:{sorted(source_filter_kwargs.items())!r}'.encode())
+
+    if backend is not None:
+        digest.update(f'backend:{backend}'.encode())
+
+    if output_settings is not None:
+        digest.update(f'output:{output_settings}'.encode())
+
+    if work_clip is not None:
+        digest.update(
+            f'clip:{work_clip.format.id if work_clip.format else None},{work_clip.width}x{work_clip.height},'
+            f'{work_clip.num_frames},{work_clip.fps}'.encode()
+        )
+
+        if work_clip.num_frames:
+            frame = work_clip.get_frame(0)
+
+            for plane in range(frame.format.num_planes):
+                digest.update(memoryview(frame[plane]).tobytes())
+
+    return digest.hexdigest()
+
+
+def render_resumable(
+    processor: 'WobblyProcessor',
+    output: SPathLike,
+    checkpoint: SPathLike | None = None,
+    chunk_size: int = 1000,
+    y4m: bool = True,
+    progress: Callable[[int, int], None] | None = None,
+) -> RenderCheckpoint:
+    """
+    Render the processed output to a file, writing a checkpoint after every chunk.
+
+    If a checkpoint for the output already exists, the render continues after the last completed chunk.
+    The output file is truncated to the offset recorded in the checkpoint,
+    so a partially written chunk is rendered again from its start.
+    Strategy analysis results stored in the checkpoint (e.g. orphan decisions)
+    are restored before the graph is built, so the analysis is not repeated.
+    The processor and its strategies are not modified, the render works on copies of them.
+
+    :param processor:       The processor to render the output of.
+    :param output:          The path of the file to render to.
+    :param checkpoint:      The path of the checkpoint file. Default: the output path with `.ckpt.json` appended.
+    :param chunk_size:      The number of frames to render between checkpoints.
+    :param y4m:             Whether to write a YUV4MPEG2 file. Otherwise, raw planar frames are written.
+    :param progress:        Callback receiving the number of rendered frames and the total number of frames.
+
+    :raises CustomValueError:   The checkpoint belongs to a different wobbly file, strategies, settings, input clip
+                                or output format.
+
+    :return:                The final checkpoint.
+    """
+
+    if chunk_size < 1:
+        raise CustomValueError(f'Chunk size must be at least 1, not {chunk_size}!', render_resumable)
+
+    output = SPath(output)
+    checkpoint = SPath(checkpoint) if checkpoint is not None else SPath(f'{output}.ckpt.json')
+
+    processor = copy(processor)
+    processor.strategies = [
+        strategy() if isinstance(strategy, type) else copy(strategy) for strategy in (processor.strategies or [])
+    ]
+
+    work_clip = processor.work_clip
+
+    fingerprint = wobbly_fingerprint(
+        processor.parser.file_path,
+        processor.strategies,
+        processor.parser.video_data.source_filter_kwargs,
+        processor.backend,
+        processor.output_settings,
+        work_clip if work_clip is not None and work_clip is not processor.parser._work_clip else None,
+    )
+
+    state = None
+
+    if checkpoint.exists() and output.exists():
+        state = RenderCheckpoint.from_file(checkpoint)
+
+        if state.fingerprint != fingerprint:
+            raise CustomValueError(
+                'Checkpoint does not match the current wobbly file, strategies, settings or input clip! '
+                f"Delete '{checkpoint}' to start over.",
+                render_resumable,
+            )
+
+        if state.y4m != y4m:
+            raise CustomValueError('Checkpoint was created with a different output format!', render_resumable)
+
+        for strategy, strategy_state in zip(processor.strategies, state.strategy_states):
+            if isinstance(strategy, AbstractProcessingStrategy):
+                strategy.import_state(strategy_state)
+
+    clip = processor.apply()
+
+    if state is None:
+        state = RenderCheckpoint(fingerprint, output.as_posix(), y4m, clip.num_frames)
+
+    state.strategy_states = [
+        strategy.export_state() if isinstance(strategy, AbstractProcessingStrategy) else {}
+        for strategy in processor.strategies
+    ]
+
+    with open(output, 'r+b' if state.chunks else 'wb') as file:
+        file.truncate(state.offset)
+        file.seek(state.offset)
+
+        while not state.finished:
+            start = state.next_frame
+            end = min(start + chunk_size, state.num_frames) - 1
+
+            clip[start : end + 1].output(_SkipHeaderWriter(file) if y4m and start else file, y4m=y4m)
+
+            file.flush()
+            os.fsync(file.fileno())
+
+            state.chunks.append({'start': start, 'end': end, 'offset': file.tell()})
+            state.to_file(checkpoint)
+
+            if progress is not None:
+                progress(end + 1, state.num_frames)
+
+    return state
@@ -0,0 +1,217 @@
+import sys
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate, pairwise
+from os import cpu_count
+from typing import Any
+
+from jetpytools import CustomValueError
+
+from ..data.parse import WobblyParser
+from ..types import FilteringPositionEnum
+
+__all__ = [
+    'ChunkCostWeights',
+    'RenderChunk',
+    'plan_chunks',
+]
+
+
+@dataclass(frozen=True)
+class ChunkCostWeights:
+    """Relative cost of rendering a single frame, used to balance render chunks."""
+
+    base: float = 1.0
+    """The cost of a plain frame."""
+
+    orphan: float = 8.0
+    """Additional cost of an orphan frame that gets deinterlaced by an orphan strategy."""
+
+    combed: float = 1.5
+    """Additional cost of a combed frame when a combed-frame strategy is used."""
+
+    fade: float = 3.0
+    """Additional cost of an interlaced fade that gets fixed by a fade strategy."""
+
+    preset: float = 2.0
+    """Additional cost of every preset applied to a frame, unless overridden in `presets`."""
+
+    presets: dict[str, float] = field(default_factory=dict)
+    """Per-preset overrides for the additional cost, keyed by preset name."""
+
+    def preset_cost(self, name: str) -> float:
+        """Get the additional cost of a preset."""
+
+        return self.presets.get(name, self.preset)
+
+
+@dataclass(frozen=True)
+class RenderChunk:
+    """A range of output frames that can be rendered independently."""
+
+    start: int
+    """The first output frame of the chunk."""
+
+    end: int
+    """The last output frame of the chunk. Inclusive."""
+
+    cost: float
+    """The estimated cost of rendering this chunk, in units of `ChunkCostWeights.base` frames."""
+
+    def __iter__(self):
+        """Return the start and end frames for unpacking."""
+
+        return iter((self.start, self.end))
+
+    @property
+    def num_frames(self) -> int:
+        """The number of frames in the chunk."""
+
+        return self.end - self.start + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the chunk as a JSON-serializable dictionary."""
+
+        return {'start': self.start, 'end': self.end, 'frames': self.num_frames, 'cost': self.cost}
+
+
+def plan_chunks(
+    wobbly_parsed: WobblyParser,
+    strategies: Sequence[Any] = (),
+    num_chunks: int | None = None,
+    weights: ChunkCostWeights | None = None,
+    num_frames: int | None = None,
+) -> list[RenderChunk]:
+    """
+    Split the processed output into chunks that can be rendered in parallel.
+
+    Chunk boundaries are only ever placed on section starts (see `Sections.to_keyframes`),
+    so every chunk starts on a scene change and can be encoded as a closed GOP.
+    Boundaries are picked so that the estimated cost of every chunk is as close as possible
+    to an even share of the total cost, rather than an even share of the frame count.
+
+    :param wobbly_parsed:   The parsed wobbly file.
+    :param strategies:      The strategies that will be used during processing.
+                            Used to determine which frames are expensive to render.
+    :param num_chunks:      The number of chunks to aim for. Fewer chunks may be returned
+                            if there are not enough sections to split on.
+                            Default: the number of logical CPUs.
+    :param weights:         The per-frame cost weights. Default: `ChunkCostWeights()`.
+    :param num_frames:      The number of input frames. Default: the number of field matches.
+
+    :return:                A list of chunks covering the entire output clip, in order.
+    """
+
+    weights = weights or ChunkCostWeights()
+    num_chunks = num_chunks or cpu_count() or 1
+
+    if num_chunks < 1:
+        raise CustomValueError(f'Number of chunks must be at least 1, not {num_chunks}!', plan_chunks)
+
+    costs = _output_frame_costs(wobbly_parsed, strategies, weights, num_frames)
+
+    if not costs:
+        return []
+
+    prefix = list(accumulate(costs, initial=0.0))
+    total = prefix[-1]
+
+    keyframes = sorted(
+        {kf for kf in wobbly_parsed.sections.to_keyframes(wobbly_parsed.decimations) if 0 < kf < len(costs)}
+    )
+    keyframe_costs = [prefix[kf] for kf in keyframes]
+
+    cuts = list[int]()
+
+    for i in range(1, num_chunks):
+        target = total * i / num_chunks
+        idx = bisect_right(keyframe_costs, target)
+
+        # Pick whichever neighbouring section start lands closest to the target cost.
+        candidates = [j for j in (idx - 1, idx) if 0 <= j < len(keyframes)]
+
+        if not candidates:
+            break
+
+        best = keyframes[min(candidates, key=lambda j: abs(keyframe_costs[j] - target))]
+
+        if not cuts or best > cuts[-1]:
+            cuts.append(best)
+
+    bounds = [0, *cuts, len(costs)]
+
+    return [RenderChunk(start, end - 1, prefix[end] - prefix[start]) for start, end in pairwise(bounds)]
+
+
+def _output_frame_costs(
+    wobbly_parsed: WobblyParser, strategies: Sequence[Any], weights: ChunkCostWeights, num_frames: int | None
+) -> list[float]:
+    """Estimate the cost of every output frame."""
+
+    num_frames = num_frames if num_frames is not None else len(wobbly_parsed.field_matches)
+
+    costs = [weights.base] * num_frames
+
+    def _add(frames: Any, cost: float, target: list[float]) -> None:
+        for frame in frames:
+            if 0 <= frame < len(target):
+                target[frame] += cost
+
+    if _uses_strategy(strategies, 'orphans', 'MatchBasedOrphanQTGMCStrategy'):
+        _add(wobbly_parsed.orphan_frames.frames, weights.orphan, costs)
+
+    if _uses_strategy(strategies, 'combed', 'DecombVinverseStrategy'):
+        _add(wobbly_parsed.combed_frames, weights.combed, costs)
+
+    if _uses_strategy(strategies, 'ifades', 'AverageFixInterlacedFadesStrategy', 'AdaptiveFixInterlacedFadesStrategy'):
+        _add((fade.frame for fade in wobbly_parsed.interlaced_fades), weights.fade, costs)
+
+    post_decimate = list[tuple[int, int, float]]()
+
+    for custom_list in wobbly_parsed.custom_lists:
+        cost = weights.preset_cost(getattr(custom_list.preset, 'name', str(custom_list.preset)))
+
+        for frame_range in custom_list.frames:
+            first, last = frame_range if isinstance(frame_range, tuple) else (frame_range, frame_range)
+
+            if custom_list.position is FilteringPositionEnum.POST_DECIMATE:
+                # Shifted to output frame numbers the same way `CustomList.apply` does.
+                first -= wobbly_parsed.decimations.count_before(first)
+                last -= wobbly_parsed.decimations.count_before(last + 1)
+
+                if first <= last:
+                    post_decimate.append((first, last, cost))
+
+                continue
+
+            _add(range(max(first, 0), min(last, num_frames - 1) + 1), cost, costs)
+
+    decimations = set(wobbly_parsed.decimations)
+    out_costs = [cost for frame, cost in enumerate(costs) if frame not in decimations]
+
+    for first, last, cost in post_decimate:
+        _add(range(max(first, 0), min(last, len(out_costs) - 1) + 1), cost, out_costs)
+
+    return out_costs
+
+
+def _uses_strategy(strategies: Sequence[Any], module: str, *names: str) -> bool:
+    """
+    Whether any of the strategies (or strategy classes) is one of the named strategies of a strategies module.
+
+    The strategy modules are imported lazily, so if a module was never imported, none of its strategies are in use.
+    """
+
+    if (strategies_module := sys.modules.get(f'{__package__}.strategies.{module}')) is None:
+        return False
+
+    classes = tuple(getattr(strategies_module, name) for name in names)
+
+    for strategy in strategies:
+        strategy = getattr(strategy, 'strategy', strategy)
+
+        if isinstance(strategy, classes) or (isinstance(strategy, type) and issubclass(strategy, classes)):
+            return True
+
+    return False
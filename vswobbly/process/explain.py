@@ -0,0 +1,224 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from jetpytools import CustomValueError
+from vstools import vs
+
+from ..util import can_walk_graph, iter_graph_nodes
+
+__all__ = [
+    'ComponentReport',
+    'GraphExplainer',
+    'GraphReport',
+    'StageReport',
+]
+
+
+_CALLBACK_FILTERS = frozenset({'FrameEval', 'ModifyFrame'})
+"""Filters that call back into Python for every frame."""
+
+
+@dataclass
+class ComponentReport:
+    """Graph statistics for a single component or strategy."""
+
+    name: str
+    """The name of the component or strategy."""
+
+    stage: str
+    """The stage the component was applied in."""
+
+    build_time: float = 0.0
+    """Time spent building the component's part of the graph, in seconds."""
+
+    nodes: int | None = None
+    """The number of nodes the component added to the graph. None if the graph can't be inspected."""
+
+    callback_nodes: int | None = None
+    """The number of Python callback nodes (`FrameEval`, `ModifyFrame`) the component added to the graph."""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+
+        return {
+            'name': self.name,
+            'stage': self.stage,
+            'build_time': self.build_time,
+            'nodes': self.nodes,
+            'callback_nodes': self.callback_nodes,
+        }
+
+
+@dataclass
+class StageReport(ComponentReport):
+    """Graph statistics for a single processing stage, e.g. `apply_post_source`."""
+
+    components: list[ComponentReport] = field(default_factory=list)
+    """The components and strategies applied during this stage, in order."""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+
+        return super().to_dict() | {'components': [component.to_dict() for component in self.components]}
+
+
+@dataclass
+class GraphReport:
+    """Graph size and build time of a `WobblyProcessor.apply` call."""
+
+    stages: list[StageReport]
+    """Per-stage statistics, in processing order."""
+
+    @property
+    def build_time(self) -> float:
+        """The total time spent building the graph, in seconds."""
+
+        return sum(stage.build_time for stage in self.stages)
+
+    @property
+    def nodes(self) -> int | None:
+        """The total number of nodes in the graph. None if the graph can't be inspected."""
+
+        return None if any(stage.nodes is None for stage in self.stages) else sum(s.nodes or 0 for s in self.stages)
+
+    @property
+    def callback_nodes(self) -> int | None:
+        """The total number of Python callback nodes in the graph. None if the graph can't be inspected."""
+
+        if any(stage.callback_nodes is None for stage in self.stages):
+            return None
+
+        return sum(stage.callback_nodes or 0 for stage in self.stages)
+
+    @property
+    def components(self) -> list[ComponentReport]:
+        """All components of all stages, in processing order."""
+
+        return [component for stage in self.stages for component in stage.components]
+
+    def largest(self, count: int = 10) -> list[ComponentReport]:
+        """Get the components that contribute the most nodes to the graph, or the most build time if unknown."""
+
+        return sorted(
+            self.components, key=lambda c: (c.nodes if c.nodes is not None else -1, c.build_time), reverse=True
+        )[:count]
+
+    def check(
+        self,
+        max_nodes: int | None = None,
+        max_callback_nodes: int | None = None,
+        max_build_time: float | None = None,
+    ) -> None:
+        """
+        Raise an error if the graph exceeds any of the given limits. Useful as a regression guard.
+
+        :param max_nodes:               Maximum number of nodes in the graph.
+        :param max_callback_nodes:      Maximum number of Python callback nodes in the graph.
+        :param max_build_time:          Maximum time spent building the graph, in seconds.
+
+        :raises CustomValueError:       A limit was exceeded, or a node limit was given but nodes can't be counted.
+        """
+
+        exceeded = list[str]()
+
+        for name, value, limit in (
+            ('nodes', self.nodes, max_nodes),
+            ('callback nodes', self.callback_nodes, max_callback_nodes),
+            ('build time', self.build_time, max_build_time),
+        ):
+            if limit is None:
+                continue
+
+            if value is None:
+                raise CustomValueError(f'Cannot check {name}: the graph cannot be inspected!', self.check)
+
+            if value > limit:
+                exceeded.append(f'{name}: {value} > {limit}')
+
+        if exceeded:
+            largest = ', '.join(f'{c.name} ({c.nodes} nodes, {c.build_time:.3f}s)' for c in self.largest(5))
+
+            raise CustomValueError(f'Graph limits exceeded ({"; ".join(exceeded)}). Largest: {largest}', self.check)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+
+        return {
+            'build_time': self.build_time,
+            'nodes': self.nodes,
+            'callback_nodes': self.callback_nodes,
+            'stages': [stage.to_dict() for stage in self.stages],
+            'largest': [component.to_dict() for component in self.largest()],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Return the report as a JSON string. Keyword arguments are passed to `json.dumps`."""
+
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class GraphExplainer:
+    """
+    Records the graph growth and build time of every stage and component of `WobblyProcessor.apply`.
+
+    The graph is walked incrementally, so every node is only visited once over the entire build.
+    Use `WobblyProcessor.explain` rather than using this class directly.
+    """
+
+    def __init__(self) -> None:
+        self._inspectable = can_walk_graph()
+        self._seen = dict[vs.RawNode, None]()
+        self._stages = list[StageReport]()
+
+    def start(self, clip: vs.VideoNode) -> None:
+        """Mark the nodes of the input clip as already seen."""
+
+        self._count(clip)
+
+    def stage(self, name: str) -> StageReport:
+        """Start a new stage. Subsequent components are recorded under it."""
+
+        self._stages.append(report := StageReport(name, name))
+
+        return report
+
+    def end_stage(self, clip: vs.VideoNode, build_time: float) -> None:
+        """Finish the current stage, counting any nodes not attributed to a component."""
+
+        stage = self._stages[-1]
+        stage.build_time = build_time
+
+        nodes, callbacks = self._count(clip)
+
+        if nodes is None:
+            return
+
+        stage.nodes = nodes + sum(c.nodes or 0 for c in stage.components)
+        stage.callback_nodes = (callbacks or 0) + sum(c.callback_nodes or 0 for c in stage.components)
+
+    def record(self, name: str, clip: vs.VideoNode, build_time: float) -> None:
+        """Record a component of the current stage, given its output clip and the time it took to build."""
+
+        nodes, callbacks = self._count(clip)
+
+        self._stages[-1].components.append(ComponentReport(name, self._stages[-1].name, build_time, nodes, callbacks))
+
+    def report(self) -> GraphReport:
+        """Get the report of all recorded stages."""
+
+        return GraphReport(self._stages)
+
+    def _count(self, clip: vs.VideoNode) -> tuple[int | None, int | None]:
+        """Count the nodes that weren't seen yet."""
+
+        if not self._inspectable:
+            return None, None
+
+        nodes = callbacks = 0
+
+        for node in iter_graph_nodes(clip, self._seen):
+            nodes += 1
+            callbacks += getattr(node, '_name', None) in _CALLBACK_FILTERS
+
+        return nodes, callbacks
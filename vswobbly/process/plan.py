@@ -0,0 +1,140 @@
+from copy import copy, deepcopy
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from vstools import vs
+
+from ..components import CustomList
+from ..data.parse import WobblyParser
+from ..types import FilteringPositionEnum, OutputSettingsEnum, PluginBackendEnum
+from .strategies.abstract import AbstractProcessingStrategy
+
+if TYPE_CHECKING:
+    from .processor import WobblyProcessor
+
+__all__ = [
+    'WobblyPlan',
+]
+
+
+_PARSER_COMPONENTS = (
+    'sections',
+    'field_matches',
+    'decimations',
+    'presets',
+    'custom_lists',
+    'freeze_frames',
+    'interlaced_fades',
+    'combed_frames',
+    'orphan_frames',
+)
+
+
+@dataclass(frozen=True)
+class WobblyPlan:
+    """
+    An immutable processing plan, compiled from a parser and its strategies.
+
+    The plan holds a private snapshot of every frame table of the wobbly file,
+    the results of every strategy's analysis (e.g. which orphan fields to deinterlace),
+    and the frame ranges of every custom list, resolved to the frames at its position.
+    Applying it never modifies the plan, and never repeats any analysis,
+    so a single plan can be applied to many clips (e.g. several encodes of the same source, or a proxy),
+    from multiple threads at once.
+
+    Use `WobblyProcessor.compile` to create a plan.
+    """
+
+    parser: WobblyParser
+    """A snapshot of the parsed wobbly data. This must not be modified."""
+
+    strategies: tuple[AbstractProcessingStrategy, ...]
+    """The strategies to apply. Every `apply` call works on copies of these."""
+
+    strategy_states: tuple[dict[str, Any], ...]
+    """The exported state of every strategy, in order. See `AbstractProcessingStrategy.export_state`."""
+
+    backend: PluginBackendEnum = PluginBackendEnum.NATIVE
+    """The implementation to use for field matching."""
+
+    output_settings: OutputSettingsEnum = OutputSettingsEnum.IGNORE
+    """Whether and where to apply the crop, resize and bit depth settings of the wobbly file."""
+
+    custom_list_ranges: tuple[tuple[int, list[Any]], ...] = ()
+    """
+    The number of frames at every custom list's position, and its ranges resolved for it, in order.
+    See `CustomList.resolve_ranges`.
+    """
+
+    @classmethod
+    def from_processor(cls, processor: 'WobblyProcessor') -> 'WobblyPlan':
+        """
+        Snapshot a processor's parser and strategies.
+
+        Strategies should have performed their analysis before calling this, by building the graph once.
+
+        :param processor:       The processor to snapshot.
+
+        :return:                The compiled plan.
+        """
+
+        parser = copy(processor.parser)
+
+        for name in _PARSER_COMPONENTS:
+            setattr(parser, name, deepcopy(getattr(parser, name)))
+
+        # Build the lookups that are otherwise built on first use, so applying the plan only reads the snapshot.
+        parser.orphan_frames._index()
+
+        strategies = tuple(
+            strategy() if isinstance(strategy, type) else strategy for strategy in (processor.strategies or [])
+        )
+
+        return cls(
+            parser,
+            tuple(copy(strategy) for strategy in strategies),
+            tuple(strategy.export_state() for strategy in strategies),
+            processor.backend,
+            processor.output_settings,
+            tuple(_resolve_ranges(custom_list, parser) for custom_list in parser.custom_lists),
+        )
+
+    def apply(self, clip: vs.VideoNode | None = None) -> vs.VideoNode:
+        """
+        Apply the plan to a clip. This is safe to call from multiple threads.
+
+        :param clip:        The clip to process. It must match the wobbly file's source (before trimming).
+                            Default: the parser's work clip.
+
+        :return:            The processed clip.
+        """
+
+        from .processor import WobblyProcessor
+
+        # The work clip is indexed on a copy, so applying the plan never writes to the snapshot.
+        parser = copy(self.parser)
+        parser.video_data = copy(parser.video_data)
+
+        strategies = list[AbstractProcessingStrategy]()
+
+        for strategy, state in zip(self.strategies, self.strategy_states):
+            strategies.append(strategy := copy(strategy))
+            strategy.import_state(state)
+
+        processor = WobblyProcessor(
+            parser, strategies=strategies, backend=self.backend, output_settings=self.output_settings
+        )
+        processor._custom_list_ranges = self.custom_list_ranges
+
+        return processor.apply(clip)
+
+
+def _resolve_ranges(custom_list: CustomList, parser: WobblyParser) -> tuple[int, list[Any]]:
+    """Resolve the ranges of a custom list for the number of frames at its position."""
+
+    num_frames = len(parser.field_matches)
+
+    if custom_list.position is FilteringPositionEnum.POST_DECIMATE:
+        num_frames -= len(parser.decimations)
+
+    return num_frames, custom_list.resolve_ranges(parser.decimations, num_frames)
@@ -1,14 +1,25 @@
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Self
+from time import perf_counter
+from typing import Any, Self
 
-from jetpytools import SPathLike
-from vstools import FieldBased, vs
+from jetpytools import CustomRuntimeError, CustomValueError, SPathLike
+from vstools import FieldBased, VSFunctionNoArgs, vs
 
+from vswobbly.components import Crop, FieldMatches
 from vswobbly.data.parse import WobblyParser
-from vswobbly.types import FilteringPositionEnum
-
+from vswobbly.types import FilteringPositionEnum, OutputSettingsEnum, PluginBackendEnum
+
+from .cache import DiskFrameCache, PreviewCache
+from .checkpoint import RenderCheckpoint, render_resumable
+from .chunks import ChunkCostWeights, RenderChunk, _uses_strategy, plan_chunks
+from .explain import GraphExplainer, GraphReport
+from .plan import WobblyPlan
+from .profiling import FrameRequestCounter, StrategyProfiler
+from .render import RenderReport, render_parallel
 from .strategies.abstract import AbstractProcessingStrategy
 from .strategies.base import ProcessingStrategyManager
+from .strategies.cached import CachedStrategy
 
 __all__ = ['WobblyProcessor']
 
@@ -17,8 +28,11 @@ __all__ = ['WobblyProcessor']
 class WobblyProcessor(ProcessingStrategyManager):
     """Class for processing a videonode using the data parsed from a wobbly file."""
 
-    work_clip: vs.VideoNode
-    """The videonode to process."""
+    work_clip: vs.VideoNode | None
+    """
+    The videonode to process.
+    If None, the parser's work clip is used, which only indexes the source once the processing is applied.
+    """
 
     parser: WobblyParser
     """The parsed wobbly data."""
@@ -31,18 +45,59 @@ class WobblyProcessor(ProcessingStrategyManager):
     See the `AbstractProcessingStrategy` class for more information.
     """
 
+    profiler: StrategyProfiler | None = None
+    """
+    Optional profiler that collects build and render statistics for every strategy and custom list.
+    See the `StrategyProfiler` class for more information.
+    """
+
+    backend: PluginBackendEnum = PluginBackendEnum.NATIVE
+    """
+    The implementation to use for field matching.
+    See the `PluginBackendEnum` class for more information.
+    """
+
+    output_settings: OutputSettingsEnum = OutputSettingsEnum.IGNORE
+    """
+    Whether and where to apply the crop, resize and bit depth settings of the wobbly file.
+    See the `OutputSettingsEnum` class for more information.
+    """
+
+    frame_cache: DiskFrameCache | None = None
+    """
+    Optional disk cache to store the output of every custom list in.
+    Wrap strategies in a `CachedStrategy` to cache their output as well.
+    See the `DiskFrameCache` class for more information.
+    """
+
+    frame_cache_salt: str = ''
+    """Anything else the output of the custom lists depends on. See `CachedStrategy`."""
+
     def __init__(
         self,
         parser: WobblyParser,
         work_clip: vs.VideoNode | None = None,
         strategies: list[AbstractProcessingStrategy] = [],
+        profiler: StrategyProfiler | None = None,
+        backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+        output_settings: OutputSettingsEnum | str = OutputSettingsEnum.IGNORE,
+        frame_cache: DiskFrameCache | None = None,
+        frame_cache_salt: str = '',
     ) -> None:
-        if work_clip is None:
-            work_clip = parser.work_clip
-
         self.work_clip = work_clip
         self.parser = parser
         self.strategies = strategies
+        self.profiler = profiler
+        self.backend = PluginBackendEnum(backend)
+        self.output_settings = OutputSettingsEnum(output_settings)
+        self.frame_cache = frame_cache
+        self.frame_cache_salt = frame_cache_salt
+        self._input_signature: str | None = None
+        self._custom_list_ranges: tuple[tuple[int, list[Any]] | None, ...] = ()
+        self._explainer: GraphExplainer | None = None
+        self._source_crop: Crop | None = None
+        self._early_crop: Crop | None = None
+        self._late_crop: Crop | None = None
 
     def __post_init__(self) -> None:
         if not isinstance(self.strategies, list):
@@ -53,12 +108,24 @@ class WobblyProcessor(ProcessingStrategyManager):
         cls,
         wobbly_filepath: SPathLike,
         strategies: list[AbstractProcessingStrategy] | None = None,
+        profiler: StrategyProfiler | None = None,
+        source_filter: VSFunctionNoArgs | None = None,
+        backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+        output_settings: OutputSettingsEnum | str = OutputSettingsEnum.IGNORE,
+        source_filter_kwargs: dict[str, Any] | None = None,
+        frame_cache: DiskFrameCache | None = None,
+        frame_cache_salt: str = '',
     ) -> Self:
-        """Create a processor from a wobbly file."""
+        """Create a processor from a wobbly file. See `WobblyParser.from_file` for the source filter arguments."""
 
         return cls(
-            WobblyParser.from_file(wobbly_filepath),
+            WobblyParser.from_file(wobbly_filepath, source_filter, source_filter_kwargs),
             strategies=strategies,
+            profiler=profiler,
+            backend=backend,
+            output_settings=output_settings,
+            frame_cache=frame_cache,
+            frame_cache_salt=frame_cache_salt,
         )
 
     def apply(self, clip: vs.VideoNode | None = None) -> vs.VideoNode:
@@ -73,37 +140,290 @@ class WobblyProcessor(ProcessingStrategyManager):
 
         return self.proc_clip
 
+    def preview(self, max_bytes: int = 1 << 30, prefetch_before: int = 2, prefetch_after: int = 8) -> PreviewCache:
+        """
+        Apply the wobbly processing, and cache the output in memory for interactive previewing.
+
+        See the `PreviewCache` class for more information.
+
+        :param max_bytes:           The maximum total size of the cached frames, in bytes. Default: 1 GiB.
+        :param prefetch_before:     The number of frames before every requested frame to render in the background.
+        :param prefetch_after:      The number of frames after every requested frame to render in the background.
+
+        :return:                    The preview cache of the processed clip.
+        """
+
+        return PreviewCache(self.apply(), max_bytes, prefetch_before, prefetch_after)
+
+    def explain(self, clip: vs.VideoNode | None = None) -> GraphReport:
+        """
+        Build the processing graph, and report how much every stage and component contributes to it.
+
+        The report contains the number of nodes and Python callback nodes, and the build time,
+        of every stage (`apply_post_source`, `apply_post_field_match`, etc.),
+        and of every component and strategy within those stages.
+        Node counts are only available if the VapourSynth version supports graph inspection.
+
+        No frames are rendered by this method (unless a strategy requests them while building),
+        so it's cheap enough to use as a regression guard. See `GraphReport.check`.
+
+        :param clip:        The clip to process. Default: the processor's work clip.
+
+        :return:            The graph report.
+        """
+
+        self._explainer = explainer = GraphExplainer()
+
+        try:
+            self._init_process(clip)
+
+            explainer.start(self.proc_clip)
+
+            for stage in (
+                self.apply_post_source,
+                self.apply_post_field_match,
+                self.apply_pre_decimation,
+                self.apply_post_decimation,
+            ):
+                explainer.stage(stage.__name__)
+
+                start = perf_counter()
+                stage()
+
+                explainer.end_stage(self.proc_clip, perf_counter() - start)
+        finally:
+            self._explainer = None
+
+        return explainer.report()
+
+    def compile(self, clip: vs.VideoNode | None = None) -> WobblyPlan:
+        """
+        Compile the parser and strategies into an immutable plan.
+
+        Strategies that analyse frames (see `AbstractProcessingStrategy.requests_frames`)
+        do so once here, and their results are stored in the plan.
+        The plan can then be applied to many clips, from multiple threads, without re-analysis or re-parsing.
+
+        :param clip:        The clip to run the analysis on. Default: the processor's work clip.
+
+        :return:            The compiled plan.
+        """
+
+        self.strategies = [
+            strategy() if isinstance(strategy, type) else strategy for strategy in (self.strategies or [])
+        ]
+
+        if any(strategy.requests_frames for strategy in self.strategies):
+            self.apply(clip)
+
+        return WobblyPlan.from_processor(self)
+
+    def count_frame_requests(self, clip: vs.VideoNode | None = None, strict: bool = False) -> FrameRequestCounter:
+        """
+        Build the processing graph, and count the frames requested from the source clip while building it.
+
+        Building the graph is guaranteed to request no frames, unless a strategy opts in
+        through `AbstractProcessingStrategy.requests_frames`.
+
+        :param clip:        The clip to process. Default: the processor's work clip.
+        :param strict:      Raise an error if frames were requested, but no strategy opted in to requesting them.
+
+        :raises CustomRuntimeError:     Frames were requested while building the graph in strict mode.
+
+        :return:            The counter, holding the frames requested during the build.
+        """
+
+        counter = FrameRequestCounter()
+
+        self.apply(counter.wrap(self._resolve_clip(clip)))
+
+        opted_in = any(getattr(strategy, 'requests_frames', False) for strategy in self._strategies)
+
+        if strict and counter.count and not opted_in:
+            raise CustomRuntimeError(
+                f'{counter.count} frames were requested while building the graph: {counter.frames[:10]}',
+                self.count_frame_requests,
+            )
+
+        return counter
+
+    def plan_chunks(self, num_chunks: int | None = None, weights: ChunkCostWeights | None = None) -> list[RenderChunk]:
+        """
+        Propose output frame ranges that can be rendered (and encoded) in parallel.
+
+        Chunks always start on a section start, and are balanced by their estimated render cost.
+        See `plan_chunks` for more information.
+
+        :param num_chunks:      The number of chunks to aim for. Default: the number of logical CPUs.
+        :param weights:         The per-frame cost weights. Default: `ChunkCostWeights()`.
+
+        :return:                A list of chunks covering the entire output clip, in order.
+        """
+
+        return plan_chunks(self.parser, self.strategies or [], num_chunks, weights)
+
+    def render_parallel(
+        self,
+        output_dir: SPathLike,
+        workers: int | None = None,
+        chunks: list[RenderChunk] | None = None,
+        threads_per_worker: int | None = None,
+        y4m: bool = True,
+    ) -> RenderReport:
+        """
+        Render the processed output with multiple worker processes, one file per chunk.
+
+        Each worker receives a clip-free copy of the parsed wobbly data, and rebuilds the processing graph from it,
+        using the processor's backend, output settings, frame cache and profiler, so the output matches `apply`.
+        Strategies that analyse frames do so once in this process (see `compile`), and the workers reuse the results.
+        Use `RenderReport.manifest` to stitch the chunks back together in order.
+        See `render_parallel` for more information.
+
+        :param output_dir:          The directory to write the chunk files and the manifest to.
+        :param workers:             The number of worker processes. Default: the number of logical CPUs.
+        :param chunks:              The chunks to render. Default: `plan_chunks`, using four chunks per worker.
+        :param threads_per_worker:  The number of VapourSynth threads per worker. Default: VapourSynth's default.
+        :param y4m:                 Whether to write YUV4MPEG2 files. Otherwise, raw planar frames are written.
+
+        :return:                    A report containing the manifest and per-worker throughput.
+        """
+
+        if self.work_clip is not None and self.work_clip is not self.parser.work_clip:
+            raise CustomValueError(
+                'Parallel rendering rebuilds the graph from the wobbly file, so a custom work clip is not supported!',
+                self.render_parallel,
+            )
+
+        if chunks is None:
+            chunks = self.plan_chunks(workers * 4 if workers else None)
+
+        plan = self.compile()
+
+        return render_parallel(
+            plan.parser,
+            chunks,
+            output_dir,
+            plan.strategies,
+            workers,
+            threads_per_worker,
+            y4m,
+            backend=plan.backend,
+            output_settings=plan.output_settings,
+            strategy_states=plan.strategy_states,
+            frame_cache=self.frame_cache,
+            frame_cache_salt=self.frame_cache_salt,
+            profiler=self.profiler,
+        )
+
+    def render_resumable(
+        self,
+        output: SPathLike,
+        checkpoint: SPathLike | None = None,
+        chunk_size: int = 1000,
+        y4m: bool = True,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> RenderCheckpoint:
+        """
+        Render the processed output to a file, and continue where a previous render left off.
+
+        A checkpoint is written after every chunk, containing the completed frame ranges,
+        the output file offset, the strategy analysis results, and a fingerprint of the wobbly file, strategies,
+        settings and input clip.
+        See `render_resumable` for more information.
+
+        :param output:          The path of the file to render to.
+        :param checkpoint:      The path of the checkpoint file. Default: the output path with `.ckpt.json` appended.
+        :param chunk_size:      The number of frames to render between checkpoints.
+        :param y4m:             Whether to write a YUV4MPEG2 file. Otherwise, raw planar frames are written.
+        :param progress:        Callback receiving the number of rendered frames and the total number of frames.
+
+        :return:                The final checkpoint.
+        """
+
+        return render_resumable(self, output, checkpoint, chunk_size, y4m, progress)
+
     def _init_process(self, clip: vs.VideoNode | None = None) -> None:
         """Initialize the process."""
 
-        self.proc_clip = clip or self.parser.work_clip
+        self.proc_clip = self._resolve_clip(clip)
+
+        # The wobbly file's source is identified by the parser, other clips only by the clip object.
+        self._input_signature = (
+            None if self.proc_clip is self.parser._work_clip else CachedStrategy.clip_signature(self.proc_clip)
+        )
 
         if self.parser.video_data.trim:
             self.proc_clip = self.proc_clip.std.Trim(self.parser.video_data.trim[0], self.parser.video_data.trim[1])
 
-        self.init_strategies(self.parser, self.strategies)
+        self.init_strategies(
+            self.parser,
+            self.strategies,
+            self._custom_list_ranges,
+            self.frame_cache,
+            self.frame_cache_salt,
+            (str(self.backend), str(self.output_settings), self._input_signature),
+        )
+
+        crop = self.parser.crop if self.output_settings is not OutputSettingsEnum.IGNORE else None
+        self._source_crop = self._early_crop = self._late_crop = None
+
+        if crop and crop.early:
+            # Wobbly itself crops the source before field matching if the crop is set to early, so do the same.
+            self._source_crop = crop
+        elif crop and self.output_settings is OutputSettingsEnum.EARLY:
+            self._early_crop, self._late_crop = crop.split(self.proc_clip)
+        else:
+            self._late_crop = crop
+
+    def _resolve_clip(self, clip: vs.VideoNode | None = None) -> vs.VideoNode:
+        """Get the clip to process: the given clip, the processor's work clip, or else the parser's work clip."""
+
+        if clip is not None:
+            return clip
+
+        if self.work_clip is not None:
+            return self.work_clip
+
+        return self.parser.work_clip
 
     def apply_post_source(self) -> None:
         """Post-source filtering, followed by field matching."""
 
-        self.apply_strategies_of_position(FilteringPositionEnum.POST_SOURCE)
+        if self._source_crop:
+            self._apply_component('source crop', self._source_crop.apply)
+
+        self.apply_strategies_of_position(FilteringPositionEnum.POST_SOURCE, self.profiler, self._explainer)
+
+        field_matches = self.parser.field_matches
 
         # This must be run here to ensure the matches are set to 'c' correctly prior to deinterlacing.
-        if any('orphan' in str(strategy).lower() for strategy in (self.strategies or [])):
-            self.parser.field_matches.set_orphans_to_combed_matches(self.parser.orphan_frames)
+        # A copy is modified, so the parser can safely back multiple processors.
+        if _uses_strategy(self.strategies or [], 'orphans', 'MatchBasedOrphanQTGMCStrategy'):
+            field_matches = FieldMatches(field_matches)
+            field_matches.set_orphans_to_combed_matches(self.parser.orphan_frames)
+
+        self.parser.sections.set_patterns(field_matches)
+        self._apply_component('sections', self.parser.sections.set_props, wobbly_parsed=self.parser)
+        self._apply_component('combed frames', self.parser.combed_frames.set_props)
+        self._apply_component('interlaced fades', self.parser.interlaced_fades.set_props)
+        self._apply_component('orphan frames', self.parser.orphan_frames.set_props)
+        self._apply_component(
+            'field matches',
+            field_matches.apply,
+            tff=FieldBased.from_param(self.parser.field_order, self.apply).is_tff,
+            backend=self.backend,
+        )
 
-        self.parser.sections.set_patterns(self.parser.field_matches)
-        self.proc_clip = self.parser.sections.set_props(self.proc_clip, wobbly_parsed=self.parser)
-        self.proc_clip = self.parser.combed_frames.set_props(self.proc_clip)
-        self.proc_clip = self.parser.interlaced_fades.set_props(self.proc_clip)
-        self.proc_clip = self.parser.orphan_frames.set_props(self.proc_clip)
-        self.proc_clip = self.parser.field_matches.apply(self.proc_clip)
+        # Everything after field matching works on whole frames, so cropping here is safe,
+        # and saves every strategy, preset and custom list from processing the borders.
+        if self._early_crop:
+            self._apply_component('early crop', self._early_crop.apply)
 
     def apply_post_field_match(self) -> None:
         """Post-field matching filtering."""
 
-        self.apply_strategies_of_position(FilteringPositionEnum.POST_FIELD_MATCH)
-        self.proc_clip = self.parser.freeze_frames.apply(self.proc_clip)
+        self.apply_strategies_of_position(FilteringPositionEnum.POST_FIELD_MATCH, self.profiler, self._explainer)
+        self._apply_component('freeze frames', self.parser.freeze_frames.apply)
 
     def apply_pre_decimation(self) -> None:
         """
@@ -111,11 +431,33 @@ class WobblyProcessor(ProcessingStrategyManager):
         because that's how presets work in wobbly. This is followed by decimation.
         """
 
-        self.apply_strategies_of_position(FilteringPositionEnum.PRE_DECIMATE)
-        self.proc_clip = self.parser.decimations.apply(self.proc_clip)
+        self.apply_strategies_of_position(FilteringPositionEnum.PRE_DECIMATE, self.profiler, self._explainer)
+        self._apply_component('decimations', self.parser.decimations.apply)
 
     def apply_post_decimation(self) -> None:
         """Post-decimation filtering."""
 
-        self.apply_strategies_of_position(FilteringPositionEnum.POST_DECIMATE)
-        self.proc_clip = FieldBased.PROGRESSIVE.apply(self.proc_clip)
+        self.apply_strategies_of_position(FilteringPositionEnum.POST_DECIMATE, self.profiler, self._explainer)
+        self._apply_component('field based', FieldBased.PROGRESSIVE.apply)
+
+        if self.output_settings is OutputSettingsEnum.IGNORE:
+            return
+
+        if self._late_crop:
+            self._apply_component('crop', self._late_crop.apply)
+
+        if self.parser.resize is not None:
+            self._apply_component('resize', self.parser.resize.apply)
+
+        if self.parser.depth is not None:
+            self._apply_component('depth', self.parser.depth.apply)
+
+    def _apply_component(self, name: str, func: Callable[..., vs.VideoNode], **kwargs: Any) -> None:
+        """Apply a component to the processed clip, recording it if the graph is being explained."""
+
+        start = perf_counter()
+
+        self.proc_clip = func(self.proc_clip, **kwargs)
+
+        if self._explainer is not None:
+            self._explainer.record(name, self.proc_clip, perf_counter() - start)
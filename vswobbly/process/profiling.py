@@ -0,0 +1,304 @@
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from time import perf_counter
+from typing import Any, Literal
+
+from jetpytools import CustomValueError
+from vstools import vs
+
+from ..data.parse import WobblyParser
+from ..types import FilteringPositionEnum
+from ..util import can_walk_graph, iter_graph_nodes
+from .strategies.abstract import AbstractProcessingStrategy
+from .strategies.custom_lists import CustomListStrategy
+
+__all__ = [
+    'FrameRequestCounter',
+    'StrategyProfiler',
+    'StrategyStats',
+]
+
+
+@dataclass
+class StrategyStats:
+    """Render statistics for the output of a single strategy."""
+
+    name: str
+    """The name of the strategy, or the custom list and its preset."""
+
+    position: FilteringPositionEnum
+    """When the strategy was applied."""
+
+    preset: str | None = None
+    """The preset applied by the strategy, if it's a custom list."""
+
+    build_time: float = 0.0
+    """Time spent building the strategy's part of the graph, in seconds."""
+
+    frames: int = 0
+    """The number of frames served by the strategy's output node."""
+
+    render_time: float = 0.0
+    """Cumulative time spent rendering frames in the strategy's part of the graph, in seconds."""
+
+    @property
+    def mean_render_time(self) -> float:
+        """The mean render time per served frame, in seconds."""
+
+        return self.render_time / self.frames if self.frames else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics as a JSON-serializable dictionary."""
+
+        return {
+            'name': self.name,
+            'position': str(self.position),
+            'preset': self.preset,
+            'build_time': self.build_time,
+            'frames': self.frames,
+            'render_time': self.render_time,
+            'mean_render_time': self.mean_render_time,
+        }
+
+
+@dataclass
+class _Probe:
+    """Bookkeeping for a single profiled strategy."""
+
+    stats: StrategyStats
+    input_node: vs.VideoNode | None = None
+    output_node: vs.VideoNode | None = None
+    arrivals: dict[int, float] = field(default_factory=dict)
+
+
+class StrategyProfiler:
+    """
+    Collect per-strategy build and render statistics while processing.
+
+    Pass an instance to `WobblyProcessor` to wrap the output of every strategy and custom list.
+    After rendering, `report` returns the statistics per strategy and per preset.
+
+    Render times are measured with VapourSynth's node timings if they are available,
+    and attributed to a strategy by summing the filter time of every node that strategy added to the graph.
+    Otherwise, render times are measured with frame callbacks around each strategy.
+    This measures the wall time between a frame arriving at the strategy's input and leaving its output,
+    which includes time spent waiting on other threads.
+
+    Profiling adds callbacks to the graph, so it should not be used for final renders.
+    """
+
+    def __init__(self, mode: Literal['auto', 'timings', 'callbacks'] = 'auto') -> None:
+        """
+        :param mode:    How to measure render times.
+                        "timings" uses VapourSynth's node timings, and raises an error if they're unavailable.
+                        "callbacks" always uses frame callbacks. "auto" picks node timings if available.
+
+                        Default: "auto".
+        """
+
+        if mode not in ('auto', 'timings', 'callbacks'):
+            raise CustomValueError(f'Invalid profiling mode: {mode}', self.__class__)
+
+        self._probes = list[_Probe]()
+        self._merged = list[StrategyStats]()
+        self._use_timings = mode != 'callbacks' and self._enable_node_timings()
+
+        if mode == 'timings' and not self._use_timings:
+            raise CustomValueError('Node timings are not supported by this VapourSynth version!', self.__class__)
+
+    @property
+    def uses_node_timings(self) -> bool:
+        """Whether render times are measured using VapourSynth's node timings."""
+
+        return self._use_timings
+
+    def profile(
+        self,
+        strategy: AbstractProcessingStrategy,
+        clip: vs.VideoNode,
+        wobbly_parsed: WobblyParser,
+    ) -> vs.VideoNode:
+        """
+        Apply a strategy to a clip, and wrap its output to collect statistics.
+
+        :param strategy:        The strategy to apply.
+        :param clip:            The clip to process.
+        :param wobbly_parsed:   The parsed wobbly file.
+
+        :return:                The processed clip.
+        """
+
+        probe = _Probe(self._stats_for(strategy))
+
+        self._probes.append(probe)
+
+        clip = clip.std.ModifyFrame(clip, lambda n, f: self._on_input(probe, n, f))
+        probe.input_node = clip
+
+        start = perf_counter()
+        out = strategy.apply(clip, wobbly_parsed=wobbly_parsed)
+        probe.stats.build_time += perf_counter() - start
+
+        probe.output_node = out
+
+        return out.std.ModifyFrame(out, lambda n, f: self._on_output(probe, n, f))
+
+    def report(self) -> dict[str, Any]:
+        """
+        Get the collected statistics.
+
+        :return:    A JSON-serializable dictionary containing the measuring method,
+                    the statistics per strategy in the order they were applied,
+                    and the statistics summed per preset, sorted by cumulative render time.
+        """
+
+        strategies = self.stats()
+
+        presets = dict[str, StrategyStats]()
+
+        for stats in strategies:
+            if stats.preset is None:
+                continue
+
+            _add_stats(
+                presets.setdefault(stats.preset, StrategyStats(stats.preset, stats.position, stats.preset)), stats
+            )
+
+        return {
+            'method': 'node timings' if self._use_timings else 'callbacks',
+            'strategies': [stats.to_dict() for stats in strategies],
+            'presets': [
+                stats.to_dict() for stats in sorted(presets.values(), key=lambda s: s.render_time, reverse=True)
+            ],
+        }
+
+    def stats(self) -> list[StrategyStats]:
+        """
+        Get the statistics of every strategy, in the order they were applied.
+
+        Statistics added with `merge` are summed into the strategy at the same position, if it has the same name.
+
+        :return:    A new list holding a copy of the statistics of every strategy.
+        """
+
+        if self._use_timings:
+            self._collect_node_timings()
+
+        strategies = [replace(probe.stats) for probe in self._probes]
+
+        for idx, stats in enumerate(self._merged):
+            if idx < len(strategies) and strategies[idx].name == stats.name:
+                _add_stats(strategies[idx], stats)
+            else:
+                strategies.append(replace(stats))
+
+        return strategies
+
+    def merge(self, stats: Sequence[StrategyStats]) -> None:
+        """
+        Add statistics collected by another profiler, e.g. in the worker processes of `render_parallel`.
+
+        :param stats:   The statistics of every strategy, as returned by `stats`.
+        """
+
+        for idx, other in enumerate(stats):
+            if idx < len(self._merged) and self._merged[idx].name == other.name:
+                _add_stats(self._merged[idx], other)
+            else:
+                self._merged.append(replace(other))
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Get the collected statistics as a JSON string. Keyword arguments are passed to `json.dumps`."""
+
+        return json.dumps(self.report(), **kwargs)
+
+    def _stats_for(self, strategy: AbstractProcessingStrategy) -> StrategyStats:
+        if isinstance(strategy, CustomListStrategy):
+            custom_list = strategy._custom_list
+            preset = getattr(custom_list.preset, 'name', str(custom_list.preset))
+
+            return StrategyStats(f'{custom_list.name} ({preset})', strategy.position, preset)
+
+        return StrategyStats(strategy.__class__.__name__, strategy.position)
+
+    def _on_input(self, probe: _Probe, n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+        probe.arrivals.setdefault(n, perf_counter())
+
+        return f
+
+    def _on_output(self, probe: _Probe, n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+        now = perf_counter()
+
+        probe.stats.frames += 1
+
+        if not self._use_timings:
+            probe.stats.render_time += now - probe.arrivals.pop(n, now)
+
+        return f
+
+    def _collect_node_timings(self) -> None:
+        for probe in self._probes:
+            if probe.input_node is None or probe.output_node is None:
+                continue
+
+            upstream = dict.fromkeys(iter_graph_nodes(probe.input_node))
+
+            probe.stats.render_time = (
+                sum(node._timings for node in iter_graph_nodes(probe.output_node) if node not in upstream) / 1e9
+            )
+
+    @staticmethod
+    def _enable_node_timings() -> bool:
+        """Enable node timings if they are supported, and nodes can be told apart while walking the graph."""
+
+        if not can_walk_graph():
+            return False
+
+        try:
+            vs.core.node_timings = True
+        except (AttributeError, vs.Error):
+            return False
+
+        return bool(getattr(vs.core, 'node_timings', False))
+
+
+def _add_stats(total: StrategyStats, stats: StrategyStats) -> None:
+    total.build_time += stats.build_time
+    total.frames += stats.frames
+    total.render_time += stats.render_time
+
+
+class FrameRequestCounter:
+    """
+    Count the frame requests that reach a clip.
+
+    Wrap the source clip with `wrap` before building a graph on top of it.
+    Every frame requested from the wrapped clip, directly or through the graph, is recorded.
+    Use `WobblyProcessor.count_frame_requests` to check that building the processing graph renders no frames.
+    """
+
+    def __init__(self) -> None:
+        self.frames = list[int]()
+        """The frame numbers that were requested, in order of arrival."""
+
+    @property
+    def count(self) -> int:
+        """The number of frames that were requested."""
+
+        return len(self.frames)
+
+    def wrap(self, clip: vs.VideoNode) -> vs.VideoNode:
+        """Wrap a clip, so every frame requested from it is counted."""
+
+        return clip.std.ModifyFrame(clip, self._on_frame)
+
+    def reset(self) -> None:
+        """Forget all counted requests."""
+
+        self.frames.clear()
+
+    def _on_frame(self, n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+        self.frames.append(n)
+
+        return f
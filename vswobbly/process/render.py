@@ -0,0 +1,350 @@
+import json
+import multiprocessing
+import os
+import shutil
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from jetpytools import CustomValueError, SPath, SPathLike
+
+from ..data.parse import WobblyParser
+from ..types import OutputSettingsEnum, PluginBackendEnum
+from .cache import DiskFrameCache
+from .chunks import RenderChunk
+from .profiling import StrategyProfiler, StrategyStats
+
+__all__ = [
+    'RenderManifest',
+    'RenderReport',
+    'WorkerStats',
+    'render_parallel',
+]
+
+
+@dataclass
+class WorkerStats:
+    """Throughput statistics for a single render worker."""
+
+    pid: int
+    """The process ID of the worker."""
+
+    frames: int = 0
+    """The number of frames rendered by this worker."""
+
+    build_time: float = 0.0
+    """Time spent building the processing graph, in seconds."""
+
+    render_time: float = 0.0
+    """Time spent rendering frames, in seconds."""
+
+    chunks: list[int] = field(default_factory=list)
+    """The indices of the chunks rendered by this worker."""
+
+    @property
+    def fps(self) -> float:
+        """Frames rendered per second of render time."""
+
+        return self.frames / self.render_time if self.render_time else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics as a JSON-serializable dictionary."""
+
+        return {
+            'pid': self.pid,
+            'frames': self.frames,
+            'build_time': self.build_time,
+            'render_time': self.render_time,
+            'fps': self.fps,
+            'chunks': self.chunks,
+        }
+
+
+@dataclass
+class RenderManifest:
+    """Describes the chunk files written by a parallel render, in output order."""
+
+    y4m: bool
+    """Whether the chunks are YUV4MPEG2 files. Otherwise, they contain raw planar frames."""
+
+    chunks: list[dict[str, Any]] = field(default_factory=list)
+    """Chunk entries containing the output frame range and file name of every chunk."""
+
+    @classmethod
+    def from_file(cls, path: SPathLike) -> 'RenderManifest':
+        """Load a manifest from a JSON file."""
+
+        with open(path, 'r') as file:
+            data = json.load(file)
+
+        return cls(y4m=data['y4m'], chunks=data['chunks'])
+
+    def to_file(self, path: SPathLike) -> None:
+        """Write the manifest to a JSON file."""
+
+        with open(path, 'w') as file:
+            json.dump({'y4m': self.y4m, 'chunks': self.chunks}, file, indent=4)
+
+    def stitch(self, output: SPathLike, directory: SPathLike | None = None) -> SPath:
+        """
+        Concatenate all chunk files into a single file.
+
+        For YUV4MPEG2 chunks, only the stream header of the first chunk is kept.
+
+        :param output:      The path to write the stitched file to.
+        :param directory:   The directory containing the chunk files. Default: the output's parent directory.
+
+        :return:            The path to the stitched file.
+        """
+
+        output = SPath(output)
+        directory = SPath(directory) if directory is not None else output.parent
+
+        with open(output, 'wb') as out:
+            for idx, chunk in enumerate(sorted(self.chunks, key=lambda c: c['start'])):
+                with open(directory / chunk['file'], 'rb') as src:
+                    if self.y4m and idx:
+                        src.readline()
+
+                    shutil.copyfileobj(src, out)
+
+        return output
+
+
+@dataclass
+class RenderReport:
+    """Summary of a parallel render."""
+
+    manifest: RenderManifest
+    """The manifest describing the rendered chunks."""
+
+    workers: list[WorkerStats]
+    """Per-worker statistics."""
+
+    wall_time: float
+    """Total wall time of the render, in seconds."""
+
+    @property
+    def frames(self) -> int:
+        """The total number of rendered frames."""
+
+        return sum(worker.frames for worker in self.workers)
+
+    @property
+    def fps(self) -> float:
+        """Aggregate throughput over the entire render, in frames per second."""
+
+        return self.frames / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def scaling_efficiency(self) -> float:
+        """
+        Aggregate throughput divided by the sum of each worker's own throughput.
+
+        A value of 1.0 means every worker was rendering for the entire duration of the render.
+        Lower values indicate idle workers, caused by graph build time or badly balanced chunks.
+        To measure contention between workers, compare the per-worker fps with a single worker render.
+        """
+
+        total = sum(worker.fps for worker in self.workers)
+
+        return self.fps / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+
+        return {
+            'frames': self.frames,
+            'wall_time': self.wall_time,
+            'fps': self.fps,
+            'scaling_efficiency': self.scaling_efficiency,
+            'workers': [worker.to_dict() for worker in self.workers],
+        }
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(
+    source: str | WobblyParser,
+    strategies: Sequence[Any],
+    strategy_states: Sequence[dict[str, Any]] | None,
+    threads: int | None,
+    processor_kwargs: dict[str, Any],
+    profiler_mode: str | None,
+) -> None:
+    """Build the processing graph once per worker process, parsing the wobbly file unless a parser was sent."""
+
+    from vstools import core
+
+    from .processor import WobblyProcessor
+
+    if threads:
+        core.num_threads = threads
+
+    start = perf_counter()
+
+    parser = source if isinstance(source, WobblyParser) else WobblyParser.from_file(source)
+    strategies = [strategy() if isinstance(strategy, type) else strategy for strategy in strategies]
+
+    # The analysis was done once by the caller, so the workers don't repeat it.
+    for strategy, state in zip(strategies, strategy_states or ()):
+        strategy.import_state(state)
+
+    profiler = StrategyProfiler(profiler_mode) if profiler_mode else None  # type: ignore[arg-type]
+
+    _worker_state['clip'] = WobblyProcessor(
+        parser, strategies=strategies, profiler=profiler, **processor_kwargs
+    ).apply()
+    _worker_state['profiler'] = profiler
+    _worker_state['build_time'] = perf_counter() - start
+
+
+def _render_chunk(index: int, start: int, end: int, path: str, y4m: bool) -> dict[str, Any]:
+    """Render a single chunk to a file."""
+
+    clip = _worker_state['clip']
+
+    begin = perf_counter()
+
+    with open(path, 'wb') as file:
+        clip[start : end + 1].output(file, y4m=y4m)
+
+    render_time = perf_counter() - begin
+    profiler = _worker_state['profiler']
+
+    return {
+        'index': index,
+        'pid': os.getpid(),
+        'frames': end - start + 1,
+        'render_time': render_time,
+        'build_time': _worker_state.pop('build_time', 0.0),
+        'profile': profiler.stats() if profiler is not None else None,
+    }
+
+
+def render_parallel(
+    wob_path: SPathLike | WobblyParser,
+    chunks: Sequence[RenderChunk],
+    output_dir: SPathLike,
+    strategies: Sequence[Any] = (),
+    workers: int | None = None,
+    threads_per_worker: int | None = None,
+    y4m: bool = True,
+    backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+    output_settings: OutputSettingsEnum | str = OutputSettingsEnum.IGNORE,
+    strategy_states: Sequence[dict[str, Any]] | None = None,
+    frame_cache: DiskFrameCache | None = None,
+    frame_cache_salt: str = '',
+    profiler: StrategyProfiler | None = None,
+) -> RenderReport:
+    """
+    Render the processed output of a wobbly file with multiple worker processes.
+
+    Every worker process builds the processing graph once,
+    and then renders whole chunks straight to their own file.
+    This sidesteps the GIL for Python callbacks in the graph (presets, `FrameEval`, etc.),
+    which otherwise limit how many cores a single VapourSynth process can use.
+    The remaining arguments are passed to every worker's `WobblyProcessor`, so the output matches its `apply`.
+
+    Because workers are started with the "spawn" method, scripts calling this
+    must be guarded with `if __name__ == '__main__':`, and all strategies must be picklable.
+    Strategy classes can be passed instead of instances.
+
+    :param wob_path:            The path to the wobbly file, or an already parsed wobbly file.
+                                A parser is pickled without its clips and sent to the workers, so they don't reparse
+                                the file. Its source filter must then be picklable, unless it was given by name.
+    :param chunks:              The chunks to render. See `WobblyProcessor.plan_chunks`.
+    :param output_dir:          The directory to write the chunk files and the manifest to.
+    :param strategies:          The strategies to pass to each worker's `WobblyProcessor`.
+    :param workers:             The number of worker processes. Default: the number of chunks, capped to the CPU count.
+    :param threads_per_worker:  The number of VapourSynth threads per worker. Default: VapourSynth's default.
+    :param y4m:                 Whether to write YUV4MPEG2 files. Otherwise, raw planar frames are written.
+    :param backend:             The implementation to use for field matching.
+    :param output_settings:     Whether and where to apply the crop, resize and bit depth settings of the wobbly file.
+    :param strategy_states:     The exported state of every strategy, in order, so the workers skip their analysis.
+                                See `AbstractProcessingStrategy.export_state`.
+    :param frame_cache:         Disk cache to store the output of every custom list in. It's shared by the workers.
+    :param frame_cache_salt:    Anything else the output of the custom lists depends on. See `CachedStrategy`.
+    :param profiler:            Profiler to add the statistics collected in every worker to.
+
+    :return:                    A report containing the manifest and per-worker throughput.
+    """
+
+    if not chunks:
+        raise CustomValueError('No chunks to render!', render_parallel)
+
+    output_dir = SPath(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = workers or min(len(chunks), os.cpu_count() or 1)
+    ext = 'y4m' if y4m else 'raw'
+
+    manifest = RenderManifest(y4m=y4m)
+    stats = dict[int, WorkerStats]()
+    profiles = dict[int, list[StrategyStats]]()
+
+    processor_kwargs = {
+        'backend': backend,
+        'output_settings': output_settings,
+        'frame_cache': frame_cache,
+        'frame_cache_salt': frame_cache_salt,
+    }
+    profiler_mode = None if profiler is None else 'timings' if profiler.uses_node_timings else 'callbacks'
+
+    begin = perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(
+            wob_path if isinstance(wob_path, WobblyParser) else SPath(wob_path).as_posix(),
+            tuple(strategies),
+            tuple(strategy_states) if strategy_states is not None else None,
+            threads_per_worker,
+            processor_kwargs,
+            profiler_mode,
+        ),
+    ) as executor:
+        # Submit the most expensive chunks first so the slowest one doesn't end up last.
+        futures = [
+            executor.submit(
+                _render_chunk,
+                idx,
+                chunk.start,
+                chunk.end,
+                (output_dir / f'chunk_{idx:05d}.{ext}').as_posix(),
+                y4m,
+            )
+            for idx, chunk in sorted(enumerate(chunks), key=lambda c: -c[1].cost)
+        ]
+
+        for future in as_completed(futures):
+            result = future.result()
+            worker = stats.setdefault(result['pid'], WorkerStats(result['pid']))
+
+            worker.frames += result['frames']
+            worker.render_time += result['render_time']
+            worker.build_time += result['build_time']
+            worker.chunks.append(result['index'])
+
+            # Every worker reports the totals of everything it rendered so far.
+            if result['profile'] is not None:
+                profiles[result['pid']] = result['profile']
+
+    wall_time = perf_counter() - begin
+
+    if profiler is not None:
+        for profile in profiles.values():
+            profiler.merge(profile)
+
+    manifest.chunks = [
+        {'index': idx, 'start': chunk.start, 'end': chunk.end, 'file': f'chunk_{idx:05d}.{ext}'}
+        for idx, chunk in enumerate(chunks)
+    ]
+    manifest.to_file(output_dir / 'manifest.json')
+
+    return RenderReport(manifest, list(stats.values()), wall_time)
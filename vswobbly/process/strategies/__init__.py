@@ -1,6 +1,29 @@
 # ruff: noqa: F401, F403
 
-from .combed import *
+from typing import TYPE_CHECKING
+
+from ...util import lazy_attributes
+from . import cached, custom_lists
+from .cached import *
 from .custom_lists import *
-from .ifades import *
-from .orphans import *
+
+if TYPE_CHECKING:
+    from .combed import *
+    from .ifades import *
+    from .orphans import *
+
+# These strategies depend on vsdeinterlace, which takes a long time to import,
+# so their modules are only imported when the strategies are first accessed.
+_LAZY_STRATEGIES = {
+    'DecombVinverseStrategy': f'{__name__}.combed',
+    'AdaptiveFixInterlacedFadesStrategy': f'{__name__}.ifades',
+    'MatchBasedOrphanQTGMCStrategy': f'{__name__}.orphans',
+}
+
+# Star imports of this package import the lazily imported strategies as well.
+__all__: list[str] = []
+__all__ += cached.__all__
+__all__ += custom_lists.__all__
+__all__ += list(_LAZY_STRATEGIES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_STRATEGIES)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Any
 
 from vstools import vs
@@ -48,3 +49,62 @@ class AbstractProcessingStrategy(ABC):
         """When to apply the strategy."""
 
         return FilteringPositionEnum.POST_DECIMATE
+
+    @property
+    def temporal_radius(self) -> int:
+        """
+        The number of neighbouring frames on either side that the strategy's output of a frame depends on.
+
+        Changing the wobbly data of a frame changes the output of the frames this close to it as well,
+        e.g. when the strategy uses temporal filters. `WobblyWatcher` uses this to find every changed frame.
+        """
+
+        return 0
+
+    @property
+    def requests_frames(self) -> bool:
+        """
+        Whether applying the strategy requests frames while building the graph.
+
+        Building the processing graph should never render frames, so that load times don't depend
+        on how fast the source can be decoded and seeked. Strategies that must analyse frames
+        to decide what to do (e.g. comparing fields) have to opt in by overriding this to return True.
+        See `WobblyProcessor.count_frame_requests`.
+        """
+
+        return False
+
+    def export_state(self) -> dict[str, Any]:
+        """
+        Export the results of any expensive analysis performed while applying the strategy.
+
+        The returned dictionary must be JSON-serializable. Strategies that analyse frames
+        while building the graph should override this (and `import_state`),
+        so the analysis can be skipped when the graph is rebuilt, e.g. when resuming a render.
+
+        :return:                    The state of the strategy. Empty by default.
+        """
+
+        return {}
+
+    def import_state(self, state: dict[str, Any]) -> None:
+        """
+        Restore a state previously returned by `export_state`.
+
+        :param state:               The state to restore.
+        """
+
+    def invalidate_state(self, state: dict[str, Any], frames: Sequence[int]) -> dict[str, Any]:
+        """
+        Drop the parts of an exported state that depend on the given source frames.
+
+        This is used to keep as much analysis as possible when the wobbly file changes, e.g. by `WobblyWatcher`.
+        By default, the entire state is dropped, which is always safe.
+
+        :param state:               A state previously returned by `export_state`.
+        :param frames:              The source (pre-decimation) frames that changed.
+
+        :return:                    The part of the state that is still valid.
+        """
+
+        return {}
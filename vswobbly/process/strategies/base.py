@@ -1,9 +1,17 @@
-from jetpytools import CustomNotImplementedError, CustomValueError
+from collections.abc import Sequence
+from time import perf_counter
+from typing import Any
+
+from jetpytools import CustomValueError
 from vstools import vs
 
 from ...data.parse import WobblyParser
 from ...types import FilteringPositionEnum
+from ..cache import DiskFrameCache
+from ..explain import GraphExplainer
+from ..profiling import StrategyProfiler
 from .abstract import AbstractProcessingStrategy
+from .cached import CachedStrategy
 from .custom_lists import CustomListStrategy
 
 __all__ = ['ProcessingStrategyManager']
@@ -13,9 +21,26 @@ class ProcessingStrategyManager:
     """Class for managing and executing processing strategies in a specific order."""
 
     def init_strategies(
-        self, wobbly_parsed: WobblyParser, strategies: list[AbstractProcessingStrategy] | None = None
+        self,
+        wobbly_parsed: WobblyParser,
+        strategies: list[AbstractProcessingStrategy] | None = None,
+        custom_list_ranges: Sequence[tuple[int, list[Any]] | None] = (),
+        frame_cache: DiskFrameCache | None = None,
+        frame_cache_salt: str = '',
+        upstream: tuple[Any, ...] = (),
     ) -> None:
-        """Initialize and validate the list of strategies."""
+        """
+        Initialize and validate the list of strategies.
+
+        :param wobbly_parsed:           The parsed wobbly data.
+        :param strategies:              The strategies to apply before the custom lists.
+        :param custom_list_ranges:      The ranges of every custom list, resolved ahead of time.
+                                        See `CustomListStrategy`.
+        :param frame_cache:             Cache the output of every custom list in this cache. See `CachedStrategy`.
+        :param frame_cache_salt:        See `CachedStrategy`.
+        :param upstream:                A signature of everything applied before the strategies
+                                        that the wobbly data doesn't describe. See `CachedStrategy.upstream`.
+        """
 
         all_strategies = []
 
@@ -31,14 +56,39 @@ class ProcessingStrategyManager:
             [value for name, value in vars(self).items() if name.endswith('_strategy') and value is not None]
         )
 
-        all_strategies.extend(map(CustomListStrategy, wobbly_parsed.custom_lists))
+        custom_lists = list[AbstractProcessingStrategy](
+            CustomListStrategy(custom_list, custom_list_ranges[idx] if idx < len(custom_list_ranges) else None)
+            for idx, custom_list in enumerate(wobbly_parsed.custom_lists)
+        )
+
+        if frame_cache is not None:
+            custom_lists = [
+                CachedStrategy(custom_list, frame_cache, salt=frame_cache_salt) for custom_list in custom_lists
+            ]
+
+        all_strategies.extend(custom_lists)
 
         self._strategies = all_strategies
+        self._upstream = upstream
+        self._applied_signatures = list[tuple[Any, ...]]()
 
         self._ensure_strategies_callable()
 
-    def apply_strategies_of_position(self, position: FilteringPositionEnum) -> vs.VideoNode:
-        """Apply all strategies of a given position."""
+    def apply_strategies_of_position(
+        self,
+        position: FilteringPositionEnum,
+        profiler: StrategyProfiler | None = None,
+        explainer: GraphExplainer | None = None,
+    ) -> vs.VideoNode:
+        """
+        Apply all strategies of a given position.
+
+        :param position:        The position to apply the strategies of.
+        :param profiler:        Profile every strategy with this profiler.
+        :param explainer:       Record every strategy with this explainer, if the graph is being explained.
+
+        :return:                The processed clip.
+        """
 
         if not hasattr(self, '_strategies'):
             self.init_strategies(self.parser)
@@ -46,15 +96,41 @@ class ProcessingStrategyManager:
         strategies = self._get_strategies_for_position(position)
 
         for strategy in strategies:
-            self.proc_clip = strategy.apply(self.proc_clip, wobbly_parsed=self.parser)
-            # self.proc_clip = self._add_strategy_as_frame_prop(strategy)  # TODO: Implement this
+            if isinstance(strategy, CachedStrategy):
+                strategy.upstream = self._upstream_signature()
+
+            start = perf_counter()
+
+            if profiler is not None:
+                self.proc_clip = profiler.profile(strategy, self.proc_clip, wobbly_parsed=self.parser)
+            else:
+                self.proc_clip = strategy.apply(self.proc_clip, wobbly_parsed=self.parser)
+
+            if explainer is not None:
+                explainer.record(self._strategy_name(strategy), self.proc_clip, perf_counter() - start)
+
+            self._applied_signatures.append(CachedStrategy.strategy_signature(strategy))
 
         return self.proc_clip
 
-    def _add_strategy_as_frame_prop(self, strategy: AbstractProcessingStrategy) -> None:
-        """Add a strategy as a frame property."""
+    def _upstream_signature(self) -> tuple[Any, ...]:
+        """
+        Create a signature of everything applied so far that the wobbly data doesn't describe.
+        See `CachedStrategy.upstream`.
+        """
+
+        return (*self._upstream, tuple(self._applied_signatures))
+
+    @staticmethod
+    def _strategy_name(strategy: AbstractProcessingStrategy) -> str:
+        """Get a readable name for a strategy."""
+
+        if isinstance(strategy, CustomListStrategy):
+            custom_list = strategy._custom_list
+
+            return f'{custom_list.name} ({getattr(custom_list.preset, "name", custom_list.preset)})'
 
-        raise CustomNotImplementedError('This method is not implemented yet!', self._add_strategy_as_frame_prop)
+        return strategy.__class__.__name__
 
     def _ensure_strategies_callable(self) -> None:
         """Ensure that all strategies are callable."""
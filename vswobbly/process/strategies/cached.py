@@ -0,0 +1,227 @@
+import os
+from collections.abc import Callable, Iterable, Sequence
+from threading import Lock
+from typing import Any
+from uuid import uuid4
+from weakref import WeakKeyDictionary
+
+from vstools import vs
+
+from ...data.diff import settings_signature, source_signatures
+from ...data.parse import WobblyParser
+from ...types import FilteringPositionEnum
+from ..cache import DiskFrameCache
+from .abstract import AbstractProcessingStrategy
+from .custom_lists import CustomListStrategy
+
+__all__ = [
+    'CachedStrategy',
+]
+
+
+_clip_tokens = WeakKeyDictionary[vs.VideoNode, str]()
+_clip_tokens_lock = Lock()
+
+
+class CachedStrategy(AbstractProcessingStrategy):
+    """
+    Wrap a strategy (or custom list) to store its output frames in a `DiskFrameCache`,
+    so they're only rendered once across preview sessions and encodes.
+
+    Every frame is keyed by the source file (including its size and modification time), the wobbly settings
+    that affect every frame, the wrapped strategy's class and simple attributes (numbers, strings, booleans),
+    the frame number, and the signatures of the surrounding source frames (see `source_signatures`).
+    Editing the wobbly data of a frame therefore only invalidates the cached frames within `radius` of it.
+
+    When applied by a `WobblyProcessor`, the key also includes everything applied before the strategy
+    that the wobbly data doesn't describe (see `upstream`): the field matching backend, the output settings,
+    every earlier strategy, and the input clip if it isn't the wobbly file's source.
+    A custom input clip can't be fingerprinted without rendering it,
+    so frames rendered from it are only reused while that clip object is alive.
+    """
+
+    def __init__(
+        self,
+        strategy: AbstractProcessingStrategy,
+        cache: DiskFrameCache,
+        frames: Callable[[WobblyParser], Iterable[int]] | None = None,
+        radius: int = 2,
+        salt: str = '',
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param strategy:        The strategy to cache the output of.
+        :param cache:           The cache to store the frames in.
+        :param frames:          Callable returning the frames to cache, numbered as at the strategy's position.
+                                Other frames are passed through. Default: the frames of a custom list,
+                                or every frame for other strategies.
+        :param radius:          The number of surrounding source frames whose wobbly data affects a frame,
+                                e.g. the temporal radius of the filters used by the strategy.
+        :param salt:            Anything else the output depends on.
+        """
+
+        super().__init__(**kwargs)
+
+        self.strategy = strategy() if isinstance(strategy, type) else strategy
+        self.cache = cache
+        self.frames = frames
+        self.radius = radius
+        self.salt = salt
+
+        # A signature of the processing applied before the strategy. Set by the processor before applying it.
+        self.upstream: tuple[Any, ...] = ()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.strategy!r})'
+
+    def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
+        """
+        Apply the wrapped strategy, and cache its output.
+
+        :param clip:            The clip to process.
+        :param wobbly_parsed:   The parsed wobbly file. See the `WobblyParser` class for more information,
+                                including all the data that is available.
+
+        :return:                Clip with the processing applied to the selected frames.
+        """
+
+        return self.cache.cache_clip(self.strategy.apply(clip, wobbly_parsed), self._frame_keys(wobbly_parsed))
+
+    @property
+    def position(self) -> FilteringPositionEnum:
+        """When to perform filtering."""
+
+        return self.strategy.position
+
+    @property
+    def requests_frames(self) -> bool:
+        """Whether the wrapped strategy requests frames while building the graph."""
+
+        return self.strategy.requests_frames
+
+    @property
+    def temporal_radius(self) -> int:
+        """The radius of the cache keys, or of the wrapped strategy if that's larger."""
+
+        return max(self.radius, self.strategy.temporal_radius)
+
+    def export_state(self) -> dict[str, Any]:
+        return self.strategy.export_state()
+
+    def import_state(self, state: dict[str, Any]) -> None:
+        self.strategy.import_state(state)
+
+    def invalidate_state(self, state: dict[str, Any], frames: Sequence[int]) -> dict[str, Any]:
+        return self.strategy.invalidate_state(state, frames)
+
+    def _frame_keys(self, wobbly_parsed: WobblyParser) -> Callable[[int], str | None]:
+        """Create the function returning the cache key of every frame at the strategy's position."""
+
+        signatures = source_signatures(wobbly_parsed)
+
+        # Frames after decimation are mapped back to the source frames they came from.
+        if self.position is FilteringPositionEnum.POST_DECIMATE:
+            decimations = set(wobbly_parsed.decimations)
+            sources = [frame for frame in range(len(signatures)) if frame not in decimations]
+        else:
+            sources = list(range(len(signatures)))
+
+        if self.frames is not None:
+            selected: set[int] | None = set(self.frames(wobbly_parsed))
+        elif isinstance(self.strategy, CustomListStrategy):
+            selected = set(self._custom_list_frames(self.strategy, wobbly_parsed))
+        else:
+            selected = None
+
+        base = (self._source_identity(wobbly_parsed), settings_signature(wobbly_parsed), self._fingerprint())
+        keys = dict[int, str]()
+
+        def _key(n: int) -> str | None:
+            if (selected is not None and n not in selected) or n >= len(sources):
+                return None
+
+            if (key := keys.get(n)) is None:
+                src = sources[n]
+                window = signatures[max(src - self.radius, 0) : src + self.radius + 1]
+                keys[n] = key = self.cache.make_key(base, n, window)
+
+            return key
+
+        return _key
+
+    @staticmethod
+    def strategy_signature(strategy: AbstractProcessingStrategy) -> tuple[Any, ...]:
+        """
+        Create a signature of a strategy from its class and simple attributes (numbers, strings, booleans).
+
+        Custom lists are identified by their name, since their presets are part of the frame signatures.
+
+        :param strategy:        The strategy.
+
+        :return:                A tuple with a stable `repr`.
+        """
+
+        if isinstance(strategy, CachedStrategy):
+            return (*CachedStrategy.strategy_signature(strategy.strategy), strategy.salt)
+
+        cls = type(strategy)
+
+        if isinstance(strategy, CustomListStrategy):
+            attrs: dict[str, Any] = {'name': strategy._custom_list.name}
+        else:
+            attrs = {k: v for k, v in vars(strategy).items() if isinstance(v, (bool, int, float, str)) or v is None}
+
+        return (f'{cls.__module__}.{cls.__qualname__}', sorted(attrs.items()), str(strategy.position))
+
+    @staticmethod
+    def clip_signature(clip: vs.VideoNode) -> str:
+        """
+        Create a signature of a clip that isn't the wobbly file's source.
+
+        The contents of a clip can't be fingerprinted without rendering it,
+        so every clip object gets a random token, which is kept as long as the clip is alive.
+
+        :param clip:            The clip.
+
+        :return:                The token of the clip.
+        """
+
+        with _clip_tokens_lock:
+            if (token := _clip_tokens.get(clip)) is None:
+                _clip_tokens[clip] = token = uuid4().hex
+
+        return token
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """The wrapped strategy's signature, the salt, and the processing applied before it."""
+
+        return (*self.strategy_signature(self.strategy), self.salt, self.upstream)
+
+    @staticmethod
+    def _source_identity(wobbly_parsed: WobblyParser) -> tuple[Any, ...]:
+        """The source file and its size and modification time, so a replaced source isn't served from the cache."""
+
+        src_file = wobbly_parsed.video_data.src_file
+
+        try:
+            stat = os.stat(src_file)
+        except OSError:
+            return (str(src_file),)
+
+        return (str(src_file), stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def _custom_list_frames(strategy: CustomListStrategy, wobbly_parsed: WobblyParser) -> Iterable[int]:
+        """The frames a custom list applies to, numbered as at its position."""
+
+        custom_list = strategy._custom_list
+        decimations = wobbly_parsed.decimations
+
+        for frame_range in custom_list.frames:
+            first, last = frame_range if isinstance(frame_range, tuple) else (frame_range, frame_range)
+
+            if custom_list.position is FilteringPositionEnum.POST_DECIMATE:
+                first -= decimations.count_before(first)
+                last -= decimations.count_before(last + 1)
+
+            yield from range(first, last + 1)
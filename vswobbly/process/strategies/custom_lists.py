@@ -14,9 +14,22 @@ __all__ = [
 class CustomListStrategy(AbstractProcessingStrategy):
     """Default strategy that applies a custom list defined directly in the wobbly file."""
 
-    def __init__(self, custom_list: CustomList, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        custom_list: CustomList,
+        ranges: tuple[int, list[tuple[int | tuple[int, int], int | tuple[int, int]]]] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param custom_list:     The custom list to apply.
+        :param ranges:          The number of frames at the custom list's position, and the ranges resolved for it
+                                ahead of time (see `CustomList.resolve_ranges`).
+                                They're only used for clips with that number of frames.
+        """
+
         super().__init__(**kwargs)
         self._custom_list = custom_list
+        self._ranges = ranges
 
     def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
         """
@@ -29,7 +42,9 @@ class CustomListStrategy(AbstractProcessingStrategy):
         :return:                Clip with the processing applied to the selected frames.
         """
 
-        return self._custom_list.apply(clip, wobbly_parsed.decimations)
+        ranges = self._ranges[1] if self._ranges is not None and self._ranges[0] == clip.num_frames else None
+
+        return self._custom_list.apply(clip, wobbly_parsed.decimations, ranges)
 
     @property
     def position(self) -> FilteringPositionEnum:
@@ -12,6 +12,9 @@ __all__ = [
     'AdaptiveFixInterlacedFadesStrategy',
 ]
 
+# Fades at most this many frames apart are fixed as a single range, including the frames between them.
+_MAX_GAP = 5
+
 
 class _FrameRangeGrouper:
     """Helper class for grouping frame numbers into ranges."""
@@ -82,7 +85,7 @@ class AverageFixInterlacedFadesStrategy(AbstractProcessingStrategy):
         :return:                Clip with the processing applied to the selected frames.
         """
 
-        frame_groups = self._frame_grouper.group_frames_into_ranges(clip, wobbly_parsed.interlaced_fades, 5)
+        frame_groups = self._frame_grouper.group_frames_into_ranges(clip, wobbly_parsed.interlaced_fades, _MAX_GAP)
 
         return replace_ranges(clip, FixInterlacedFades.Average(clip), frame_groups)
 
@@ -92,6 +95,12 @@ class AverageFixInterlacedFadesStrategy(AbstractProcessingStrategy):
 
         return FilteringPositionEnum.PRE_DECIMATE
 
+    @property
+    def temporal_radius(self) -> int:
+        """Adding or removing a fade can join or split the range of the fades around it."""
+
+        return _MAX_GAP - 1
+
 
 class AdaptiveFixInterlacedFadesStrategy(AbstractProcessingStrategy):
     """Strategy for fixing interlaced fades adaptively."""
@@ -115,7 +124,7 @@ class AdaptiveFixInterlacedFadesStrategy(AbstractProcessingStrategy):
         :return:                Clip with the processing applied to the selected frames.
         """
 
-        frame_groups = self._frame_grouper.group_frames_into_ranges(clip, wobbly_parsed.interlaced_fades, 5)
+        frame_groups = self._frame_grouper.group_frames_into_ranges(clip, wobbly_parsed.interlaced_fades, _MAX_GAP)
 
         # TODO: Add fade detection and adaptive selection methods. For now, just use Average.
 
@@ -126,3 +135,9 @@ class AdaptiveFixInterlacedFadesStrategy(AbstractProcessingStrategy):
         """When to perform filtering."""
 
         return FilteringPositionEnum.PRE_DECIMATE
+
+    @property
+    def temporal_radius(self) -> int:
+        """Adding or removing a fade can join or split the range of the fades around it."""
+
+        return _MAX_GAP - 1
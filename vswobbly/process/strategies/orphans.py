@@ -1,10 +1,12 @@
 import logging
+from collections.abc import Sequence
+from copy import copy
+from typing import Any
 
-from jetpytools import CustomValueError, DependencyNotFoundError
+from jetpytools import CustomValueError
 from vsdeinterlace import QTempGaussMC
 from vstools import (
     FieldBased,
-    core,
     depth,
     expect_bits,
     get_prop,
@@ -12,9 +14,11 @@ from vstools import (
     vs,
 )
 
+from ...components.metrics import Mics
 from ...components.orphans import OrphanFrame, OrphanFrames
 from ...data.parse import WobblyParser
-from ...types import FilteringPositionEnum
+from ...plugins import field_hint, plane_difference
+from ...types import FilteringPositionEnum, OrphanDecisionEnum, PluginBackendEnum
 from .abstract import AbstractProcessingStrategy
 
 __all__ = [
@@ -26,6 +30,9 @@ logger = logging.getLogger(__name__)
 
 FieldMatchGroupT = list[int]
 
+# The temporal radius of every QTGMC stage.
+_QTGMC_TR = 1
+
 
 class _OrphanFieldSplitter:
     """Helper class that splits orphaned fields into separate lists based on their field match."""
@@ -33,20 +40,12 @@ class _OrphanFieldSplitter:
     def split_fields(
         self, wobbly_parsed: WobblyParser
     ) -> tuple[FieldMatchGroupT, FieldMatchGroupT, FieldMatchGroupT, FieldMatchGroupT]:
-        orphan_n, orphan_b, orphan_u, orphan_p = [], [], [], []
-
-        for frame in wobbly_parsed.orphan_frames:
-            match frame.match:
-                case 'b':
-                    orphan_b.append(frame.frame)
-                case 'n':
-                    orphan_n.append(frame.frame)
-                case 'u':
-                    orphan_u.append(frame.frame)
-                case 'p':
-                    orphan_p.append(frame.frame)
-                case _:
-                    raise CustomValueError(f'Unknown field match: {frame.match} ({frame.frame})', self.split_fields)
+        orphans = wobbly_parsed.orphan_frames
+
+        if unknown := orphans.used_matches - set('nbup'):
+            raise CustomValueError(f'Unknown field matches: {sorted(unknown)}', self.split_fields)
+
+        orphan_n, orphan_b, orphan_u, orphan_p = (orphans.match_frames(match) for match in 'nbup')
 
         return orphan_n, orphan_b, orphan_u, orphan_p
 
@@ -54,7 +53,15 @@ class _OrphanFieldSplitter:
 class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
     """Strategy for dealing with orphan fields using match-based deinterlacing."""
 
-    def __init__(self, thr: float = 0.0025, qtgmc_obj: QTempGaussMC | None = None) -> None:
+    def __init__(
+        self,
+        thr: float = 0.0025,
+        qtgmc_obj: QTempGaussMC | None = None,
+        backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+        decision: OrphanDecisionEnum | str = OrphanDecisionEnum.PIXELS,
+        mic_thr: int = 80,
+        mic_band: int = 20,
+    ) -> None:
         """
         :param thr:             Threshold for deinterlacing orphan fields.
 
@@ -72,6 +79,26 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
                                 up until the "deinterlace" method, which will be called in this strategy.
 
                                 Default: Automatically created by the strategy.
+        :param backend:         The implementation to use for field hinting and field comparisons.
+                                See `PluginBackendEnum` for more information.
+
+                                Default: native (`fh` and `vszip`).
+        :param decision:        How to decide whether an orphan field should be deinterlaced.
+                                See `OrphanDecisionEnum` for more information.
+
+                                Default: pixels (compare the fields, using `thr`).
+        :param mic_thr:         Mic threshold for the metrics and hybrid decisions.
+
+                                If the mic of the orphan's original match (as stored in the wobbly file)
+                                exceeds this value, that match leaves the frame combed, so the orphan field
+                                will be deinterlaced. Otherwise, the original match is restored.
+
+                                Default: 80 (the default `mi` of VFM).
+        :param mic_band:        How close to `mic_thr` a mic must be to count as ambiguous.
+                                With the hybrid decision, orphans whose mic is within `mic_thr ± mic_band`
+                                are decided by comparing their fields, using `thr`.
+
+                                Default: 20.
         """
 
         if not 0 <= thr <= 1:
@@ -82,10 +109,25 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
                 f'QTGMC object must be an instance of vsdeinterlace.QTempGaussMC, not {type(qtgmc_obj)}!', self.__init__
             )
 
+        if mic_thr < 0 or mic_band < 0:
+            raise CustomValueError(
+                f'The mic threshold and band must not be negative, not {mic_thr} and {mic_band}!', self.__init__
+            )
+
         self.thr = thr
         self.qtgmc_obj = qtgmc_obj
+        self.backend = PluginBackendEnum(backend)
+        self.decision = OrphanDecisionEnum(decision)
+        self.mic_thr = mic_thr
+        self.mic_band = mic_band
         self._match_grouper = _OrphanFieldSplitter()
 
+        # Decisions restored with `import_state` are the only ones `apply` reuses.
+        # The decisions of the last `apply` are only kept for `export_state`,
+        # so a strategy reused on other (or edited) wobbly data, or with other parameters, decides again.
+        self._imported_decisions: dict[int, bool] | None = None
+        self._applied_decisions: dict[int, bool] | None = None
+
     def apply(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> vs.VideoNode:
         """
         Apply match-based deinterlacing to the given frames using QTGMC.
@@ -103,7 +145,7 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
 
         clip = clip.std.SetFrameProps(wobbly_orphan_deint=False)
 
-        field_order = FieldBased.from_param_or_video(wobbly_parsed.field_order, clip)
+        field_order = FieldBased.from_param(wobbly_parsed.field_order, self.apply)
 
         clip = field_order.apply(clip)
         clip, orphans = self._should_deinterlace(clip, wobbly_parsed)
@@ -113,12 +155,14 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
 
         clip, bits = expect_bits(clip, 16)
 
+        # The user's QTGMC object is copied, so applying the strategy never modifies it.
         if self.qtgmc_obj is None:
-            self.qtgmc_obj = self._qtgmc(clip)
+            qtgmc = self._qtgmc(clip)
         else:
-            self.qtgmc_obj.clip = clip
+            qtgmc = copy(self.qtgmc_obj)
+            qtgmc.clip = clip
 
-        deint = self.qtgmc_obj.deinterlace()  # type: ignore
+        deint = qtgmc.deinterlace()  # type: ignore
 
         assert isinstance(deint, vs.VideoNode)
 
@@ -127,7 +171,7 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
 
         frames = [o.frame for o in orphans if o.match in ('b', 'n')]
 
-        logging.debug(f'Deinterlaced {len(frames)} orphan fields: {frames}')
+        logger.debug('Deinterlaced %d orphan fields: %s', len(frames), frames)
 
         out = replace_ranges(clip, deint, frames)
 
@@ -139,6 +183,52 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
 
         return FilteringPositionEnum.PRE_DECIMATE
 
+    @property
+    def requests_frames(self) -> bool:
+        """Orphan fields are compared while building the graph, unless the decisions come from the mics alone."""
+
+        return self.decision is not OrphanDecisionEnum.METRICS
+
+    @property
+    def temporal_radius(self) -> int:
+        """The prefilter, basic and source match stages of QTGMC each read the frames within their own radius."""
+
+        return 3 * _QTGMC_TR
+
+    def export_state(self) -> dict[str, Any]:
+        """Export which orphan frames were deinterlaced and which had their original field match restored."""
+
+        decisions = self._applied_decisions if self._applied_decisions is not None else self._imported_decisions
+
+        if decisions is None:
+            return {}
+
+        return {
+            'deinterlace': [frame for frame, deint in decisions.items() if deint],
+            'keep': [frame for frame, deint in decisions.items() if not deint],
+        }
+
+    def import_state(self, state: dict[str, Any]) -> None:
+        """Restore previously made orphan decisions, skipping the field comparisons on the next `apply`."""
+
+        if not state:
+            return
+
+        self._imported_decisions = {frame: True for frame in state.get('deinterlace', [])} | {
+            frame: False for frame in state.get('keep', [])
+        }
+        self._applied_decisions = None
+
+    def invalidate_state(self, state: dict[str, Any], frames: Sequence[int]) -> dict[str, Any]:
+        """Drop the decisions of changed orphans, and of orphans next to a changed frame they were compared with."""
+
+        changed = set(frames)
+
+        def _valid(frame: int) -> bool:
+            return not changed.intersection((frame - 1, frame, frame + 1))
+
+        return {key: [frame for frame in state.get(key, []) if _valid(frame)] for key in ('deinterlace', 'keep')}
+
     def _should_deinterlace(self, clip: vs.VideoNode, wobbly_parsed: WobblyParser) -> tuple[vs.VideoNode, OrphanFrames]:
         """
         Determine if the clip should be deinterlaced.
@@ -154,32 +244,30 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
         if not (orphan_fields := wobbly_parsed.orphan_frames):
             return clip, OrphanFrames([])
 
-        if not hasattr(core, 'vszip'):
-            raise DependencyNotFoundError(self.apply, 'vszip')
+        decisions = self._imported_decisions if self._imported_decisions is not None else {}
 
         is_tff = wobbly_parsed.field_order.is_tff
 
+        if self.decision is OrphanDecisionEnum.METRICS and not wobbly_parsed.mics:
+            raise CustomValueError(
+                'The wobbly file has no mics! Compute them in wibbly or wobbly, or use a different decision.',
+                self._should_deinterlace,
+            )
+
         orphans_to_keep = list[OrphanFrame]()
         orphans_to_deint = list[OrphanFrame]()
 
         for match in ('b', 'n'):
             for orphan in orphan_fields.find_matches(match):
-                offset = -1 if match == 'b' else 1 if match == 'n' else 0
+                if (deint := decisions.get(orphan.frame)) is None:
+                    deint = self._metrics_decision(orphan, wobbly_parsed.mics)
 
-                sep_ref = clip[orphan.frame + offset].std.SeparateFields()[is_tff]
-                sep_curr = clip[orphan.frame].std.SeparateFields()[is_tff]
+                if deint is None:
+                    deint = self._pixels_decision(clip, orphan, is_tff)
 
-                sep_avg = get_prop(sep_ref.vszip.PlaneAverage([0], sep_curr), 'psmDiff', float)
+                (orphans_to_deint if deint else orphans_to_keep).append(orphan)
 
-                logging.debug(
-                    f'{orphan.frame} ({match}): {(sep_avg >= self.thr)=} '
-                    f'(sep_ref={orphan.frame + offset}, sep_curr={orphan.frame}) ({sep_avg=})'
-                )
-
-                if sep_avg >= self.thr:
-                    orphans_to_deint.append(orphan)
-                else:
-                    orphans_to_keep.append(orphan)
+        self._applied_decisions = {o.frame: True for o in orphans_to_deint} | {o.frame: False for o in orphans_to_keep}
 
         orphans_to_deint = OrphanFrames(orphans_to_deint)
 
@@ -188,6 +276,44 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
 
         return clip, orphans_to_deint
 
+    def _metrics_decision(self, orphan: OrphanFrame, mics: Mics) -> bool | None:
+        """Decide from the stored mics. Returns None if the fields must be compared instead."""
+
+        if self.decision is OrphanDecisionEnum.PIXELS or orphan.frame >= len(mics):
+            return None
+
+        mic = mics.get(orphan.frame, orphan.match)
+
+        if self.decision is OrphanDecisionEnum.HYBRID and abs(mic - self.mic_thr) <= self.mic_band:
+            return None
+
+        logger.debug('%d (%s): mic > mic_thr=%s (mic=%d)', orphan.frame, orphan.match, mic > self.mic_thr, mic)
+
+        return mic > self.mic_thr
+
+    def _pixels_decision(self, clip: vs.VideoNode, orphan: OrphanFrame, is_tff: bool) -> bool:
+        """Decide by comparing the orphan field against the same field of its neighbouring frame."""
+
+        offset = -1 if orphan.match == 'b' else 1
+
+        sep_ref = clip[orphan.frame + offset].std.SeparateFields()[is_tff]
+        sep_curr = clip[orphan.frame].std.SeparateFields()[is_tff]
+
+        diff, prop = plane_difference(sep_ref, sep_curr, self.backend)
+        sep_avg = get_prop(diff, prop, float)
+
+        logger.debug(
+            '%d (%s): sep_avg >= thr=%s (sep_ref=%d, sep_curr=%d) (sep_avg=%s)',
+            orphan.frame,
+            orphan.match,
+            sep_avg >= self.thr,
+            orphan.frame + offset,
+            orphan.frame,
+            sep_avg,
+        )
+
+        return sep_avg >= self.thr
+
     def _revert_field_matches(
         self, clip: vs.VideoNode, wobbly_parsed: WobblyParser, orphans: OrphanFrames
     ) -> vs.VideoNode:
@@ -198,13 +324,13 @@ class MatchBasedOrphanQTGMCStrategy(AbstractProcessingStrategy):
 
         reverted_matches = ''.join(reverted_matches)
 
-        fh = clip.fh.FieldHint(None, wobbly_parsed.field_order.is_tff, reverted_matches)
+        fh = field_hint(clip, wobbly_parsed.field_order.is_tff, reverted_matches, self.backend)
         return replace_ranges(clip, fh.std.SetFrameProps(wobbly_orphan_deint=-1), [o.frame for o in orphans])
 
     def _qtgmc(self, clip: vs.VideoNode) -> QTempGaussMC:
         """Create a QTGMC object for the given clip."""
 
-        tr = 1
+        tr = _QTGMC_TR
 
         return (
             QTempGaussMC(clip)
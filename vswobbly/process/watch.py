@@ -0,0 +1,237 @@
+import logging
+import os
+from collections.abc import Callable
+from copy import copy
+from dataclasses import dataclass
+from threading import Event, Thread
+from time import perf_counter
+from typing import Any
+
+from jetpytools import CustomTypeError, CustomValueError, SPath, SPathLike
+from vstools import VSFunctionNoArgs, vs
+
+from ..data.diff import changed_source_frames, diff_wobbly
+from ..data.parse import WobblyParser
+from ..types import OutputSettingsEnum, PluginBackendEnum
+from .plan import WobblyPlan
+from .processor import WobblyProcessor
+from .strategies.abstract import AbstractProcessingStrategy
+
+__all__ = [
+    'WatchUpdate',
+    'WobblyWatcher',
+]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WatchUpdate:
+    """The result of reloading a changed wobbly file."""
+
+    clip: vs.VideoNode
+    """The new processed clip."""
+
+    parser: WobblyParser
+    """The new parsed wobbly data."""
+
+    changed_ranges: list[tuple[int, int]]
+    """Inclusive `(first, last)` ranges of output frames that differ from the previous clip."""
+
+    reload_time: float
+    """The time it took to reload the file and rebuild the clip, in seconds."""
+
+
+class WobblyWatcher:
+    """
+    Watch a wobbly file, and rebuild the processed clip whenever it's saved.
+
+    Only what changed is redone. The indexed source clip is reused, and strategies keep the analysis
+    of every frame that didn't change (see `AbstractProcessingStrategy.invalidate_state`).
+    The rest of the graph is rebuilt, which only creates nodes and doesn't render any frames.
+    Every update reports which output frames changed, so a previewer can keep every other frame
+    (see `PreviewCache.set_clip`).
+
+    Call `poll` to check for changes yourself, or `start` to check in a background thread.
+    """
+
+    def __init__(
+        self,
+        wob_path: SPathLike,
+        strategies: list[AbstractProcessingStrategy] | None = None,
+        source_filter: VSFunctionNoArgs | None = None,
+        source_filter_kwargs: dict[str, Any] | None = None,
+        backend: PluginBackendEnum | str = PluginBackendEnum.NATIVE,
+        output_settings: OutputSettingsEnum | str = OutputSettingsEnum.IGNORE,
+        radius: int | None = None,
+    ) -> None:
+        """
+        :param wob_path:                The path to the wobbly file to watch.
+        :param strategies:              The strategies to process the clip with.
+                                        These are copied for every rebuild, and never modified.
+        :param source_filter:           See `WobblyParser.from_file`.
+        :param source_filter_kwargs:    See `WobblyParser.from_file`.
+        :param backend:                 See `WobblyProcessor.backend`.
+        :param output_settings:         See `WobblyProcessor.output_settings`.
+        :param radius:                  The number of neighbouring output frames that are reported as changed
+                                        on both sides of every change, e.g. for temporal filters in presets.
+                                        Default: the largest `temporal_radius` of the strategies.
+
+        :raises CustomValueError:       The radius is negative.
+        """
+
+        self.wob_path = SPath(wob_path)
+        self.strategies = [strategy() if isinstance(strategy, type) else strategy for strategy in strategies or []]
+        self.source_filter = source_filter
+        self.source_filter_kwargs = source_filter_kwargs
+        self.backend = PluginBackendEnum(backend)
+        self.output_settings = OutputSettingsEnum(output_settings)
+        self.radius = (
+            max((strategy.temporal_radius for strategy in self.strategies), default=0) if radius is None else radius
+        )
+
+        if self.radius < 0:
+            raise CustomValueError(f'The radius cannot be negative, not {self.radius}!', self.__class__)
+
+        self._thread: Thread | None = None
+        self._stop = Event()
+
+        self._stat = self._file_stat()
+        self.parser = self._parse()
+        self.clip, self._states = self._build(self.parser, [{} for _ in self.strategies])
+
+    def poll(self) -> WatchUpdate | None:
+        """
+        Check whether the wobbly file changed, and reload it if so.
+
+        :return:            The update, or None if the file didn't change.
+        """
+
+        if (stat := self._file_stat()) == self._stat:
+            return None
+
+        update = self.reload()
+
+        # Only after a successful reload, so a failed reload (e.g. of a half-written file) is retried.
+        self._stat = stat
+
+        return update
+
+    def reload(self) -> WatchUpdate:
+        """
+        Reload the wobbly file, and rebuild the processed clip.
+
+        :return:            The update, including the output frames that changed.
+        """
+
+        start = perf_counter()
+
+        parser = self._parse()
+
+        video, old_video = parser.video_data, self.parser.video_data
+
+        if (video.src_file, video.source_filter_name, video.source_filter_kwargs) == (
+            old_video.src_file,
+            old_video.source_filter_name,
+            old_video.source_filter_kwargs,
+        ):
+            video._source_filter = old_video._source_filter
+            video._work_clip = old_video._work_clip
+
+        source_frames = changed_source_frames(self.parser, parser)
+
+        states = [
+            strategy.invalidate_state(state, source_frames) if state else {}
+            for strategy, state in zip(self.strategies, self._states)
+        ]
+
+        clip, states = self._build(parser, states)
+
+        # Comparing the strategy states as well includes the frames the strategies decided differently on,
+        # e.g. an orphan that's deinterlaced now, even though the wobbly data of the frame itself didn't change.
+        strategies = tuple(self.strategies)
+        ranges = diff_wobbly(
+            WobblyPlan(self.parser, strategies, tuple(self._states)),
+            WobblyPlan(parser, strategies, tuple(states)),
+            self.radius,
+            keyframe_aligned=False,
+        ).ranges
+
+        self.parser, self.clip, self._states = parser, clip, states
+
+        update = WatchUpdate(clip, parser, ranges, perf_counter() - start)
+
+        logger.debug('Reloaded %s in %.3fs. Changed output frames: %s', self.wob_path, update.reload_time, ranges)
+
+        return update
+
+    def watch(self, callback: Callable[[WatchUpdate], Any], interval: float = 0.5) -> None:
+        """
+        Poll the wobbly file until `stop` is called, calling the callback with every update. This blocks.
+
+        Errors while reloading (e.g. a half-written or invalid file, or a broken preset) are logged,
+        and the previous clip is kept.
+
+        :param callback:        Called with every update.
+        :param interval:        The time between checks, in seconds.
+        """
+
+        self._stop.clear()
+
+        while not self._stop.wait(interval):
+            try:
+                update = self.poll()
+            except (OSError, CustomValueError, CustomTypeError, vs.Error) as e:
+                # Parse and validation errors (e.g. `WobblyParseError`) are all `CustomValueError`s.
+                logger.warning('Failed to reload %s: %s', self.wob_path, e)
+                continue
+
+            if update is not None:
+                callback(update)
+
+    def start(self, callback: Callable[[WatchUpdate], Any], interval: float = 0.5) -> None:
+        """
+        Poll the wobbly file in a background thread. See `watch`.
+
+        :param callback:        Called with every update, from the background thread.
+        :param interval:        The time between checks, in seconds.
+        """
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = Thread(target=self.watch, args=(callback, interval), daemon=True, name='WobblyWatcher')
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching, and wait for the background thread to finish."""
+
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _file_stat(self) -> tuple[int, int]:
+        stat = os.stat(self.wob_path)
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def _parse(self) -> WobblyParser:
+        return WobblyParser.from_file(self.wob_path, self.source_filter, self.source_filter_kwargs)
+
+    def _build(self, parser: WobblyParser, states: list[dict[str, Any]]) -> tuple[vs.VideoNode, list[dict[str, Any]]]:
+        """Build the processed clip with copies of the strategies, and return it with their new states."""
+
+        strategies = list[AbstractProcessingStrategy]()
+
+        for strategy, state in zip(self.strategies, states):
+            strategies.append(strategy := copy(strategy))
+            strategy.import_state(state)
+
+        clip = WobblyProcessor(
+            parser, strategies=strategies, backend=self.backend, output_settings=self.output_settings
+        ).apply()
+
+        return clip, [strategy.export_state() for strategy in strategies]
@@ -0,0 +1,191 @@
+"""
+A process-wide registry of indexed source clips.
+
+Every `WobblyVideo` that indexes the same source file, with the same source filter and arguments,
+gets the same `VideoNode`, so multiple wobbly files (or repeated loads of one file) share a single decoder instance.
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock, RLock
+from typing import Any
+
+from jetpytools import CustomValueError, SPath, SPathLike
+from vstools import vs
+
+__all__ = [
+    'SourceClipRegistry',
+    'source_clip_registry',
+]
+
+
+class SourceClipRegistry:
+    """
+    A bounded, thread-safe cache of source clips, evicting the least recently used clip when full.
+
+    Clips are keyed by the source file, the source filter, its arguments, the identity of the file on disk
+    (so a replaced file is indexed again), and the VapourSynth environment (nodes can't be shared between cores).
+
+    Evicting or releasing a clip only drops the registry's reference.
+    Clips still referenced elsewhere, e.g. by a processor's graph, keep working.
+    """
+
+    def __init__(self, max_size: int = 8) -> None:
+        """
+        :param max_size:        The maximum number of clips to keep. 0 disables the registry.
+
+        :raises CustomValueError:   The maximum size is negative.
+        """
+
+        if max_size < 0:
+            raise CustomValueError(f'The maximum size cannot be negative, not {max_size}!', self.__class__)
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clips = OrderedDict[Hashable, vs.VideoNode]()
+        self._pending = dict[Hashable, Lock]()
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._clips)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._clips
+
+    @staticmethod
+    def make_key(src_file: SPathLike, source_filter: Any, kwargs: dict[str, Any] | None = None) -> Hashable:
+        """
+        Create the registry key of a source clip.
+
+        :param src_file:        The path to the source file.
+        :param source_filter:   The source filter, or its name (e.g. `lsmas.LWLibavSource`).
+        :param kwargs:          The arguments the source filter is called with.
+
+        :return:                A hashable key.
+        """
+
+        path = SPath(src_file).resolve()
+
+        try:
+            stat = os.stat(path)
+            identity: tuple[int, ...] | None = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            identity = None
+
+        try:
+            hash(source_filter)
+        except TypeError:
+            source_filter = id(source_filter)
+
+        frozen_kwargs = tuple(sorted((name, _freeze(value)) for name, value in (kwargs or {}).items()))
+
+        return (path.as_posix(), identity, source_filter, frozen_kwargs, vs.get_current_environment().env_id)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], vs.VideoNode]) -> vs.VideoNode:
+        """
+        Get a registered clip, or create and register it.
+
+        Only one thread creates a clip for a given key. Other threads requesting it wait for it,
+        while clips for other keys can be created at the same time.
+
+        :param key:         The key of the clip. See `make_key`.
+        :param factory:     Callable creating the clip, e.g. by calling the source filter.
+
+        :return:            The registered clip.
+        """
+
+        if not self.max_size:
+            return factory()
+
+        with self._lock:
+            if (clip := self._get(key)) is not None:
+                return clip
+
+            key_lock = self._pending.setdefault(key, Lock())
+
+        with key_lock:
+            with self._lock:
+                if (clip := self._get(key)) is not None:
+                    return clip
+
+                self.misses += 1
+
+            try:
+                clip = factory()
+            except BaseException:
+                with self._lock:
+                    self._pending.pop(key, None)
+
+                raise
+
+            # Register the clip and drop the pending lock together. Otherwise another thread could find neither,
+            # and create the clip a second time.
+            with self._lock:
+                self._pending.pop(key, None)
+                self._clips[key] = clip
+
+                while len(self._clips) > self.max_size:
+                    self._clips.popitem(last=False)
+
+        return clip
+
+    def release(self, src_file: SPathLike | None = None) -> int:
+        """
+        Drop the registry's references to the clips of a source file, or to every clip.
+
+        :param src_file:    The source file to release the clips of. Default: release every clip.
+
+        :return:            The number of released clips.
+        """
+
+        with self._lock:
+            if src_file is None:
+                count = len(self._clips)
+                self._clips.clear()
+
+                return count
+
+            path = SPath(src_file).resolve().as_posix()
+            keys = [key for key in self._clips if isinstance(key, tuple) and key and key[0] == path]
+
+            for key in keys:
+                del self._clips[key]
+
+            return len(keys)
+
+    def clear(self) -> None:
+        """Release every clip, and reset the hit and miss counters."""
+
+        with self._lock:
+            self._clips.clear()
+            self.hits = self.misses = 0
+
+    def _get(self, key: Hashable) -> vs.VideoNode | None:
+        if (clip := self._clips.get(key)) is not None:
+            self._clips.move_to_end(key)
+            self.hits += 1
+
+        return clip
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn a source filter argument into something hashable."""
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
+
+
+source_clip_registry = SourceClipRegistry()
+"""The registry every `WobblyVideo` indexes its source through."""
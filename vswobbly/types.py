@@ -2,6 +2,10 @@ from jetpytools import CustomStrEnum
 
 __all__ = [
     'FilteringPositionEnum',
+    'JSONBackendEnum',
+    'OrphanDecisionEnum',
+    'OutputSettingsEnum',
+    'PluginBackendEnum',
 ]
 
 
@@ -19,3 +23,78 @@ class FilteringPositionEnum(CustomStrEnum):
 
     POST_DECIMATE = 'post decimate'
     """Perform filtering after decimation."""
+
+
+class PluginBackendEnum(CustomStrEnum):
+    """Enum denoting which implementation to use for operations that depend on external plugins."""
+
+    NATIVE = 'native'
+    """Use the native plugins (`fh` for field hinting, `vszip` for plane differences). Fastest."""
+
+    STD = 'std'
+    """
+    Use pure `std` implementations built from `SeparateFields`, `DoubleWeave` and `PlaneStats`.
+
+    Slower, but doesn't require any external plugins.
+    Useful for testing, and as a baseline to measure the native plugins against.
+    """
+
+
+class JSONBackendEnum(CustomStrEnum):
+    """Enum denoting which JSON decoder to load wobbly files with."""
+
+    AUTO = 'auto'
+    """Use the fastest installed decoder, in the order below."""
+
+    ORJSON = 'orjson'
+    """Use `orjson`, reading the file through a memory map."""
+
+    MSGSPEC = 'msgspec'
+    """Use `msgspec`, reading the file through a memory map."""
+
+    JSON = 'json'
+    """Use the standard library `json` module. Always available."""
+
+
+class OrphanDecisionEnum(CustomStrEnum):
+    """Enum denoting how to decide whether an orphan field should be deinterlaced."""
+
+    PIXELS = 'pixels'
+    """Compare the orphan field against its neighbouring field. Renders two fields per orphan while building."""
+
+    METRICS = 'metrics'
+    """
+    Decide from the combing metrics (mics) stored in the wobbly file alone. Never renders any frames.
+
+    Requires the mics to have been computed in wibbly or wobbly.
+    """
+
+    HYBRID = 'hybrid'
+    """
+    Decide from the stored mics, and only compare fields for orphans whose mic is close to the threshold,
+    or that have no mics at all.
+    """
+
+
+class OutputSettingsEnum(CustomStrEnum):
+    """
+    Enum denoting whether and where to apply the crop, resize and bit depth settings of a wobbly file.
+
+    If the wobbly file crops early (see `Crop.early`), the crop is applied to the source before field matching,
+    like wobbly itself does, with both `LATE` and `EARLY`.
+    """
+
+    IGNORE = 'ignore'
+    """Don't apply them. Crop, resize and convert the output yourself."""
+
+    LATE = 'late'
+    """Apply them all at the end of processing, after decimation."""
+
+    EARLY = 'early'
+    """
+    Crop right after field matching, before any strategies, presets or custom lists,
+    so every filter after it processes fewer pixels. Resizing and bit depth conversion still happen at the end.
+
+    Only the part of the crop that keeps both fields intact is applied early (see `Crop.split`).
+    Any remainder is cropped at the end.
+    """
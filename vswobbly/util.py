@@ -2,13 +2,30 @@
 Utility functions used throughout this library and is not meant to be used by other packages.
 """
 
-from typing import TypeVar
+import logging
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import MISSING, fields
+from functools import cache
+from importlib import import_module
+from typing import Any, TypeVar
+
+from jetpytools import CustomValueError
+from vstools import vs
 
 __all__ = [
+    'can_walk_graph',
     'deduplicate_list',
+    'iter_graph_nodes',
+    'lazy_attributes',
+    'node_dependencies',
     'to_snake_case',
+    'unchecked_dataclass',
+    'unchecked_list',
 ]
 
+logger = logging.getLogger(__name__)
+
 
 T = TypeVar('T')
 
@@ -26,3 +43,135 @@ def to_snake_case(key: str) -> str:
     """Convert a key to snake_case."""
 
     return '_'.join(key.strip().split(' '))
+
+
+@cache
+def _dataclass_defaults(cls: type) -> tuple[tuple[str, Any, Any], ...]:
+    return tuple((f.name, f.default, f.default_factory) for f in fields(cls))
+
+
+def unchecked_dataclass(cls: type[T], **kwargs: Any) -> T:
+    """
+    Create a dataclass instance without running its `__init__` or `__post_init__` validation.
+
+    Only use this for data that has already been validated, e.g. by `WobblyValidator.validate_frames`.
+    """
+
+    defaults = _dataclass_defaults(cls)
+
+    if unknown := kwargs.keys() - {name for name, _, _ in defaults}:
+        raise CustomValueError(f'Unknown fields: {sorted(unknown)}', unchecked_dataclass, cls)
+
+    obj = object.__new__(cls)
+
+    for name, default, default_factory in defaults:
+        if name in kwargs:
+            value = kwargs[name]
+        elif default is not MISSING:
+            value = default
+        elif default_factory is not MISSING:
+            value = default_factory()
+        else:
+            raise CustomValueError(f"Missing value for field '{name}'!", unchecked_dataclass, cls)
+
+        object.__setattr__(obj, name, value)
+
+    return obj
+
+
+def unchecked_list(cls: type[T], items: Iterable[Any]) -> T:
+    """
+    Create a list subclass instance without running its `__init__` (sorting, deduplication, validation).
+
+    Only use this for items that have already been validated, sorted and deduplicated.
+    """
+
+    obj = list.__new__(cls)  # type: ignore[call-overload]
+    list.__init__(obj, items)  # type: ignore[arg-type]
+
+    return obj
+
+
+def node_dependencies(node: vs.RawNode) -> list[vs.RawNode]:
+    """Get the direct input nodes of a node. Empty if the node can't be inspected."""
+
+    deps = list[vs.RawNode]()
+
+    for dep in getattr(node, '_dependencies', None) or ():
+        if isinstance(dep, tuple):
+            dep = dep[0]
+
+        if isinstance(dep, vs.RawNode):
+            deps.append(dep)
+
+    return deps
+
+
+def iter_graph_nodes(node: vs.RawNode, seen: dict[vs.RawNode, None] | None = None) -> Iterator[vs.RawNode]:
+    """
+    Iterate over a node and every node it depends on, each node once.
+
+    Nodes already in `seen` (and everything upstream of them) are skipped,
+    and every yielded node is added to it. Pass the same dictionary to walk a growing graph incrementally.
+    """
+
+    seen = {} if seen is None else seen
+    stack = [node]
+
+    while stack:
+        if (current := stack.pop()) in seen:
+            continue
+
+        seen[current] = None
+
+        yield current
+
+        stack.extend(node_dependencies(current))
+
+
+def can_walk_graph() -> bool:
+    """Check whether nodes expose their dependencies, and compare equal when they wrap the same node."""
+
+    if (enable := getattr(vs, '_try_enable_introspection', None)) is not None:
+        try:
+            enable()
+        except (TypeError, vs.Error) as e:
+            logger.debug(f'Failed to enable graph introspection: {e}')
+
+    try:
+        parent = vs.core.std.BlankClip(length=1)
+        child = parent.std.SetFrameProps()
+
+        hash(parent)
+
+        return any(dep == parent for dep in node_dependencies(child))
+    except (AttributeError, TypeError, vs.Error):
+        return False
+
+
+def lazy_attributes(package: str, lazy: Mapping[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Create the module `__getattr__` and `__dir__` of a package that imports some of its names only when first accessed.
+
+    The package must still list the lazily imported names in its `__all__`, so star imports include them.
+    Any package that star-imports it then imports them as well, so parent packages must reuse this instead.
+
+    :param package:     The name of the package.
+    :param lazy:        A mapping of every lazily imported name to the absolute name of the module defining it.
+
+    :return:            The `__getattr__` and `__dir__` functions of the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if (module := lazy.get(name)) is None:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+        value = getattr(import_module(module), name)
+        setattr(sys.modules[package], name, value)
+
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(vars(sys.modules[package]).keys() | lazy.keys())
+
+    return __getattr__, __dir__